@@ -1,6 +1,7 @@
 from postreise.analyze.generation.summarize import (
     get_generation_time_series_by_resources,
 )
+from postreise.cache import get_demand, get_grid
 
 
 def get_demand_time_series(scenario, area, area_type=None):
@@ -14,11 +15,11 @@ def get_demand_time_series(scenario, area, area_type=None):
     :return: (*pandas.Series*) -- time series of total demand, index: time stamps,
         column: demand values
     """
-    grid = scenario.get_grid()
+    grid = get_grid(scenario)
     loadzone_set = grid.model_immutables.area_to_loadzone(area, area_type=area_type)
     loadzone_id_set = {grid.zone2id[lz] for lz in loadzone_set if lz in grid.zone2id}
 
-    return scenario.get_demand()[list(loadzone_id_set)].sum(axis=1)
+    return get_demand(scenario)[list(loadzone_id_set)].sum(axis=1)
 
 
 def get_net_demand_time_series(scenario, area, area_type=None):
@@ -32,7 +33,7 @@ def get_net_demand_time_series(scenario, area, area_type=None):
     :return: (*pandas.Series*) -- time series of total demand, index: time stamps,
         column: net demand values
     """
-    grid = scenario.get_grid()
+    grid = get_grid(scenario)
     renewable_pg = get_generation_time_series_by_resources(
         scenario,
         area,
@@ -0,0 +1,34 @@
+import numpy as np
+
+_AVG_EARTH_RADIUS_MILES = 3958.7613
+
+
+def haversine(from_lat, from_lon, to_lat, to_lon):
+    """Calculate the great circle distance between pairs of points, elementwise.
+    Same formula as :func:`powersimdata.utility.distance.haversine` on arrays.
+
+    :param numpy.ndarray/pandas.Series from_lat: latitude of start points in degrees.
+    :param numpy.ndarray/pandas.Series from_lon: longitude of start points in degrees.
+    :param numpy.ndarray/pandas.Series to_lat: latitude of end points in degrees.
+    :param numpy.ndarray/pandas.Series to_lon: longitude of end points in degrees.
+    :return: (*numpy.ndarray*) -- distances in miles.
+    """
+    lat1, lon1, lat2, lon2 = (
+        np.radians(np.asarray(a, dtype=float))
+        for a in (from_lat, from_lon, to_lat, to_lon)
+    )
+    a = (
+        np.sin((lat2 - lat1) * 0.5) ** 2
+        + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) * 0.5) ** 2
+    )
+    return 2 * _AVG_EARTH_RADIUS_MILES * np.arcsin(np.sqrt(a))
+
+
+def get_line_length(line):
+    """Calculate the length of lines.
+
+    :param pandas.DataFrame line: line data frame with *'from_lat'*, *'from_lon'*,
+        *'to_lat'* and *'to_lon'* columns, e.g. branch table.
+    :return: (*numpy.ndarray*) -- length of the lines in miles.
+    """
+    return haversine(line.from_lat, line.from_lon, line.to_lat, line.to_lon)
@@ -0,0 +1,136 @@
+import os
+
+import pandas as pd
+from powersimdata.scenario.check import _check_scenario_is_in_analyze_state
+
+from postreise.analyze.generation.costs import summarize_costs
+from postreise.analyze.generation.curtailment import get_curtailment_result
+from postreise.analyze.generation.emissions import iter_emissions_stats
+from postreise.cache import get_grid, get_pg, memoize
+
+# Increase when the calculation of the aggregates changes to invalidate the store
+_version = 1
+_store = {"directory": None}
+
+
+def set_aggregate_store(directory):
+    """Set the directory where the monthly aggregates of scenarios are stored. Once
+    set, the aggregates of a scenario are calculated the first time they are
+    requested, written to the directory and read back in later sessions.
+
+    :param str directory: path to the directory. If None, the store is disabled and
+        aggregates are only kept in memory.
+    :raises TypeError: if ``directory`` is not None or a str.
+    """
+    if directory is not None and not isinstance(directory, str):
+        raise TypeError("directory must be a str")
+    _store["directory"] = directory
+
+
+def get_aggregate_store():
+    """Get the directory where the monthly aggregates of scenarios are stored.
+
+    :return: (*str*) -- path to the directory, None if the store is disabled.
+    """
+    return _store["directory"]
+
+
+def _get_aggregate_path(scenario):
+    """Get the path of the stored aggregates of a scenario.
+
+    :param powersimdata.scenario.scenario.Scenario scenario: scenario instance.
+    :return: (*str*) -- path to the file, None if the store is disabled.
+    """
+    if _store["directory"] is None:
+        return None
+    filename = f"{scenario.info['id']}_monthly_aggregates_v{_version}.csv.gz"
+    return os.path.join(_store["directory"], filename)
+
+
+def calculate_monthly_aggregates(scenario):
+    """Calculate the monthly generation, curtailment, carbon emissions and cost of
+    each generator type in each load zone.
+
+    :param powersimdata.scenario.scenario.Scenario scenario: scenario instance.
+    :return: (*pandas.DataFrame*) -- index: (*'type'*, *'zone_id'*, *'month'*) multi
+        index, months are labelled by their first day. Columns: *'generation'* (MWh),
+        *'curtailment'* (MWh), *'emissions'* (tons of carbon, *'simple'* method of
+        :func:`postreise.analyze.generation.emissions.generate_emissions_stats`)
+        and *'cost'* ($).
+    """
+    _check_scenario_is_in_analyze_state(scenario)
+    pg = get_pg(scenario)
+    plant = get_grid(scenario).plant.loc[pg.columns]
+
+    emissions = None
+    for block in iter_emissions_stats(scenario):
+        block = block.resample("MS").sum()
+        emissions = block if emissions is None else emissions.add(block, fill_value=0)
+    curtailment = get_curtailment_result(scenario).to_frame().resample("MS").sum()
+    monthly = {
+        "generation": pg.resample("MS").sum(),
+        "curtailment": curtailment.reindex(columns=pg.columns, fill_value=0),
+        "emissions": emissions,
+        "cost": summarize_costs(scenario, by="plant_id", freq="M"),
+    }
+
+    keys = [plant["type"].rename("type"), plant["zone_id"].rename("zone_id")]
+    aggregates = {}
+    for name, values in monthly.items():
+        values = values.reindex(monthly["generation"].index, fill_value=0)
+        values = values.rename_axis("month").T.groupby(keys).sum().stack()
+        aggregates[name] = values.astype(float)
+    return pd.DataFrame(aggregates).reorder_levels(["type", "zone_id", "month"])
+
+
+def _read_aggregates(path):
+    """Read stored aggregates.
+
+    :param str path: path to the file.
+    :return: (*pandas.DataFrame*) -- aggregates, see
+        :func:`calculate_monthly_aggregates`.
+    """
+    aggregates = pd.read_csv(path, parse_dates=["month"])
+    aggregates["type"] = aggregates["type"].astype(str)
+    return aggregates.set_index(["type", "zone_id", "month"])
+
+
+def _write_aggregates(aggregates, path):
+    """Write aggregates, replacing the file at once so that readers never see a
+    partially written file.
+
+    :param pandas.DataFrame aggregates: aggregates.
+    :param str path: path to the file.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    aggregates.reset_index().to_csv(tmp_path, index=False, compression="gzip")
+    os.replace(tmp_path, path)
+
+
+def get_monthly_aggregates(scenario):
+    """Get the monthly generation, curtailment, carbon emissions and cost of each
+    generator type in each load zone, calculating them on first access only.
+
+    :param powersimdata.scenario.scenario.Scenario scenario: scenario instance.
+    :return: (*pandas.DataFrame*) -- aggregates, see
+        :func:`calculate_monthly_aggregates`.
+
+    .. note::
+        Aggregates are kept in memory with the other products of the scenario. If a
+        store is set, see :func:`set_aggregate_store`, they are also written to a
+        compressed csv file of a few hundred kilobytes, named after the scenario id
+        and the version of the calculation, and read from it in later sessions.
+    """
+    _check_scenario_is_in_analyze_state(scenario)
+    path = _get_aggregate_path(scenario)
+
+    def calculate():
+        if path is not None and os.path.isfile(path):
+            return _read_aggregates(path)
+        aggregates = calculate_monthly_aggregates(scenario)
+        if path is not None:
+            _write_aggregates(aggregates, path)
+        return aggregates
+
+    return memoize(scenario, ("monthly_aggregates", path), calculate)
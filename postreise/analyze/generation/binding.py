@@ -1,59 +1,269 @@
+import numpy as np
+import pandas as pd
 from powersimdata.input.check import _check_epsilon
 from powersimdata.scenario.check import _check_scenario_is_in_analyze_state
 
+from postreise.cache import get_grid, get_pg
 
-def pmin_constraints(scenario, epsilon=1e-3):
+_constraint_column = {"pmin": "Pmin", "pmax": "Pmax", "ramp": "ramp_30"}
+
+
+def _check_output(output):
+    """Ensure the output format of binding constraints is valid.
+
+    :param str output: output format.
+    :raises TypeError: if ``output`` is not a str.
+    :raises ValueError: if ``output`` is not one of *'dense'*, *'events'*,
+        *'intervals'* or *'count'*.
+    """
+    if not isinstance(output, str):
+        raise TypeError("output must be a str")
+    if output not in {"dense", "events", "intervals", "count"}:
+        raise ValueError("output must be one of: dense, events, intervals, count")
+
+
+def _get_slack(pg, start, stop, limit, constraint):
+    """Calculate the slack of a constraint of each generator in a block of hours.
+
+    :param numpy.ndarray pg: generation, hours as rows and generators as columns.
+    :param int start: position of the first hour of the block.
+    :param int stop: position following the last hour of the block.
+    :param numpy.ndarray limit: Pmin, Pmax or 30-minute ramp rate of each generator.
+    :param str constraint: one of *'pmin'*, *'pmax'* or *'ramp'*.
+    :return: (*numpy.ndarray*) -- slack of the block. The slack of the ramp
+        constraint in the first hour is NaN.
+    """
+    block = pg[start:stop]
+    if constraint == "pmin":
+        return block - limit
+    if constraint == "pmax":
+        return limit - block
+    previous = pg[max(start - 1, 0) : stop - 1]
+    if start == 0:
+        previous = np.vstack([np.full((1, pg.shape[1]), np.nan), previous])
+    return 2 * limit - np.abs(block - previous)
+
+
+def _get_binding_events(scenario, constraints, epsilon, chunk_size=744):
+    """Find the hours in which constraints of generators are binding, sweeping PG
+    once for all the constraints.
+
+    :param powersimdata.scenario.scenario.Scenario scenario: scenario instance.
+    :param list constraints: constraints among *'pmin'*, *'pmax'* and *'ramp'*.
+    :param float epsilon: allowable 'fuzz' for whether constraint is binding.
+    :param int chunk_size: number of hours processed at once.
+    :return: (*dict*) -- keys are constraints, values are tuples of positions of
+        the hours, positions of the generators and slacks of the binding events as
+        numpy.ndarray, sorted by hour then generator.
+    """
+    pg = get_pg(scenario)
+    plant = get_grid(scenario).plant
+    limits = {
+        c: plant[_constraint_column[c]].reindex(pg.columns).to_numpy(dtype=float)
+        for c in constraints
+    }
+    values = pg.to_numpy()
+    empty = np.array([], dtype=int)
+    events = {c: ([empty], [empty], [np.array([])]) for c in limits}
+    for start in range(0, len(values), chunk_size):
+        stop = min(start + chunk_size, len(values))
+        for c, limit in limits.items():
+            slack = _get_slack(values, start, stop, limit, c)
+            hour, position = np.nonzero(slack <= epsilon)
+            events[c][0].append(hour + start)
+            events[c][1].append(position)
+            events[c][2].append(slack[hour, position])
+    return {c: tuple(np.concatenate(e) for e in events[c]) for c in limits}
+
+
+def _get_binding_intervals(hour, plant):
+    """Encode binding events as runs of consecutive hours.
+
+    :param numpy.ndarray hour: positions of the hours of the events.
+    :param numpy.ndarray plant: positions of the generators of the events.
+    :return: (*tuple*) -- positions of the generators, of the first hours and of the
+        last hours of the runs as numpy.ndarray, sorted by generator then hour.
+    """
+    order = np.lexsort((hour, plant))
+    hour, plant = hour[order], plant[order]
+    is_start = np.ones(len(hour), dtype=bool)
+    is_start[1:] = (plant[1:] != plant[:-1]) | (hour[1:] != hour[:-1] + 1)
+    start = np.flatnonzero(is_start)
+    end = np.append(start[1:], len(hour))[: len(start)] - 1
+    return plant[start], hour[start], hour[end]
+
+
+def _format_binding(scenario, constraint, epsilon, output):
+    """Return binding events in a sparse format.
+
+    :param powersimdata.scenario.scenario.Scenario scenario: scenario instance.
+    :param str constraint: one of *'pmin'*, *'pmax'* or *'ramp'*.
+    :param float epsilon: allowable 'fuzz' for whether constraint is binding.
+    :param str output: one of *'events'*, *'intervals'* or *'count'*.
+    :return: (*pandas.DataFrame/pandas.Series*) -- binding events, see
+        :func:`pmin_constraints`.
+    """
+    pg = get_pg(scenario)
+    hour, plant, slack = _get_binding_events(scenario, [constraint], epsilon)[
+        constraint
+    ]
+    if output == "count":
+        count = np.bincount(plant, minlength=pg.shape[1])
+        return pd.Series(count, index=pg.columns, name="hours")
+    if output == "events":
+        return pd.DataFrame(
+            {"hour": pg.index[hour], "plant_id": pg.columns[plant], "slack": slack}
+        )
+    plant, start, end = _get_binding_intervals(hour, plant)
+    return pd.DataFrame(
+        {
+            "plant_id": pg.columns[plant],
+            "start": pg.index[start],
+            "end": pg.index[end],
+            "hours": end - start + 1,
+        }
+    )
+
+
+def pmin_constraints(scenario, epsilon=1e-3, output="dense"):
     """Identify time periods in which generators are at minimum power.
 
     :param powersimdata.scenario.scenario.Scenario scenario: scenario instance.
     :param float epsilon: allowable 'fuzz' for whether constraint is binding.
-    :return: (*pandas.DataFrame*) -- boolean data frame of same shape as PG.
+    :param str output: format of the result, one of:
+
+        - *'dense'* (default): boolean data frame of same shape as PG.
+        - *'events'*: one row per binding hour and generator, with columns *'hour'*
+          (timestamp), *'plant_id'* and *'slack'* (MW), sorted by hour.
+        - *'intervals'*: one row per run of consecutive binding hours of a
+          generator, with columns *'plant_id'*, *'start'*, *'end'* (timestamps of
+          the first and last binding hours) and *'hours'*, sorted by plant.
+        - *'count'*: number of binding hours of each generator.
+    :return: (*pandas.DataFrame/pandas.Series*) -- binding constraints.
+    :raises TypeError: if ``output`` is not a str.
+    :raises ValueError: if ``output`` is not one of *'dense'*, *'events'*,
+        *'intervals'* or *'count'*.
+
+    .. note::
+        Sparse outputs are built one block of hours at a time and never allocate a
+        data frame of the same shape as PG.
     """
     _check_scenario_is_in_analyze_state(scenario)
     _check_epsilon(epsilon)
+    _check_output(output)
+    if output != "dense":
+        return _format_binding(scenario, "pmin", epsilon, output)
 
-    pg = scenario.get_pg()
-    grid = scenario.get_grid()
+    pg = get_pg(scenario)
+    grid = get_grid(scenario)
     pmin = grid.plant["Pmin"]
     binding_pmin_constraints = (pg - pmin) <= epsilon
 
     return binding_pmin_constraints
 
 
-def pmax_constraints(scenario, epsilon=1e-3):
+def pmax_constraints(scenario, epsilon=1e-3, output="dense"):
     """Identify time periods in which generators are at maximum power.
 
     :param powersimdata.scenario.scenario.Scenario scenario: scenario instance.
     :param float epsilon: allowable 'fuzz' for whether constraint is binding.
-    :return: (*pandas.DataFrame*) -- boolean data frame of same shape as PG.
+    :param str output: format of the result, see :func:`pmin_constraints`.
+    :return: (*pandas.DataFrame/pandas.Series*) -- binding constraints.
+    :raises TypeError: if ``output`` is not a str.
+    :raises ValueError: if ``output`` is not one of *'dense'*, *'events'*,
+        *'intervals'* or *'count'*.
     """
     _check_scenario_is_in_analyze_state(scenario)
     _check_epsilon(epsilon)
+    _check_output(output)
+    if output != "dense":
+        return _format_binding(scenario, "pmax", epsilon, output)
 
-    pg = scenario.get_pg()
-    grid = scenario.get_grid()
+    pg = get_pg(scenario)
+    grid = get_grid(scenario)
     pmax = grid.plant["Pmax"]
     binding_pmax_constraints = (pmax - pg) <= epsilon
 
     return binding_pmax_constraints
 
 
-def ramp_constraints(scenario, epsilon=1e-3):
+def ramp_constraints(scenario, epsilon=1e-3, output="dense"):
     """Identify time periods in which generators have binding ramp constraints.
 
     :param powersimdata.scenario.scenario.Scenario scenario: scenario instance.
     :param float epsilon: allowable 'fuzz' for whether constraint is binding.
-    :return: (*pandas.DataFrame*) -- boolean data frame of same shape as PG.
+    :param str output: format of the result, see :func:`pmin_constraints`.
+    :return: (*pandas.DataFrame/pandas.Series*) -- binding constraints.
+    :raises TypeError: if ``output`` is not a str.
+    :raises ValueError: if ``output`` is not one of *'dense'*, *'events'*,
+        *'intervals'* or *'count'*.
 
     .. note:: The first time period will always return ``False`` for each column.
     """
     _check_scenario_is_in_analyze_state(scenario)
     _check_epsilon(epsilon)
+    _check_output(output)
+    if output != "dense":
+        return _format_binding(scenario, "ramp", epsilon, output)
 
-    pg = scenario.get_pg()
-    grid = scenario.get_grid()
+    pg = get_pg(scenario)
+    grid = get_grid(scenario)
     ramp = grid.plant["ramp_30"]
     diff = pg.diff(axis=0)
     binding_ramp_constraints = (ramp * 2 - abs(diff)) <= epsilon
 
     return binding_ramp_constraints
+
+
+def binding_constraints_report(scenario, epsilon=1e-3):
+    """Summarize the binding minimum power, maximum power and ramp constraints of
+    generators.
+
+    :param powersimdata.scenario.scenario.Scenario scenario: scenario instance.
+    :param float epsilon: allowable 'fuzz' for whether constraint is binding.
+    :return: (*dict*) -- keys are:
+
+        - *'plant'*: data frame with plant ids as index and (constraint, statistic)
+          as columns, where constraints are *'pmin'*, *'pmax'* and *'ramp'* and
+          statistics are *'hours'* (number of binding hours) and *'longest'*
+          (longest run of consecutive binding hours).
+        - *'type'*: data frame with resource types as index, constraints as columns
+          and number of binding hours summed over generators as values.
+        - *'hour_of_day'*: data frame with hours of the day (0-23) as index,
+          constraints as columns and number of binding events as values.
+
+    .. note::
+        PG and the grid are read once and the slack of the three constraints is
+        calculated one block of hours at a time, see :func:`pmin_constraints` for
+        the definition of binding constraints.
+    """
+    _check_scenario_is_in_analyze_state(scenario)
+    _check_epsilon(epsilon)
+
+    pg = get_pg(scenario)
+    n_plant = pg.shape[1]
+    constraints = list(_constraint_column)
+    events = _get_binding_events(scenario, constraints, epsilon)
+    hour_of_day = pg.index.hour.to_numpy() if len(pg) else np.array([], dtype=int)
+
+    plant, daily = {}, {}
+    for c in constraints:
+        hour, position, _ = events[c]
+        plant[(c, "hours")] = np.bincount(position, minlength=n_plant)
+        run_plant, start, end = _get_binding_intervals(hour, position)
+        longest = np.zeros(n_plant, dtype=int)
+        np.maximum.at(longest, run_plant, end - start + 1)
+        plant[(c, "longest")] = longest
+        daily[c] = np.bincount(hour_of_day[hour], minlength=24)
+
+    plant = pd.DataFrame(plant, index=pg.columns)
+    plant.columns.names = ["constraint", "statistic"]
+    resource = get_grid(scenario).plant["type"].reindex(pg.columns).to_numpy()
+    by_type = plant.xs("hours", axis=1, level="statistic").groupby(resource).sum()
+    by_type.index.name = "type"
+    by_type.columns.name = None
+    return {
+        "plant": plant,
+        "type": by_type,
+        "hour_of_day": pd.DataFrame(daily, index=pd.RangeIndex(24, name="hour")),
+    }
@@ -1,13 +1,88 @@
 import numpy as np
+import pandas as pd
 from powersimdata.input.check import (
     _check_number_hours_to_analyze,
+    _check_resources_and_format,
     _check_resources_are_in_grid_and_format,
 )
-from powersimdata.input.helpers import (
+from powersimdata.scenario.check import _check_scenario_is_in_analyze_state
+
+from postreise.cache import (
+    get_demand,
+    get_grid,
+    get_grid_index,
+    get_pg,
+    get_plant_groups,
     get_plant_id_for_resources_in_area,
     get_storage_id_in_area,
+    memoize,
 )
-from powersimdata.scenario.check import _check_scenario_is_in_analyze_state
+from postreise.precision import get_dtype
+
+
+def _get_top_positions(values, n):
+    """Get the positions of the largest values of each column of a matrix.
+
+    :param numpy.ndarray values: 2-D array.
+    :param int n: number of positions to get in each column.
+    :return: (*numpy.ndarray*) -- array of shape (n, number of columns) with the
+        positions of the n largest values of each column, in descending order of value.
+    """
+    # only the n largest values of each column are sorted
+    top = np.argpartition(-values, n - 1, axis=0)[:n]
+    order = np.argsort(-np.take_along_axis(values, top, axis=0), axis=0, kind="stable")
+    return np.take_along_axis(top, order, axis=0)
+
+
+def _get_demand_and_generation(scenario, resource_sets):
+    """Get the total demand and the generation of sets of resources.
+
+    :param powersimdata.scenario.scenario.Scenario scenario: scenario instance.
+    :param list resource_sets: sets of resources.
+    :return: (*tuple*) -- total demand as a 1-D numpy.ndarray and generation of each
+        set of resources as a 2-D numpy.ndarray, one column per set.
+    """
+    total_demand = memoize(
+        scenario, "total_demand", lambda: get_demand(scenario).sum(axis=1)
+    )
+    plant_groups = get_plant_groups(scenario, "type")
+    pg = get_pg(scenario)
+    # generation of each resource is summed once and shared by the sets
+    by_resource = {
+        r: pg[plant_groups[r]].to_numpy().sum(axis=1)
+        for r in set().union(*resource_sets)
+    }
+    generation = np.zeros((len(total_demand), len(resource_sets)))
+    for i, resources in enumerate(resource_sets):
+        for r in resources:
+            generation[:, i] += by_resource[r]
+    return total_demand.to_numpy(), generation
+
+
+def _calculate_capacity_values(scenario, resource_sets, hours):
+    """Calculate the capacity value of sets of resources for numbers of hours.
+
+    :param powersimdata.scenario.scenario.Scenario scenario: scenario instance.
+    :param list resource_sets: sets of resources.
+    :param list hours: numbers of hours to analyze.
+    :return: (*tuple*) -- NLDC and net load peak capacity values as numpy.ndarray
+        of shape (number of hours, number of sets).
+    """
+    demand, generation = _get_demand_and_generation(scenario, resource_sets)
+    net_demand = demand[:, None] - generation
+    n = max(hours)
+    top_demand = demand[_get_top_positions(demand[:, None], n)[:, 0]]
+    top_hours = _get_top_positions(net_demand, n)
+    top_net_demand = np.take_along_axis(net_demand, top_hours, axis=0)
+    top_generation = np.take_along_axis(generation, top_hours, axis=0)
+
+    # mean over the top N hours for all N at once
+    rank = np.arange(1, n + 1)[:, None]
+    position = np.array(hours) - 1
+    peak = (np.cumsum(top_demand)[:, None] / rank)[position]
+    net_peak = (np.cumsum(top_net_demand, axis=0) / rank)[position]
+    generation_at_peak = (np.cumsum(top_generation, axis=0) / rank)[position]
+    return peak - net_peak, generation_at_peak
 
 
 def calculate_NLDC(scenario, resources, hours=100):  # noqa: N802
@@ -21,21 +96,12 @@ def calculate_NLDC(scenario, resources, hours=100):  # noqa: N802
     :return: (*float*) -- difference between peak demand and peak net demand.
     """
     _check_scenario_is_in_analyze_state(scenario)
-    grid = scenario.get_grid()
+    grid = get_grid(scenario)
     resources = _check_resources_are_in_grid_and_format(resources, grid)
     _check_number_hours_to_analyze(scenario, hours)
 
-    # Then calculate capacity value
-    total_demand = scenario.get_demand().sum(axis=1)
-    prev_peak = total_demand.sort_values(ascending=False).head(hours).mean()
-    plant_groupby = grid.plant.groupby("type")
-    plant_indices = sum(
-        [plant_groupby.get_group(r).index.tolist() for r in resources], []
-    )
-    resource_generation = scenario.get_pg()[plant_indices].sum(axis=1)
-    net_demand = total_demand - resource_generation
-    net_peak = net_demand.sort_values(ascending=False).head(hours).mean()
-    return prev_peak - net_peak
+    nldc, _ = _calculate_capacity_values(scenario, [resources], [hours])
+    return nldc[0, 0]
 
 
 def calculate_net_load_peak(scenario, resources, hours=100):
@@ -48,20 +114,85 @@ def calculate_net_load_peak(scenario, resources, hours=100):
     :return: (*float*) -- resource capacity during hours of peak net demand.
     """
     _check_scenario_is_in_analyze_state(scenario)
-    grid = scenario.get_grid()
+    grid = get_grid(scenario)
     resources = _check_resources_are_in_grid_and_format(resources, grid)
     _check_number_hours_to_analyze(scenario, hours)
 
-    # Then calculate capacity value
-    total_demand = scenario.get_demand().sum(axis=1)
-    plant_groupby = grid.plant.groupby("type")
-    plant_indices = sum(
-        [plant_groupby.get_group(r).index.tolist() for r in resources], []
+    _, net_load_peak = _calculate_capacity_values(scenario, [resources], [hours])
+    return net_load_peak[0, 0]
+
+
+def calculate_capacity_values(scenario, resource_sets, hours=100):
+    """Calculate the capacity value of several classes of resources for several
+    numbers of hours, using both the Net Load Duration Curve (see
+    :func:`calculate_NLDC`) and the net load peak (see
+    :func:`calculate_net_load_peak`) methods.
+
+    :param powersimdata.scenario.scenario.Scenario scenario: scenario instance.
+    :param dict resource_sets: keys are labels, values are one or more resources to
+        analyze (str/list/tuple/set).
+    :param int/list hours: number(s) of hours to analyze.
+    :return: (*pandas.DataFrame*) -- index: (label, hours) multi index, columns:
+        *'NLDC'* and *'net_load_peak'*.
+    :raises TypeError: if resource_sets is not a dict.
+    :raises ValueError: if resource_sets is empty.
+
+    .. note::
+        The demand and the generation of each resource are summed once and the
+        hours are ranked only once per class of resources, whatever the numbers of
+        hours analyzed.
+    """
+    _check_scenario_is_in_analyze_state(scenario)
+    if not isinstance(resource_sets, dict):
+        raise TypeError("resource_sets must be a dict")
+    if len(resource_sets) == 0:
+        raise ValueError("resource_sets must not be empty")
+    grid = get_grid(scenario)
+    resources = [
+        _check_resources_are_in_grid_and_format(r, grid) for r in resource_sets.values()
+    ]
+    hours = [hours] if isinstance(hours, int) else list(hours)
+    for h in hours:
+        _check_number_hours_to_analyze(scenario, h)
+
+    nldc, net_load_peak = _calculate_capacity_values(scenario, resources, hours)
+    return pd.DataFrame(
+        {"NLDC": nldc.T.ravel(), "net_load_peak": net_load_peak.T.ravel()},
+        index=pd.MultiIndex.from_product(
+            [list(resource_sets), hours], names=["resources", "hours"]
+        ),
+    )
+
+
+def get_load_duration_curves(scenario, resource_sets=None):
+    """Get the load duration curve and the net load duration curves of classes of
+    resources.
+
+    :param powersimdata.scenario.scenario.Scenario scenario: scenario instance.
+    :param dict resource_sets: keys are labels, values are one or more resources
+        (str/list/tuple/set). If None, only the load duration curve is returned.
+    :return: (*pandas.DataFrame*) -- index: rank of the hour, starting at 1,
+        columns: *'demand'* and the labels of the classes of resources, values:
+        demand and net demand in descending order.
+    :raises TypeError: if resource_sets is not None or a dict.
+    """
+    _check_scenario_is_in_analyze_state(scenario)
+    if resource_sets is None:
+        resource_sets = {}
+    if not isinstance(resource_sets, dict):
+        raise TypeError("resource_sets must be a dict")
+    grid = get_grid(scenario)
+    resources = [
+        _check_resources_are_in_grid_and_format(r, grid) for r in resource_sets.values()
+    ]
+
+    demand, generation = _get_demand_and_generation(scenario, resources)
+    curves = np.column_stack([demand, demand[:, None] - generation])
+    return pd.DataFrame(
+        -np.sort(-curves, axis=0),
+        index=pd.RangeIndex(1, len(demand) + 1, name="rank"),
+        columns=["demand"] + list(resource_sets),
     )
-    resource_generation = scenario.get_pg()[plant_indices].sum(axis=1)
-    net_demand = total_demand - resource_generation
-    top_hours = net_demand.sort_values(ascending=False).head(hours).index
-    return resource_generation[top_hours].mean()
 
 
 def get_capacity_by_resources(scenario, area, resources, area_type=None):
@@ -80,7 +211,7 @@ def get_capacity_by_resources(scenario, area, resources, area_type=None):
     plant_id = get_plant_id_for_resources_in_area(
         scenario, area, resources, area_type=area_type
     )
-    grid = scenario.get_grid()
+    grid = get_grid(scenario)
 
     return grid.plant.loc[plant_id].groupby("type")["Pmax"].sum()
 
@@ -96,7 +227,7 @@ def get_storage_capacity(scenario, area, area_type=None):
         *'state'*, *'loadzone'*, *'state abbreviation'*, *'interconnect'* and *'all'*
     :return: (*float*) -- total storage capacity value
     """
-    grid = scenario.get_grid()
+    grid = get_grid(scenario)
     storage_id = get_storage_id_in_area(scenario, area, area_type)
 
     return grid.storage["gen"].loc[storage_id].Pmax.sum()
@@ -109,13 +240,39 @@ def sum_capacity_by_type_zone(scenario):
     :return: (*pandas.DataFrame*) -- index: generator type, column: load zone, value:
         total capacity.
     """
-    grid = scenario.get_grid()
+    grid = get_grid(scenario)
     plant = grid.plant
 
     return plant.groupby(["type", "zone_id"])["Pmax"].sum().unstack().fillna(0)
 
 
-def get_capacity_factor_time_series(scenario, area, resources, area_type=None):
+def _get_capacity_factors(scenario, dtype):
+    """Get the hourly capacity factor of every generator.
+
+    :param powersimdata.scenario.scenario.Scenario scenario: scenario instance.
+    :param numpy.dtype dtype: floating point type of the capacity factors.
+    :return: (*pandas.DataFrame*) -- index: timestamps, column: plant ids in the
+        order of the plant table, value: capacity factors.
+    """
+
+    def calculate():
+        pg = get_pg(scenario)
+        plant = get_grid(scenario).plant
+        capacity = plant["Pmax"].to_numpy(dtype=dtype)
+        cf = pg.reindex(columns=plant.index).to_numpy(dtype=dtype)
+        # generators with no capacity have a capacity factor of 0
+        has_capacity = capacity > 0
+        np.divide(cf, capacity, out=cf, where=has_capacity)
+        cf[:, ~has_capacity] = 0
+        np.clip(cf, 0, 1, out=cf)
+        return pd.DataFrame(cf, index=pg.index, columns=plant.index)
+
+    return memoize(scenario, ("capacity_factor", dtype.str), calculate)
+
+
+def get_capacity_factor_time_series(
+    scenario, area, resources, area_type=None, dtype=None
+):
     """Get the hourly capacity factor of each generator fueled by resource(s) in an
     area.
 
@@ -126,14 +283,131 @@ def get_capacity_factor_time_series(scenario, area, resources, area_type=None):
     :param str area_type: one of *'loadzone'*, *'state'*, *'state_abbr'*,
         *'interconnect'*. If None, ``area`` will be searched successively into
         *'state'*, *'loadzone'*, *'state abbreviation'*, *'interconnect'* and *'all'*
+    :param str/type/numpy.dtype dtype: floating point type of the capacity factors.
+        If None, the package-level precision is used, see
+        :func:`postreise.precision.set_precision`.
     :return: (*pandas.DataFrame*) -- index: timestamps, column: plant ids,
-        value: capacity factors
+        value: capacity factors. Generators with no capacity have a capacity factor
+        of 0.
     """
     _check_scenario_is_in_analyze_state(scenario)
+    dtype = get_dtype(dtype)
     plant_id = get_plant_id_for_resources_in_area(
         scenario, area, resources, area_type=area_type
     )
-    pg = scenario.get_pg()[plant_id]
-    capacity = scenario.get_grid().plant.loc[plant_id, "Pmax"]
-    cf = (pg / capacity).replace(np.inf, 0).clip(0, 1)
-    return cf
+    return _get_capacity_factors(scenario, dtype)[plant_id]
+
+
+def _get_area_resource_weights(scenario, areas, resources, area_type=None):
+    """Get the weight of each generator in the capacity of area/resource groups.
+
+    :param powersimdata.scenario.scenario.Scenario scenario: scenario instance.
+    :param list areas: areas, see :func:`get_capacity_factor_time_series`.
+    :param list resources: resources.
+    :param str area_type: type of the areas, see
+        :func:`get_capacity_factor_time_series`.
+    :return: (*tuple*) -- weights as a numpy.ndarray of shape (number of generators,
+        number of groups), total capacity of each group as a numpy.ndarray and groups
+        as a pandas.MultiIndex.
+    """
+    grid = get_grid(scenario)
+    resources = sorted(_check_resources_and_format(resources, grid.model_immutables))
+    index = get_grid_index(scenario)
+    capacity = grid.plant["Pmax"].to_numpy(dtype=float)
+    groups = pd.MultiIndex.from_product([areas, resources], names=["area", "type"])
+    weights = np.zeros((len(capacity), len(groups)))
+    for i, (area, resource) in enumerate(groups):
+        positions = index.get_plant_positions(area, resource, area_type=area_type)
+        weights[positions, i] = capacity[positions]
+    total = weights.sum(axis=0)
+    np.divide(weights, total, out=weights, where=total > 0)
+    return weights, total, groups
+
+
+def _get_capacity_factor_profiles(
+    scenario, areas, resources, area_type=None, dtype=None
+):
+    """Get the capacity weighted hourly capacity factor of area/resource groups.
+
+    :param powersimdata.scenario.scenario.Scenario scenario: scenario instance.
+    :param str/list areas: see :func:`get_capacity_factor_profiles`.
+    :param str/list resources: see :func:`get_capacity_factor_profiles`.
+    :param str area_type: see :func:`get_capacity_factor_profiles`.
+    :param str/type/numpy.dtype dtype: see :func:`get_capacity_factor_profiles`.
+    :return: (*tuple*) -- profiles as a pandas.DataFrame and total capacity of each
+        group as a numpy.ndarray.
+    """
+    _check_scenario_is_in_analyze_state(scenario)
+    dtype = get_dtype(dtype)
+    areas = [areas] if isinstance(areas, str) else list(areas)
+    weights, total, groups = _get_area_resource_weights(
+        scenario, areas, resources, area_type=area_type
+    )
+    cf = _get_capacity_factors(scenario, dtype)
+    profiles = cf.to_numpy() @ weights.astype(dtype)
+    profiles[:, total == 0] = np.nan
+    return pd.DataFrame(profiles, index=cf.index, columns=groups), total
+
+
+def get_capacity_factor_profiles(
+    scenario, areas, resources, area_type=None, dtype=None
+):
+    """Get the hourly capacity factor of the generators fueled by each resource in
+    each area.
+
+    :param powersimdata.scenario.scenario.Scenario scenario: scenario instance.
+    :param str/list areas: one or a list of areas, see
+        :func:`get_capacity_factor_time_series`.
+    :param str/list resources: one or a list of resources.
+    :param str area_type: one of *'loadzone'*, *'state'*, *'state_abbr'*,
+        *'interconnect'*, used for all the areas. If None, each area will be searched
+        successively into *'state'*, *'loadzone'*, *'state abbreviation'*,
+        *'interconnect'* and *'all'*.
+    :param str/type/numpy.dtype dtype: floating point type of the capacity factors.
+        If None, the package-level precision is used, see
+        :func:`postreise.precision.set_precision`.
+    :return: (*pandas.DataFrame*) -- index: timestamps, columns: (area, resource)
+        multi index, value: capacity factor of the generators, weighted by their
+        capacity. NaN if there is no generator of a resource in an area.
+
+    .. note::
+        The capacity factor of all the generators is calculated once per scenario
+        and aggregated for all the (area, resource) groups in a single matrix
+        product.
+    """
+    return _get_capacity_factor_profiles(
+        scenario, areas, resources, area_type=area_type, dtype=dtype
+    )[0]
+
+
+def get_capacity_factor_stats(
+    scenario, areas, resources, area_type=None, quantiles=(0.1, 0.5, 0.9), dtype=None
+):
+    """Get statistics of the hourly capacity factor of the generators fueled by each
+    resource in each area.
+
+    :param powersimdata.scenario.scenario.Scenario scenario: scenario instance.
+    :param str/list areas: one or a list of areas, see
+        :func:`get_capacity_factor_profiles`.
+    :param str/list resources: one or a list of resources.
+    :param str area_type: type of the areas, see
+        :func:`get_capacity_factor_profiles`.
+    :param iterable quantiles: quantiles of the hourly capacity factor to calculate.
+    :param str/type/numpy.dtype dtype: floating point type of the capacity factors.
+        If None, the package-level precision is used, see
+        :func:`postreise.precision.set_precision`.
+    :return: (*pandas.DataFrame*) -- index: (area, resource) multi index, columns:
+        *'capacity'* (total capacity), *'mean'* (mean capacity factor) and the
+        quantiles.
+    """
+    profiles, total = _get_capacity_factor_profiles(
+        scenario, areas, resources, area_type=area_type, dtype=dtype
+    )
+    stats = pd.DataFrame(
+        {"capacity": total, "mean": profiles.mean().to_numpy()}, index=profiles.columns
+    )
+    quantiles = list(quantiles)
+    if quantiles:
+        values = np.quantile(profiles.to_numpy(), quantiles, axis=0)
+        stats = stats.join(pd.DataFrame(values.T, index=stats.index, columns=quantiles))
+    return stats
@@ -1,53 +1,358 @@
 import numpy as np
 import pandas as pd
 from numpy.polynomial.polynomial import polyval
-from powersimdata.input.check import _check_gencost, _check_time_series
+from powersimdata.input.check import _check_data_frame, _check_time_series
 from powersimdata.scenario.check import _check_scenario_is_in_analyze_state
 
+from postreise.analyze.time import _get_resample_rule
+from postreise.cache import get_grid, get_pg
+from postreise.precision import get_dtype
+
+
+def _check_cost_curves(gencost):
+    """Ensure cost curves are valid polynomial or piecewise linear curves.
+
+    :param pandas.DataFrame gencost: cost curves.
+    :raises TypeError: if ``gencost`` is not a data frame or if the number of
+        coefficients/points is not an integer.
+    :raises ValueError: if ``gencost`` is empty, curves are neither polynomial (type
+        2) nor piecewise linear (type 1), the number of coefficients/points is too
+        small or columns are missing.
+    """
+    if not isinstance(gencost, pd.DataFrame):
+        raise TypeError("gencost must be a pandas.DataFrame object")
+    _check_data_frame(gencost, "gencost")
+    for c in ("type", "n"):
+        if c not in gencost.columns:
+            raise ValueError(f"gencost must have column {c}")
+    if not set(gencost["type"]) <= {1, 2}:
+        raise ValueError("each gencost must be type 1 (piecewise linear) or 2")
+    n = gencost["n"].to_numpy()
+    if not all(isinstance(i, (int, np.integer)) for i in n):
+        raise TypeError("number of coefficients/points must be specified as an int")
+    is_linear = (gencost["type"] == 1).to_numpy()
+    if (n[~is_linear] < 1).any():
+        raise ValueError("polynomial must be at least of order 1 (constant)")
+    if (n[is_linear] < 2).any():
+        raise ValueError("piecewise linear curve must have at least 2 points")
+    columns = [f"c{i}" for i in range(n[~is_linear].max(initial=0))]
+    for i in range(n[is_linear].max(initial=0)):
+        columns += [f"p{i + 1}", f"f{i + 1}"]
+    for c in columns:
+        if c not in gencost.columns:
+            raise ValueError(f"gencost must have column {c}")
+
+
+def _get_polynomial_costs(values, gencost, dtype, derivative=False):
+    """Evaluate polynomial cost curves or their derivative.
+
+    :param numpy.ndarray values: power, hours as rows and generators as columns.
+    :param pandas.DataFrame gencost: polynomial cost curves of the generators, in the
+        order of the columns of ``values``.
+    :param numpy.dtype dtype: floating point type of the costs.
+    :param bool derivative: evaluate the derivative of the curves instead.
+    :return: (*numpy.ndarray*) -- costs or marginal costs.
+    """
+    n = gencost["n"].to_numpy(dtype=int)
+    # coefficients beyond the order of a polynomial are set to 0
+    order = np.arange(n.max())
+    coefficients = gencost[[f"c{i}" for i in order]].to_numpy(dtype=dtype).T
+    coefficients = np.where(order[:, None] < n, coefficients, dtype.type(0))
+    if derivative:
+        coefficients = coefficients[1:] * order[1:, None].astype(dtype)
+        if len(coefficients) == 0:
+            return np.zeros(values.shape, dtype=dtype)
+    return polyval(values, coefficients, tensor=False)
+
+
+def _get_piecewise_linear_costs(values, gencost, dtype, derivative=False):
+    """Evaluate piecewise linear cost curves or their derivative. Power outside of
+    the breakpoints is costed by extending the first or last segment. At a
+    breakpoint, the derivative is the slope of the following segment.
+
+    :param numpy.ndarray values: power, hours as rows and generators as columns.
+    :param pandas.DataFrame gencost: piecewise linear cost curves of the generators,
+        in the order of the columns of ``values``.
+    :param numpy.dtype dtype: floating point type of the costs.
+    :param bool derivative: evaluate the derivative of the curves instead.
+    :return: (*numpy.ndarray*) -- costs or marginal costs.
+    """
+    n = gencost["n"].to_numpy(dtype=int)
+    points = np.arange(n.max())
+    # breakpoints beyond the number of points of a curve are never reached
+    power = gencost[[f"p{i + 1}" for i in points]].to_numpy(dtype=dtype)
+    power = np.where(points < n[:, None], power, dtype.type(np.inf))
+    cost = gencost[[f"f{i + 1}" for i in points]].to_numpy(dtype=dtype)
+    with np.errstate(invalid="ignore"):
+        width = np.diff(power, axis=1)
+        slope = np.divide(
+            np.diff(cost, axis=1),
+            width,
+            out=np.zeros_like(width),
+            where=np.isfinite(width) & (width > 0),
+        )
+
+    # index of the segment of each value: number of breakpoints below the value
+    segment = np.zeros(values.shape, dtype=np.intp)
+    for i in points[1:]:
+        segment += values >= power[:, i]
+    segment = np.minimum(segment, n - 2)
+    plant = np.arange(len(n))
+    if derivative:
+        return slope[plant, segment]
+    return (
+        cost[plant, segment] + (values - power[plant, segment]) * slope[plant, segment]
+    )
+
+
+def _evaluate_cost_curves(values, gencost, dtype, derivative=False):
+    """Evaluate polynomial and piecewise linear cost curves or their derivative.
+
+    :param numpy.ndarray values: power, hours as rows and generators as columns.
+    :param pandas.DataFrame gencost: cost curves of the generators, in the order of
+        the columns of ``values``.
+    :param numpy.dtype dtype: floating point type of the costs.
+    :param bool derivative: evaluate the derivative of the curves instead.
+    :return: (*numpy.ndarray*) -- costs or marginal costs.
+    """
+    costs = np.empty(values.shape, dtype=dtype)
+    is_linear = (gencost["type"] == 1).to_numpy()
+    for is_type, func in [
+        (~is_linear, _get_polynomial_costs),
+        (is_linear, _get_piecewise_linear_costs),
+    ]:
+        if is_type.all():
+            costs = func(values, gencost, dtype, derivative)
+        elif is_type.any():
+            costs[:, is_type] = func(
+                values[:, is_type], gencost[is_type], dtype, derivative
+            )
+    return costs
+
+
+def _get_pg_and_gencost(scenario, pg, gencost):
+    """Get the generation and the cost curves to evaluate, either from a scenario or
+    as passed.
+
+    :param powersimdata.scenario.scenario.Scenario scenario: scenario to analyze.
+    :param pandas.DataFrame pg: Generation solution data frame.
+    :param pandas.DataFrame gencost: cost curves, in the order of the columns of
+        ``pg``.
+    :return: (*tuple*) -- generation and cost curves data frames.
+    :raises ValueError: if not (``scenario`` XOR (``pg`` AND ``gencost``)) is specified,
+        or if ``pg`` is passed and has negative values, or if ``gencost`` is passed
+        and is not valid.
+    """
+    # Check that we've appropriately specified `scenario` XOR (`pg` AND `gencost`)
+    if not ((scenario is not None) ^ (pg is not None and gencost is not None)):
+        raise ValueError("Either scenario XOR (pg AND gencost) must be specified")
+    if scenario is not None:
+        _check_scenario_is_in_analyze_state(scenario)
+        return get_pg(scenario), get_grid(scenario).gencost["before"]
+    _check_cost_curves(gencost)
+    _check_time_series(pg, "PG")
+    if (pg < -1e-3).any(axis=None):
+        raise ValueError("PG must be non-negative")
+    return pg, gencost
+
 
 def calculate_costs(
-    scenario=None, pg=None, gencost=None, decommit=False, decommit_threshold=1
+    scenario=None,
+    pg=None,
+    gencost=None,
+    decommit=False,
+    decommit_threshold=1,
+    dtype=None,
 ):
     """Calculate individual generator costs at given powers. If decommit is
     True, costs will be zero below the decommit threshold (1 MW).
     Either ``scenario`` XOR (``pg`` AND ``gencost``) must be specified.
+    Cost curves can be polynomials of any order (type 2, coefficients in columns
+    *'c0'*, *'c1'*, ...) or piecewise linear (type 1, points in columns *'p1'*,
+    *'f1'*, *'p2'*, *'f2'*, ...), with a number of coefficients/points given by
+    column *'n'* for each generator.
 
     :param powersimdata.scenario.scenario.Scenario scenario: scenario to analyze.
     :param pandas.DataFrame pg: Generation solution data frame.
-    :param pandas.DataFrame gencost: cost curve polynomials.
+    :param pandas.DataFrame gencost: cost curves, in the order of the columns of
+        ``pg``.
     :param bool decommit: Whether to decommit generator at low power.
     :param int/float decommit_threshold: The power (MW) below which generators are
         assumed to be 'decommitted', and costs are zero (if ``decommit`` is True).
+    :param str/type/numpy.dtype dtype: floating point type of the costs. If None, the
+        package-level precision is used, see :func:`postreise.precision.set_precision`.
     :raises ValueError: if not (``scenario`` XOR (``pg`` AND ``gencost``)) is specified,
-        or if ``pg`` is passed and has negative values.
+        or if ``pg`` is passed and has negative values, or if ``gencost`` is passed
+        and is not valid.
     :return: (*pandas.DataFrame*) -- data frame of costs.
         Index is hours, columns are plant IDs, values are $/hour.
     """
-
-    # Check that we've appropriately specified `scenario` XOR (`pg` AND `gencost`)
-    if not ((scenario is not None) ^ (pg is not None and gencost is not None)):
-        raise ValueError("Either scenario XOR (pg AND gencost) must be specified")
-    if scenario is not None:
-        _check_scenario_is_in_analyze_state(scenario)
-        pg = scenario.get_pg()
-        gencost = scenario.get_grid().gencost["before"]
-    else:
-        _check_gencost(gencost)
-        _check_time_series(pg, "PG")
-        if (pg < -1e-3).any(axis=None):
-            raise ValueError("PG must be non-negative")
-    # get ordered polynomial coefficients in columns, discarding non-coefficient data
-    num_coefficients = gencost["n"].iloc[0]
-    coefficient_columns = [f"c{i}" for i in range(num_coefficients)]
-    coefficients = gencost[coefficient_columns].to_numpy().T
-
-    # elementwise, evaluate polynomial where x = value
-    costs = polyval(pg.to_numpy(), coefficients, tensor=False)
+    pg, gencost = _get_pg_and_gencost(scenario, pg, gencost)
+    dtype = get_dtype(dtype)
+    values = pg.to_numpy(dtype=dtype)
+    costs = _evaluate_cost_curves(values, gencost, dtype)
 
     if decommit:
         # mask values where pg is 0 to 0 cost (assume uncommitted, no cost)
-        costs = np.where(pg.to_numpy() < decommit_threshold, 0, costs)
+        costs = np.where(values < decommit_threshold, dtype.type(0), costs)
 
     # Finally, convert to dataframe with shape that matches `pg`
     costs = pd.DataFrame(costs, columns=pg.columns, index=pg.index)
     return costs
+
+
+def calculate_marginal_costs(scenario=None, pg=None, gencost=None, dtype=None):
+    """Calculate individual generator marginal costs, i.e. the derivative of the cost
+    curves, at given powers. Either ``scenario`` XOR (``pg`` AND ``gencost``) must
+    be specified.
+
+    :param powersimdata.scenario.scenario.Scenario scenario: scenario to analyze.
+    :param pandas.DataFrame pg: Generation solution data frame.
+    :param pandas.DataFrame gencost: cost curves, in the order of the columns of
+        ``pg``, see :func:`calculate_costs`.
+    :param str/type/numpy.dtype dtype: floating point type of the marginal costs. If
+        None, the package-level precision is used, see
+        :func:`postreise.precision.set_precision`.
+    :raises ValueError: if not (``scenario`` XOR (``pg`` AND ``gencost``)) is specified,
+        or if ``pg`` is passed and has negative values, or if ``gencost`` is passed
+        and is not valid.
+    :return: (*pandas.DataFrame*) -- data frame of marginal costs.
+        Index is hours, columns are plant IDs, values are $/MWh.
+
+    .. note::
+        The marginal cost of a piecewise linear curve at a breakpoint is the slope of
+        the following segment.
+    """
+    pg, gencost = _get_pg_and_gencost(scenario, pg, gencost)
+    dtype = get_dtype(dtype)
+    marginal_costs = _evaluate_cost_curves(
+        pg.to_numpy(dtype=dtype), gencost, dtype, derivative=True
+    )
+    return pd.DataFrame(marginal_costs, columns=pg.columns, index=pg.index)
+
+
+def _get_cost_groups(plant, plant_id, by):
+    """Get the group of each generator.
+
+    :param pandas.DataFrame plant: plant table.
+    :param pandas.Index plant_id: plant ids, in the order of the columns of PG.
+    :param str/list by: plant id (*'plant_id'*) and/or columns of the plant table.
+        If None, all generators are in a single group.
+    :return: (*tuple*) -- group code of each generator as numpy.ndarray and groups as
+        pandas.Index/pandas.MultiIndex, in ascending order. Groups are None if
+        ``by`` is None.
+    :raises TypeError: if ``by`` is not None, a str or a list of str.
+    :raises ValueError: if ``by`` is not the plant id or a column of the plant table.
+    """
+    if by is None:
+        return np.zeros(len(plant_id), dtype=int), None
+    columns = [by] if isinstance(by, str) else by
+    if not isinstance(columns, list) or not all(isinstance(c, str) for c in columns):
+        raise TypeError("by must be a str or a list of str")
+    if len(columns) == 0:
+        raise ValueError("by must not be empty")
+    for c in columns:
+        if c != "plant_id" and c not in plant.columns:
+            raise ValueError(f"{c} is not the plant id or a column of the plant table")
+    keys = plant.loc[plant_id].reset_index()
+    keys = keys.rename(columns={keys.columns[0]: "plant_id"})[columns]
+    if len(columns) == 1:
+        codes, groups = pd.factorize(keys[columns[0]], sort=True)
+        return codes, pd.Index(groups, name=columns[0])
+    codes, groups = pd.factorize(pd.MultiIndex.from_frame(keys), sort=True)
+    return codes, pd.MultiIndex.from_tuples(groups, names=columns)
+
+
+def _get_cost_periods(index, freq):
+    """Get the period of each timestamp.
+
+    :param pandas.DatetimeIndex index: sorted timestamps.
+    :param str freq: frequency, see :func:`summarize_costs`. If None, all timestamps
+        are in a single period.
+    :return: (*tuple*) -- period code of each timestamp as numpy.ndarray and periods
+        as pandas.DatetimeIndex, labelled by their left edge. Periods are None if
+        ``freq`` is None.
+    """
+    if freq is None:
+        return np.zeros(len(index), dtype=int), None
+    rule = _get_resample_rule(freq)
+    size = pd.Series(0, index=index).resample(rule, label="left", closed="left")
+    size = size.size()
+    size = size[size > 0]
+    return np.repeat(np.arange(len(size)), size.to_numpy()), size.index
+
+
+def summarize_costs(
+    scenario,
+    by=None,
+    freq=None,
+    decommit=False,
+    decommit_threshold=1,
+    chunk_size=744,
+    dtype=None,
+):
+    """Sum the costs of generators by group and period, without building the hourly
+    costs of all the generators.
+
+    :param powersimdata.scenario.scenario.Scenario scenario: scenario to analyze.
+    :param str/list by: *'plant_id'* and/or column(s) of the plant table used to
+        group generators, e.g. *'type'*, *'zone_name'* or ``["type", "zone_id"]``.
+        Default to None, which sums all generators.
+    :param str freq: frequency of the periods, either *'D'* (day), *'W'* (week),
+        *'M'* (month), *'Q'* (quarter), *'A'* (year), *'H'* or a multiple of hours,
+        e.g. *'6H'*. Default to None, which sums all hours. Periods follow the
+        conventions of :func:`postreise.analyze.time.resample_time_series` and are
+        not clipped when incomplete.
+    :param bool decommit: Whether to decommit generator at low power, see
+        :func:`calculate_costs`.
+    :param int/float decommit_threshold: The power (MW) below which generators are
+        assumed to be 'decommitted'.
+    :param int chunk_size: number of hours processed at once. Default to 744 (31
+        days). Peak memory of intermediate calculations is bounded by the chunk size.
+    :param str/type/numpy.dtype dtype: floating point type of the hourly costs. If
+        None, the package-level precision is used, see
+        :func:`postreise.precision.set_precision`. Sums are accumulated in float64.
+    :return: (*float/pandas.Series/pandas.DataFrame*) -- costs in $. If ``freq`` is
+        None, total cost (``by`` is None) or series indexed by group. Otherwise,
+        series (``by`` is None) or data frame with periods as index and groups as
+        columns.
+    :raises TypeError: if ``by`` is not None, a str or a list of str, if ``freq``
+        is not None or a str or if ``chunk_size`` is not an int.
+    :raises ValueError: if ``by`` is not the plant id or a column of the plant table,
+        if ``freq`` is not supported or if ``chunk_size`` is not positive.
+    """
+    _check_scenario_is_in_analyze_state(scenario)
+    if not isinstance(chunk_size, int):
+        raise TypeError("chunk_size must be an int")
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be positive")
+    dtype = get_dtype(dtype)
+    pg = get_pg(scenario)
+    grid = get_grid(scenario)
+    group_codes, groups = _get_cost_groups(grid.plant, pg.columns, by)
+    period_codes, periods = _get_cost_periods(pg.index, freq)
+
+    # generators are sorted by group so that each group is a contiguous block
+    order = np.argsort(group_codes, kind="stable")
+    group_starts = np.flatnonzero(np.r_[True, np.diff(group_codes[order]) != 0])
+    gencost = grid.gencost["before"].iloc[order]
+    n_periods = 1 if periods is None else len(periods)
+    total = np.zeros((n_periods, len(group_starts)))
+    for start in range(0, len(pg), chunk_size):
+        values = pg.iloc[start : start + chunk_size].to_numpy(dtype=dtype)[:, order]
+        costs = _evaluate_cost_curves(values, gencost, dtype)
+        if decommit:
+            costs[values < decommit_threshold] = 0
+        costs = np.add.reduceat(costs, group_starts, axis=1, dtype=float)
+        codes = period_codes[start : start + chunk_size]
+        period_starts = np.flatnonzero(np.r_[True, np.diff(codes) != 0])
+        total[codes[period_starts]] += np.add.reduceat(costs, period_starts, axis=0)
+
+    total = total.astype(dtype, copy=False)
+    if periods is None:
+        if groups is None:
+            return float(total.sum())
+        return pd.Series(total[0], index=groups)
+    if groups is None:
+        return pd.Series(total[:, 0], index=periods)
+    return pd.DataFrame(total, index=periods, columns=groups)
@@ -1,6 +1,8 @@
+import numpy as np
 import pandas as pd
 from powersimdata.input.check import (
     _check_areas_are_in_grid_and_format,
+    _check_resources_are_in_grid_and_format,
     _check_resources_are_renewable_and_format,
 )
 from powersimdata.input.helpers import (
@@ -8,40 +10,183 @@ from powersimdata.input.helpers import (
     decompose_plant_data_frame_into_areas_and_resources,
     decompose_plant_data_frame_into_resources,
     decompose_plant_data_frame_into_resources_and_areas,
-    get_plant_id_for_resources,
-    get_plant_id_for_resources_in_area,
-    summarize_plant_to_bus,
-    summarize_plant_to_location,
 )
 from powersimdata.scenario.check import _check_scenario_is_in_analyze_state
 
-from postreise.analyze.generation.summarize import (
-    get_generation_time_series_by_resources,
+from postreise.cache import (
+    get_grid,
+    get_grid_index,
+    get_pg,
+    get_plant_id_for_resources_in_area,
+    get_solar,
+    get_wind,
+    memoize,
 )
+from postreise.precision import get_dtype
 
 
-def calculate_curtailment_time_series(scenario):
-    """Calculate hourly curtailment for each renewable generator.
+class CurtailmentResult:
+    """Hourly curtailment of every renewable generator in a scenario. The profiles,
+    the generation and the curtailment of the renewable generators are extracted once
+    and all the breakdowns of this module are derived from them.
 
     :param powersimdata.scenario.scenario.Scenario scenario: scenario instance.
-    :return: (*pandas.DataFrame*) -- time series of curtailment.
+    :param str/type/numpy.dtype dtype: floating point type of the arrays. If None,
+        the package-level precision is used, see
+        :func:`postreise.precision.set_precision`.
+
+    .. note::
+        The arrays held by the instance are read-only since they are shared by all the
+        data frames returned by :meth:`to_frame`. Public functions of this module
+        return copies.
     """
-    _check_scenario_is_in_analyze_state(scenario)
-    grid = scenario.get_grid()
-    pg = scenario.get_pg()
-
-    plant_id = list(
-        get_plant_id_for_resources(
-            grid.model_immutables.plants["renewable_resources"].intersection(
-                set(grid.plant.type)
-            ),
-            grid,
+
+    def __init__(self, scenario, dtype=None):
+        """Constructor."""
+        _check_scenario_is_in_analyze_state(scenario)
+        dtype = get_dtype(dtype)
+        grid = get_grid(scenario)
+        pg = get_pg(scenario)
+
+        self.grid = grid
+        self.resources = grid.model_immutables.plants[
+            "renewable_resources"
+        ].intersection(set(grid.plant.type))
+        position = get_grid_index(scenario).get_plant_positions(
+            resources=self.resources
+        )
+        self.plant_id = grid.plant.index[position]
+        self.plant_type = grid.plant["type"].to_numpy()[position]
+        self.index = pg.index
+
+        profiles = pd.concat([get_solar(scenario), get_wind(scenario)], axis=1)
+        profiles = profiles[self.plant_id]
+        if not profiles.index.equals(pg.index):
+            profiles = profiles.reindex(pg.index)
+        self.profiles = profiles.to_numpy(dtype=dtype)
+        self.pg = pg[self.plant_id].to_numpy(dtype=dtype)
+        self.curtailment = np.clip(self.profiles - self.pg, 0, None).round(6)
+        for a in (self.profiles, self.pg, self.curtailment):
+            a.flags.writeable = False
+
+    def get_position(self, plant_id):
+        """Get the column positions of plants in the arrays of the instance.
+
+        :param list/pandas.Index plant_id: plant id.
+        :return: (*numpy.ndarray*) -- column positions.
+        """
+        return self.plant_id.get_indexer(plant_id)
+
+    def to_frame(self):
+        """Get the hourly curtailment of each renewable generator.
+
+        :return: (*pandas.DataFrame*) -- index: timestamps, columns: plant id, values:
+            curtailment.
+        """
+        return pd.DataFrame(self.curtailment, index=self.index, columns=self.plant_id)
+
+    def sum_by_plant(self):
+        """Get the total curtailment and the total potential of each generator.
+
+        :return: (*pandas.DataFrame*) -- index: plant id, columns: *'curtailment'* and
+            *'potential'*.
+        """
+        return pd.DataFrame(
+            {
+                "curtailment": self.curtailment.sum(axis=0),
+                "potential": self.profiles.sum(axis=0),
+            },
+            index=self.plant_id,
+        )
+
+    def sum_by_type(self):
+        """Get the total curtailment and the total potential of each resource.
+
+        :return: (*pandas.DataFrame*) -- index: resources, columns: *'curtailment'*
+            and *'potential'*.
+        """
+        return self.sum_by_plant().groupby(self.plant_type).sum()
+
+    def sum_by_type_and_column(self, column):
+        """Get the total curtailment of each resource in each group of plants sharing
+        the same value(s) in the plant table.
+
+        :param str/list column: column(s) of the plant table used for grouping.
+        :return: (*pandas.Series*) -- total curtailment indexed by (resource, group).
+        """
+        keys = self.grid.plant.loc[self.plant_id, column]
+        keys = [keys[c] for c in column] if isinstance(column, list) else [keys]
+        return (
+            self.sum_by_plant()["curtailment"]
+            .groupby([pd.Index(self.plant_type, name="type")] + keys)
+            .sum()
+        )
+
+    def time_series_by_types_in_plants(self, plant_id, resources):
+        """Get the hourly curtailment of a set of plants aggregated by resource.
+        Curtailment is calculated from the aggregated profiles and generation.
+
+        :param list plant_id: plant id.
+        :param iterable resources: resources to report, the ones with no plant in
+            ``plant_id`` are dropped.
+        :return: (*pandas.DataFrame*) -- index: timestamps, columns: resources.
+        """
+        position = self.get_position(plant_id)
+        position = position[position >= 0]
+        plant_type = self.plant_type[position]
+        curtailment = {}
+        for r in sorted(set(resources) & set(plant_type)):
+            p = position[plant_type == r]
+            curtailment[r] = self.profiles[:, p].sum(axis=1) - self.pg[:, p].sum(axis=1)
+        return pd.DataFrame(curtailment, index=self.index).clip(lower=0)
+
+
+def get_curtailment_result(scenario, dtype=None):
+    """Get the curtailment of a scenario, calculating it on first access only.
+
+    :param powersimdata.scenario.scenario.Scenario scenario: scenario instance.
+    :param str/type/numpy.dtype dtype: floating point type of the curtailment. If
+        None, the package-level precision is used.
+    :return: (*postreise.analyze.generation.curtailment.CurtailmentResult*) --
+        curtailment of the renewable generators in the scenario.
+    """
+    dtype = get_dtype(dtype)
+    return memoize(
+        scenario,
+        ("curtailment", dtype.str),
+        lambda: CurtailmentResult(scenario, dtype=dtype),
+    )
+
+
+def _get_renewable_resources(resources, grid):
+    """Format the renewable resources to analyze.
+
+    :param str/tuple/list/set resources: names of resources. If None, all renewable
+        resources in the grid are returned.
+    :param powersimdata.input.grid.Grid grid: grid instance.
+    :return: (*set*) -- renewable resources.
+    """
+    if resources is None:
+        return grid.model_immutables.plants["renewable_resources"].intersection(
+            set(grid.plant.type)
         )
+    resources = _check_resources_are_renewable_and_format(
+        resources, mi=grid.model_immutables
     )
-    profiles = pd.concat([scenario.get_solar(), scenario.get_wind()], axis=1)
+    return _check_resources_are_in_grid_and_format(resources, grid)
 
-    curtailment = (profiles[plant_id] - pg[plant_id]).clip(lower=0).round(6)
-    return curtailment
+
+def calculate_curtailment_time_series(scenario, dtype=None):
+    """Calculate hourly curtailment for each renewable generator.
+
+    :param powersimdata.scenario.scenario.Scenario scenario: scenario instance.
+    :param str/type/numpy.dtype dtype: floating point type of the curtailment. If
+        None, the package-level precision is used, see
+        :func:`postreise.precision.set_precision`.
+    :return: (*pandas.DataFrame*) -- time series of curtailment.
+    """
+    curtailment = get_curtailment_result(scenario, dtype=dtype).to_frame()
+    return pd.DataFrame(curtailment, copy=True)
 
 
 def calculate_curtailment_time_series_by_resources(scenario, resources=None):
@@ -53,20 +198,13 @@ def calculate_curtailment_time_series_by_resources(scenario, resources=None):
     :return: (*dict*) -- keys are resources, values are data frames indexed by
         (datetime, plant id).
     """
-    curtailment = calculate_curtailment_time_series(scenario)
-    grid = scenario.get_grid()
-
-    if resources is None:
-        resources = grid.model_immutables.plants["renewable_resources"].intersection(
-            set(grid.plant.type)
-        )
-    else:
-        resources = _check_resources_are_renewable_and_format(
-            resources, mi=grid.model_immutables
-        )
+    _check_scenario_is_in_analyze_state(scenario)
+    grid = get_grid(scenario)
+    resources = _get_renewable_resources(resources, grid)
+    curtailment = get_curtailment_result(scenario)
 
     curtailment_by_resources = decompose_plant_data_frame_into_resources(
-        curtailment, resources, grid
+        curtailment.to_frame(), resources, curtailment.grid
     )
 
     return curtailment_by_resources
@@ -82,8 +220,8 @@ def calculate_curtailment_time_series_by_areas(scenario, areas=None):
     :return: (*dict*) -- keys are areas, values are data frames indexed by
         (datetime, plant id).
     """
-    curtailment = calculate_curtailment_time_series(scenario)
-    grid = scenario.get_grid()
+    curtailment = get_curtailment_result(scenario)
+    grid = curtailment.grid
 
     areas = (
         _check_areas_are_in_grid_and_format(areas, grid)
@@ -92,7 +230,7 @@ def calculate_curtailment_time_series_by_areas(scenario, areas=None):
     )
 
     curtailment_by_areas = decompose_plant_data_frame_into_areas(
-        curtailment, areas, grid
+        curtailment.to_frame(), areas, grid
     )
 
     return curtailment_by_areas
@@ -107,19 +245,11 @@ def calculate_curtailment_percentage_by_resources(scenario, resources=None):
         all renewable resources.
     :return: (*float*) -- average curtailment fraction over the scenario.
     """
-    curtailment = calculate_curtailment_time_series_by_resources(scenario, resources)
-    resources = set(curtailment.keys())
-    grid = scenario.get_grid()
-
-    total_curtailment = {r: curtailment[r].sum().sum() for r in resources}
-
-    profiles = pd.concat([scenario.get_solar(), scenario.get_wind()], axis=1)
-    total_potential = profiles.groupby(grid.plant.type, axis=1).sum().sum()
+    _check_scenario_is_in_analyze_state(scenario)
+    resources = _get_renewable_resources(resources, get_grid(scenario))
 
-    curtailment_percentage = (
-        sum(v for v in total_curtailment.values())
-        / total_potential.loc[list(resources)].sum()
-    )
+    total = get_curtailment_result(scenario).sum_by_type().loc[list(resources)].sum()
+    curtailment_percentage = total["curtailment"] / total["potential"]
 
     return curtailment_percentage
 
@@ -139,27 +269,19 @@ def calculate_curtailment_time_series_by_areas_and_resources(
     :return: (*dict*) -- keys are areas, values are dictionaries whose keys are
         resources and values are data frames indexed by (datetime, plant id).
     """
-    curtailment = calculate_curtailment_time_series(scenario)
-    grid = scenario.get_grid()
+    curtailment = get_curtailment_result(scenario)
+    grid = curtailment.grid
 
     areas = (
         _check_areas_are_in_grid_and_format(areas, grid)
         if areas is not None
         else {"interconnect": grid.interconnect}
     )
-
-    if resources is None:
-        resources = grid.model_immutables.plants["renewable_resources"].intersection(
-            set(grid.plant.type)
-        )
-    else:
-        resources = _check_resources_are_renewable_and_format(
-            resources, mi=grid.model_immutables
-        )
+    resources = _get_renewable_resources(resources, grid)
 
     curtailment_by_areas_and_resources = (
         decompose_plant_data_frame_into_areas_and_resources(
-            curtailment, areas, resources, grid
+            curtailment.to_frame(), areas, resources, grid
         )
     )
     return curtailment_by_areas_and_resources
@@ -180,27 +302,19 @@ def calculate_curtailment_time_series_by_resources_and_areas(
     :return: (*dict*) -- keys are resources, values are dictionaries whose keys are
         areas and values are data frames indexed by (timestamp, plant id).
     """
-    curtailment = calculate_curtailment_time_series(scenario)
-    grid = scenario.get_grid()
+    curtailment = get_curtailment_result(scenario)
+    grid = curtailment.grid
 
     areas = (
         _check_areas_are_in_grid_and_format(areas, grid)
         if areas is not None
         else {"interconnect": grid.interconnect}
     )
-
-    if resources is None:
-        resources = grid.model_immutables.plants["renewable_resources"].intersection(
-            set(grid.plant.type)
-        )
-    else:
-        resources = _check_resources_are_renewable_and_format(
-            resources, mi=grid.model_immutables
-        )
+    resources = _get_renewable_resources(resources, grid)
 
     curtailment_by_resources_and_areas = (
         decompose_plant_data_frame_into_resources_and_areas(
-            curtailment, resources, areas, grid
+            curtailment.to_frame(), resources, areas, grid
         )
     )
     return curtailment_by_resources_and_areas
@@ -213,13 +327,10 @@ def summarize_curtailment_by_bus(scenario):
     :return: (*dict*) -- keys are resources, values are dict of
         (bus: curtailment vector).
     """
-    curtailment = calculate_curtailment_time_series_by_resources(scenario)
-    grid = scenario.get_grid()
+    curtailment = get_curtailment_result(scenario)
+    total = curtailment.sum_by_type_and_column("bus_id")
 
-    bus_curtailment = {
-        ren_type: summarize_plant_to_bus(curtailment_df, grid).sum().to_dict()
-        for ren_type, curtailment_df in curtailment.items()
-    }
+    bus_curtailment = {r: total.loc[r].to_dict() for r in curtailment.resources}
 
     return bus_curtailment
 
@@ -231,13 +342,10 @@ def summarize_curtailment_by_location(scenario):
     :return: (*dict*) -- keys are resources, values are dict of
         ((lat, lon): curtailment vector).
     """
-    curtailment = calculate_curtailment_time_series_by_resources(scenario)
-    grid = scenario.get_grid()
+    curtailment = get_curtailment_result(scenario)
+    total = curtailment.sum_by_type_and_column(["lat", "lon"])
 
-    location_curtailment = {
-        ren_type: summarize_plant_to_location(curtailment_df, grid).sum().to_dict()
-        for ren_type, curtailment_df in curtailment.items()
-    }
+    location_curtailment = {r: total.loc[r].to_dict() for r in curtailment.resources}
 
     return location_curtailment
 
@@ -253,18 +361,12 @@ def get_curtailment_time_series(scenario, area, area_type=None):
     :return: (*pandas.DataFrame*) -- index: timestamps, columns: available renewable
         resource(s).
     """
-    grid = scenario.get_grid()
-    renewables = grid.model_immutables.plants["renewable_resources"]
-    curtailment = get_generation_time_series_by_resources(
+    curtailment = get_curtailment_result(scenario)
+    renewables = curtailment.grid.model_immutables.plants["renewable_resources"]
+    plant_id = get_plant_id_for_resources_in_area(
         scenario, area, renewables, area_type=area_type
     )
-    renewable_profiles = pd.concat([scenario.get_wind(), scenario.get_solar()], axis=1)
-    for r in renewables:
-        if r in curtailment.columns:
-            plant_id = get_plant_id_for_resources_in_area(
-                scenario, area, r, area_type=area_type
-            )
-            curtailment[r] = renewable_profiles[plant_id].sum(axis=1) - curtailment[r]
+    curtailment = curtailment.time_series_by_types_in_plants(plant_id, renewables)
     curtailment.rename(lambda x: x + "_curtailment", axis="columns", inplace=True)
 
-    return curtailment.clip(lower=0)
+    return curtailment
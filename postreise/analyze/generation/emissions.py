@@ -5,16 +5,38 @@ from powersimdata.network.model import ModelImmutables
 from powersimdata.scenario.check import _check_scenario_is_in_analyze_state
 
 from postreise.analyze.generation.costs import calculate_costs
-
-
-def generate_emissions_stats(scenario, pollutant="carbon", method="simple"):
+from postreise.cache import get_grid, get_pg
+from postreise.precision import get_dtype
+
+
+def generate_emissions_stats(
+    scenario,
+    pollutant="carbon",
+    method="simple",
+    chunk_size=None,
+    total_by=None,
+    dtype=None,
+):
     """Calculate hourly emissions for each generator.
 
     :param powersimdata.scenario.scenario.Scenario scenario: scenario instance.
     :param str pollutant: pollutant to analyze.
     :param str method: selected method to handle no-load fuel consumption.
-    :return: (*pandas.DataFrame*) -- emissions data frame. index: timestamps, column:
-        plant id, values: emission in tons.
+    :param int chunk_size: number of hours processed at once. Default to None, which
+        processes all hours at once. Peak memory of intermediate calculations is
+        bounded by the chunk size.
+    :param str total_by: reduction to return instead of the hourly emissions of each
+        generator, either *'plant'* (total emissions of each generator) or *'hour'*
+        (total emissions in each hour). Default to None.
+    :param str/type/numpy.dtype dtype: floating point type of the emissions. If
+        None, the package-level precision is used, see
+        :func:`postreise.precision.set_precision`.
+    :return: (*pandas.DataFrame/pandas.Series*) -- emissions data frame. index:
+        timestamps, column: plant id, values: emission in tons. If ``total_by`` is
+        set, emissions are summed over hours (index: plant id) or over generators
+        (index: timestamps).
+    :raises TypeError: if ``total_by`` is not None or a str.
+    :raises ValueError: if ``total_by`` is not one of *'plant'* or *'hour'*.
 
     .. note:: method descriptions:
 
@@ -23,6 +45,58 @@ def generate_emissions_stats(scenario, pollutant="carbon", method="simple"):
         - 'decommit' uses generator heat-rate curves but de-commits generators if they
           are off (detected by pg < 1 MW).
     """
+    if total_by is not None and not isinstance(total_by, str):
+        raise TypeError("total_by must be a str")
+    if total_by not in {None, "plant", "hour"}:
+        raise ValueError("total_by must be one of: 'plant', 'hour'")
+
+    _check_scenario_is_in_analyze_state(scenario)
+    dtype = get_dtype(dtype)
+    pg = get_pg(scenario)
+    if chunk_size is None:
+        chunk_size = max(len(pg), 1)
+    blocks = iter_emissions_stats(
+        scenario, pollutant, method, chunk_size=chunk_size, dtype=dtype
+    )
+
+    if total_by == "plant":
+        emissions = pd.Series(0, index=pg.columns, dtype=dtype)
+        for block in blocks:
+            emissions += block.sum()
+        return emissions
+    if total_by == "hour":
+        emissions = [block.sum(axis=1) for block in blocks]
+        return pd.concat(emissions) if emissions else pd.Series(dtype=dtype)
+
+    if 0 < len(pg) <= chunk_size:
+        # a single block covers all the hours, it is returned as is
+        return next(blocks)
+
+    emissions = np.empty(pg.shape, dtype=dtype)
+    for i, block in enumerate(blocks):
+        emissions[i * chunk_size : i * chunk_size + len(block)] = block.to_numpy()
+
+    return pd.DataFrame(emissions, index=pg.index, columns=pg.columns)
+
+
+def iter_emissions_stats(
+    scenario, pollutant="carbon", method="simple", chunk_size=744, dtype=None
+):
+    """Calculate hourly emissions for each generator, one block of hours at a time.
+
+    :param powersimdata.scenario.scenario.Scenario scenario: scenario instance.
+    :param str pollutant: pollutant to analyze.
+    :param str method: selected method to handle no-load fuel consumption. See
+        :func:`generate_emissions_stats`.
+    :param int chunk_size: number of hours in each block. Default to 744 (31 days).
+    :param str/type/numpy.dtype dtype: floating point type of the emissions. If
+        None, the package-level precision is used.
+    :return: (*generator*) -- emissions data frames of consecutive blocks of hours.
+        index: timestamps, column: plant id, values: emission in tons.
+    :raises TypeError: if ``method`` is not a str or ``chunk_size`` is not an int.
+    :raises ValueError: if ``pollutant`` or ``method`` are unknown or
+        ``chunk_size`` is not positive.
+    """
     _check_scenario_is_in_analyze_state(scenario)
     mi = ModelImmutables(scenario.info["grid_model"])
     allowed_methods = {
@@ -43,40 +117,71 @@ def generate_emissions_stats(scenario, pollutant="carbon", method="simple"):
     if method not in allowed_methods[pollutant]:
         err_msg = f"method for {pollutant} must be one of: {allowed_methods[pollutant]}"
         raise ValueError(err_msg)
+    if not isinstance(chunk_size, int):
+        raise TypeError("chunk_size must be an int")
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be positive")
+    dtype = get_dtype(dtype)
 
-    pg = scenario.get_pg()
-    grid = scenario.get_grid()
-    emissions = pd.DataFrame(np.zeros_like(pg), index=pg.index, columns=pg.columns)
+    pg = get_pg(scenario)
+    grid = get_grid(scenario)
+    plant = grid.plant.loc[pg.columns]
 
+    # emissions per unit of generation (simple) or per unit of cost (heat-rate curves)
     if method == "simple":
-        for fuel, val in emissions_per_mwh[pollutant].items():
-            indices = (grid.plant["type"] == fuel).to_numpy()
-            emissions.loc[:, indices] = pg.loc[:, indices] * val / 1000
+        rate = plant["type"].map(emissions_per_mwh[pollutant]) / 1000
     else:
-        decommit = method == "decommit"
-
-        costs = calculate_costs(
-            pg=pg, gencost=grid.gencost["before"], decommit=decommit
+        rate = (
+            plant["type"].map(mi.plants["carbon_per_mmbtu"])
+            * 44
+            / 12
+            / 1000
+            / plant["GenFuelCost"]
         )
-        heat = np.zeros_like(costs)
+    rate = rate.fillna(0).to_numpy(dtype=dtype)
 
-        for fuel, val in mi.plants["carbon_per_mmbtu"].items():
-            indices = (grid.plant["type"] == fuel).to_numpy()
-            heat[:, indices] = (
-                costs.iloc[:, indices] / grid.plant["GenFuelCost"].values[indices]
-            )
-            emissions.loc[:, indices] = heat[:, indices] * val * 44 / 12 / 1000
+    return _iter_emissions(pg, rate, grid.gencost["before"], method, chunk_size, dtype)
 
-    return emissions
 
+def _iter_emissions(pg, rate, gencost, method, chunk_size, dtype):
+    """Calculate emissions of consecutive blocks of hours.
 
-def summarize_emissions_by_bus(emissions, grid):
+    :param pandas.DataFrame pg: generation data frame.
+    :param numpy.ndarray rate: emissions per MWh (*'simple'* method) or per $ of cost
+        (other methods) of each generator.
+    :param pandas.DataFrame gencost: cost curve polynomials.
+    :param str method: selected method to handle no-load fuel consumption.
+    :param int chunk_size: number of hours in each block.
+    :param numpy.dtype dtype: floating point type of the emissions.
+    :return: (*generator*) -- emissions data frames.
+    """
+    for start in range(0, len(pg), chunk_size):
+        block = pg.iloc[start : start + chunk_size]
+        if method == "simple":
+            emissions = block.to_numpy(dtype=dtype) * rate
+        else:
+            costs = calculate_costs(
+                pg=block,
+                gencost=gencost,
+                decommit=(method == "decommit"),
+                dtype=dtype,
+            )
+            emissions = costs.to_numpy() * rate
+        yield pd.DataFrame(emissions, index=block.index, columns=block.columns)
+
+
+def summarize_emissions_by_bus(emissions, grid, as_frame=False):
     """Calculate total emissions by generator type and bus.
 
     :param pandas.DataFrame emissions: hourly emissions by generator as returned by
         :func:`generate_emissions_stats`.
     :param powersimdata.input.grid.Grid grid: grid object.
-    :return: (*dict*) -- annual emissions by fuel and bus.
+    :param bool as_frame: return a data frame instead of a nested dictionary,
+        defaults to False.
+    :return: (*dict/pandas.DataFrame*) -- annual emissions by fuel and bus. If
+        ``as_frame`` is False, keys are fuels and values are dictionaries of
+        (bus: emissions) for buses with non-zero emissions. Otherwise, index: fuels,
+        columns: buses hosting at least one plant of these fuels, values: emissions.
     """
 
     _check_time_series(emissions, "emissions")
@@ -84,30 +189,35 @@ def summarize_emissions_by_bus(emissions, grid):
         raise ValueError("emissions must be non-negative")
 
     _check_grid_type(grid)
-    plant = grid.plant
+    carbon_resources = sorted(grid.model_immutables.plants["carbon_resources"])
 
     # sum by generator
     plant_totals = emissions.sum()
-    # set up output data structure
-    plant_buses = plant["bus_id"].unique()
-    bus_totals_by_type = {
-        f: {b: 0 for b in plant_buses}
-        for f in grid.model_immutables.plants["carbon_resources"]
-    }
+    plant = grid.plant.loc[plant_totals.index, ["type", "bus_id"]]
+    is_carbon = plant["type"].isin(carbon_resources).to_numpy()
     # sum by fuel by bus
-    for p in plant_totals.index:
-        plant_type = plant.loc[p, "type"]
-        if plant_type not in grid.model_immutables.plants["carbon_resources"]:
-            continue
-        plant_bus = plant.loc[p, "bus_id"]
-        bus_totals_by_type[plant_type][plant_bus] += plant_totals.loc[p]
+    type_codes, types = pd.factorize(plant["type"].to_numpy()[is_carbon])
+    bus_codes, buses = pd.factorize(plant["bus_id"].to_numpy()[is_carbon])
+    bus_totals_by_type = np.bincount(
+        type_codes * len(buses) + bus_codes,
+        weights=plant_totals.to_numpy()[is_carbon],
+        minlength=len(types) * len(buses),
+    ).reshape(len(types), len(buses))
+    bus_totals_by_type = pd.DataFrame(
+        bus_totals_by_type, index=types, columns=buses
+    ).reindex(carbon_resources, fill_value=0)
+    if as_frame:
+        return bus_totals_by_type
+
     # filter out buses whose emissions are zero
-    bus_totals_by_type = {
-        r: {b: v for b, v in bus_totals_by_type[r].items() if v > 0}
-        for r in grid.model_immutables.plants["carbon_resources"]
-    }
+    bus_totals_by_type_dict = {}
+    for r, v in zip(carbon_resources, bus_totals_by_type.to_numpy()):
+        non_zero = np.flatnonzero(v > 0)
+        bus_totals_by_type_dict[r] = dict(
+            zip(buses[non_zero].tolist(), v[non_zero].tolist())
+        )
 
-    return bus_totals_by_type
+    return bus_totals_by_type_dict
 
 
 def carbon_diff(scenario_1, scenario_2):
@@ -118,13 +228,13 @@ def carbon_diff(scenario_1, scenario_2):
     :return: (*float*) -- relative difference in emission in percent.
     """
     carbon_by_bus_1 = summarize_emissions_by_bus(
-        generate_emissions_stats(scenario_1), scenario_1.get_grid()
+        generate_emissions_stats(scenario_1), get_grid(scenario_1), as_frame=True
     )
     carbon_by_bus_2 = summarize_emissions_by_bus(
-        generate_emissions_stats(scenario_2), scenario_2.get_grid()
+        generate_emissions_stats(scenario_2), get_grid(scenario_2), as_frame=True
     )
 
-    sum_1 = sum(carbon_by_bus_1["coal"].values()) + sum(carbon_by_bus_1["ng"].values())
-    sum_2 = sum(carbon_by_bus_2["coal"].values()) + sum(carbon_by_bus_2["ng"].values())
+    sum_1 = carbon_by_bus_1.loc[["coal", "ng"]].clip(lower=0).to_numpy().sum()
+    sum_2 = carbon_by_bus_2.loc[["coal", "ng"]].clip(lower=0).to_numpy().sum()
 
     return 100 * (1 - sum_2 / sum_1)
@@ -0,0 +1,113 @@
+import numpy as np
+import pandas as pd
+from powersimdata.input.check import _check_epsilon
+from powersimdata.scenario.check import _check_scenario_is_in_analyze_state
+
+from postreise.analyze.generation.costs import (
+    _get_cost_groups,
+    calculate_marginal_costs,
+)
+from postreise.cache import get_grid, get_pg
+from postreise.precision import get_dtype
+
+
+def get_merit_order(scenario, dtype=None):
+    """Build the merit order of the generators in each hour, i.e. the supply curve
+    ranking generators by their marginal cost at their dispatch.
+
+    :param powersimdata.scenario.scenario.Scenario scenario: scenario instance.
+    :param str/type/numpy.dtype dtype: floating point type of the marginal costs and
+        capacities. If None, the package-level precision is used, see
+        :func:`postreise.precision.set_precision`.
+    :return: (*dict*) -- keys are *'plant_id'*, *'marginal_cost'* ($/MWh) and
+        *'capacity'* (cumulative capacity in MW). Values are data frames with
+        timestamps as index and ranks, from the cheapest generator (1) to the most
+        expensive one, as columns.
+
+    .. note::
+        Generators of all the hours are sorted at once. Generators with the same
+        marginal cost keep the order of the plant table.
+    """
+    _check_scenario_is_in_analyze_state(scenario)
+    dtype = get_dtype(dtype)
+    marginal_cost = calculate_marginal_costs(scenario, dtype=dtype)
+    values = marginal_cost.to_numpy()
+    order = np.argsort(values, axis=1, kind="stable")
+    capacity = get_grid(scenario).plant["Pmax"].reindex(marginal_cost.columns)
+    capacity = capacity.to_numpy(dtype=dtype)[order].cumsum(axis=1, dtype=dtype)
+
+    index = marginal_cost.index
+    rank = pd.RangeIndex(1, values.shape[1] + 1, name="rank")
+    return {
+        "plant_id": pd.DataFrame(
+            np.asarray(marginal_cost.columns)[order], index=index, columns=rank
+        ),
+        "marginal_cost": pd.DataFrame(
+            np.take_along_axis(values, order, axis=1), index=index, columns=rank
+        ),
+        "capacity": pd.DataFrame(capacity, index=index, columns=rank),
+    }
+
+
+def get_marginal_units(scenario, by=None, threshold=1, epsilon=1e-3, dtype=None):
+    """Find the marginal unit in each hour, i.e. the dispatched generator with the
+    highest marginal cost among the ones below their maximum power.
+
+    :param powersimdata.scenario.scenario.Scenario scenario: scenario instance.
+    :param str/list by: *'plant_id'* and/or column(s) of the plant table used to
+        group generators, e.g. *'zone_name'* or *'interconnect'*, see
+        :func:`postreise.analyze.generation.costs.summarize_costs`. Default to None,
+        which finds a single marginal unit for all generators.
+    :param int/float threshold: the power (MW) below which generators are assumed
+        to be decommitted and cannot be marginal. Default to 1.
+    :param float epsilon: allowable 'fuzz' for whether generators are at maximum
+        power, see :func:`postreise.analyze.generation.binding.pmax_constraints`.
+        Generators at maximum power cannot increase their output and cannot be
+        marginal.
+    :param str/type/numpy.dtype dtype: floating point type of the marginal costs. If
+        None, the package-level precision is used, see
+        :func:`postreise.precision.set_precision`.
+    :return: (*pandas.DataFrame*) -- index: timestamps. If ``by`` is None, columns
+        are *'plant_id'* and *'marginal_cost'* ($/MWh). Otherwise, columns are
+        (*'plant_id'*/*'marginal_cost'*, group) multi index. NaN when no generator
+        of a group is dispatched below its maximum power.
+    :raises TypeError: if ``threshold`` is not an int or a float, or if ``by`` is
+        not None, a str or a list of str.
+    :raises ValueError: if ``threshold`` is negative or if ``by`` is not the plant id
+        or a column of the plant table.
+    """
+    _check_scenario_is_in_analyze_state(scenario)
+    if not isinstance(threshold, (int, float)):
+        raise TypeError("threshold must be an int or a float")
+    if threshold < 0:
+        raise ValueError("threshold must be non-negative")
+    _check_epsilon(epsilon)
+    dtype = get_dtype(dtype)
+    pg = get_pg(scenario)
+    plant = get_grid(scenario).plant
+    codes, groups = _get_cost_groups(plant, pg.columns, by)
+
+    marginal_cost = calculate_marginal_costs(scenario, dtype=dtype).to_numpy()
+    values = pg.to_numpy()
+    pmax = plant["Pmax"].reindex(pg.columns).to_numpy(dtype=float)
+    is_marginal = (values >= threshold) & (pmax - values > epsilon)
+    masked = np.where(is_marginal, marginal_cost, -np.inf)
+    n_groups = 1 if groups is None else len(groups)
+    position = np.empty((len(pg), n_groups), dtype=np.intp)
+    # generators are sorted by group so that each group is a contiguous block
+    order = np.argsort(codes, kind="stable")
+    starts = np.flatnonzero(np.diff(codes[order])) + 1
+    for i, columns in enumerate(np.split(order, starts)):
+        position[:, i] = columns[np.argmax(masked[:, columns], axis=1)]
+
+    hour = np.arange(len(pg))[:, None]
+    found = is_marginal[hour, position]
+    plant_id = pd.DataFrame(np.asarray(pg.columns)[position], index=pg.index)
+    cost = pd.DataFrame(marginal_cost[hour, position], index=pg.index)
+    plant_id, cost = plant_id.where(found), cost.where(found)
+    if groups is None:
+        return pd.DataFrame(
+            {"plant_id": plant_id[0], "marginal_cost": cost[0]}, index=pg.index
+        )
+    plant_id.columns = cost.columns = groups
+    return pd.concat({"plant_id": plant_id, "marginal_cost": cost}, axis=1)
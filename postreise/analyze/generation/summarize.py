@@ -1,15 +1,23 @@
 import numpy as np
 import pandas as pd
 from powersimdata.input.check import _check_data_frame, _check_resources_and_format
-from powersimdata.input.helpers import (
-    get_plant_id_for_resources_in_area,
-    get_storage_id_in_area,
-)
 from powersimdata.network.model import ModelImmutables
 from powersimdata.scenario.check import _check_scenario_is_in_analyze_state
 from powersimdata.scenario.scenario import Scenario
 
+from postreise.analyze.generation.aggregates import (
+    get_aggregate_store,
+    get_monthly_aggregates,
+)
 from postreise.analyze.time import change_time_zone, slice_time_series
+from postreise.cache import (
+    get_grid,
+    get_pg,
+    get_plant_id_for_resources_in_area,
+    get_storage_e,
+    get_storage_id_in_area,
+    get_storage_pg,
+)
 
 
 def sum_generation_by_type_zone(
@@ -27,10 +35,19 @@ def sum_generation_by_type_zone(
     .. note::
         The returned data frame will not be affected if only ``time_zone`` (without
         ``time_range``) is set since all entries in the PG data frame will be summed.
+        In this case, if an aggregate store is set, see
+        :func:`postreise.analyze.generation.aggregates.set_aggregate_store`, the total
+        generation is derived from the stored monthly aggregates of the scenario.
     """
     _check_scenario_is_in_analyze_state(scenario)
 
-    pg = scenario.get_pg().copy()
+    if not time_range and get_aggregate_store() is not None:
+        if time_zone:
+            print("Changing time_zone only has no effect")
+        generation = get_monthly_aggregates(scenario)["generation"]
+        return generation.groupby(level=["type", "zone_id"]).sum().unstack().fillna(0)
+
+    pg = get_pg(scenario)
     if time_zone:
         pg = change_time_zone(pg, time_zone)
     if time_range:
@@ -38,7 +55,7 @@ def sum_generation_by_type_zone(
     if time_zone and not time_range:
         print("Changing time_zone only has no effect")
 
-    grid = scenario.get_grid()
+    grid = get_grid(scenario)
     summed_gen_series = pg.sum().groupby([grid.plant.type, grid.plant.zone_id]).sum()
     summed_gen_dataframe = summed_gen_series.unstack().fillna(value=0)
 
@@ -54,7 +71,7 @@ def sum_generation_by_state(scenario: Scenario) -> pd.DataFrame:
     """
     # Start with energy by type & zone name
     energy_by_type_zoneid = sum_generation_by_type_zone(scenario)
-    grid = scenario.get_grid()
+    grid = get_grid(scenario)
     zoneid2zonename = grid.id2zone
     energy_by_type_zonename = energy_by_type_zoneid.rename(zoneid2zonename, axis=1)
     # Build lists to use for groupbys
@@ -165,8 +182,8 @@ def get_generation_time_series_by_resources(scenario, area, resources, area_type
     plant_id = get_plant_id_for_resources_in_area(
         scenario, area, resources, area_type=area_type
     )
-    pg = scenario.get_pg()[plant_id]
-    grid = scenario.get_grid()
+    pg = get_pg(scenario)[plant_id]
+    grid = get_grid(scenario)
 
     return pg.groupby(grid.plant.loc[plant_id, "type"].values, axis=1).sum()
 
@@ -189,6 +206,6 @@ def get_storage_time_series(scenario, area, area_type=None, storage_e=False):
     storage_id = get_storage_id_in_area(scenario, area, area_type)
 
     if storage_e:
-        return scenario.get_storage_e()[storage_id].sum(axis=1)
+        return get_storage_e(scenario)[storage_id].sum(axis=1)
     else:
-        return scenario.get_storage_pg()[storage_id].sum(axis=1)
+        return get_storage_pg(scenario)[storage_id].sum(axis=1)
@@ -0,0 +1,99 @@
+import os
+
+import pandas as pd
+import pytest
+from powersimdata.tests.mock_scenario import MockScenario
+
+from postreise.analyze.generation.aggregates import (
+    get_aggregate_store,
+    get_monthly_aggregates,
+    set_aggregate_store,
+)
+from postreise.analyze.generation.costs import calculate_costs
+from postreise.analyze.generation.summarize import sum_generation_by_type_zone
+
+mock_plant = {
+    "plant_id": ["A", "B", "C", "D"],
+    "type": ["solar", "coal", "coal", "wind"],
+    "zone_id": [1, 1, 2, 2],
+    "zone_name": ["Oregon", "Oregon", "Washington", "Washington"],
+}
+
+mock_gencost = {
+    "plant_id": ["A", "B", "C", "D"],
+    "type": [2] * 4,
+    "n": [3] * 4,
+    "c2": [0, 0.1, 0.2, 0],
+    "c1": [0, 20, 25, 0],
+    "c0": [0, 100, 50, 0],
+}
+
+index = pd.date_range("2016-01-31 22:00", periods=4, freq="H")
+mock_pg = pd.DataFrame(
+    {"A": [0, 0, 5, 10], "B": [50, 60, 70, 80], "C": [10, 0, 20, 0], "D": [8] * 4},
+    index=index,
+)
+mock_solar = pd.DataFrame({"A": [0, 0, 6, 10]}, index=index)
+mock_wind = pd.DataFrame({"D": [8, 9, 10, 8]}, index=index)
+
+
+@pytest.fixture
+def scenario():
+    return MockScenario(
+        {"plant": mock_plant, "gencost_before": mock_gencost},
+        pg=mock_pg,
+        solar=mock_solar,
+        wind=mock_wind,
+    )
+
+
+@pytest.fixture
+def store(tmp_path):
+    set_aggregate_store(str(tmp_path))
+    yield str(tmp_path)
+    set_aggregate_store(None)
+
+
+def test_get_monthly_aggregates(scenario):
+    aggregates = get_monthly_aggregates(scenario)
+    assert list(aggregates.columns) == [
+        "generation",
+        "curtailment",
+        "emissions",
+        "cost",
+    ]
+    assert aggregates.index.names == ["type", "zone_id", "month"]
+    january, february = pd.Timestamp("2016-01-01"), pd.Timestamp("2016-02-01")
+    assert aggregates.loc[("coal", 1, january), "generation"] == 110
+    assert aggregates.loc[("coal", 1, february), "generation"] == 150
+    assert aggregates.loc[("solar", 1, february), "curtailment"] == 1
+    assert aggregates.loc[("wind", 2, january), "curtailment"] == 1
+    costs = calculate_costs(scenario=scenario).sum()
+    assert aggregates["cost"].sum() == pytest.approx(costs.sum())
+    assert aggregates.loc[("coal", 2), "cost"].sum() == pytest.approx(costs["C"])
+    assert aggregates.loc["solar", "emissions"].sum() == 0
+    assert aggregates.loc["coal", "emissions"].sum() > 0
+
+
+def test_monthly_aggregates_store(scenario, store):
+    assert get_aggregate_store() == store
+    expected = get_monthly_aggregates(scenario)
+    files = os.listdir(store)
+    assert files == ["111_monthly_aggregates_v1.csv.gz"]
+
+    other = MockScenario({"plant": mock_plant}, pg=mock_pg * 0)
+    pd.testing.assert_frame_equal(get_monthly_aggregates(other), expected)
+
+
+def test_sum_generation_by_type_zone_from_store(scenario, store):
+    expected = sum_generation_by_type_zone(scenario)
+    assert len(os.listdir(store)) == 1
+    set_aggregate_store(None)
+    pd.testing.assert_frame_equal(
+        sum_generation_by_type_zone(scenario), expected, check_names=False
+    )
+
+
+def test_set_aggregate_store_argument():
+    with pytest.raises(TypeError):
+        set_aggregate_store(1)
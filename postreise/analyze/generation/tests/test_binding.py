@@ -1,11 +1,14 @@
 import unittest
 
+import numpy as np
 import pandas as pd
 from powersimdata.input.check import _check_epsilon
 from powersimdata.scenario.check import _check_scenario_is_in_analyze_state
 from powersimdata.tests.mock_scenario import MockScenario
 
 from postreise.analyze.generation.binding import (
+    _get_binding_events,
+    binding_constraints_report,
     pmax_constraints,
     pmin_constraints,
     ramp_constraints,
@@ -217,3 +220,96 @@ class TestPmaxConstraints(unittest.TestCase):
         expected.loc["2016-01-01 00:00:00", "B"] = False
         expected.loc["2016-01-01 01:00:00", "C"] = False
         assert binding_pmaxs.equals(expected)
+
+
+class TestSparseConstraints(unittest.TestCase):
+    def setUp(self):
+        mock_plant = {
+            "plant_id": ["A", "B", "C", "D"],
+            "Pmin": [0, 10, 20, 30],
+            "Pmax": [50, 75, 100, 200],
+            "ramp_30": [2.5, 5, 10, 25],
+        }
+        mock_pg = pd.DataFrame(
+            {
+                "A": [0, 5, 0, 0, 0],
+                "B": [10, 20, 30, 20, 10],
+                "C": [20, 40, 60, 80, 100],
+                "D": [200, 150, 100, 50, 30],
+            }
+        )
+        self.mock_scenario = MockScenario({"plant": mock_plant}, pg=mock_pg)
+        self.functions = {
+            "pmin": pmin_constraints,
+            "pmax": pmax_constraints,
+            "ramp": ramp_constraints,
+        }
+
+    def test_events_match_dense(self):
+        for constraint, func in self.functions.items():
+            dense = func(self.mock_scenario)
+            events = func(self.mock_scenario, output="events")
+            hour, plant = np.nonzero(dense.to_numpy())
+            assert events["hour"].tolist() == dense.index[hour].tolist()
+            assert events["plant_id"].tolist() == dense.columns[plant].tolist()
+            assert (events["slack"] <= 1e-3).all()
+
+    def test_events_chunk_size(self):
+        for constraint in self.functions:
+            expected = _get_binding_events(self.mock_scenario, [constraint], 1e-3)
+            for chunk_size in [1, 2, 3]:
+                events = _get_binding_events(
+                    self.mock_scenario, [constraint], 1e-3, chunk_size=chunk_size
+                )
+                for e, a in zip(expected[constraint], events[constraint]):
+                    np.testing.assert_array_equal(e, a)
+
+    def test_count(self):
+        for func in self.functions.values():
+            dense = func(self.mock_scenario)
+            count = func(self.mock_scenario, output="count")
+            assert count.tolist() == dense.sum().tolist()
+            assert count.index.tolist() == ["A", "B", "C", "D"]
+
+    def test_intervals(self):
+        intervals = pmin_constraints(self.mock_scenario, output="intervals")
+        hours = pd.date_range(start="2016-01-01", periods=5, freq="H")
+        assert intervals["plant_id"].tolist() == ["A", "A", "B", "B", "C", "D"]
+        assert intervals["start"].tolist() == [hours[i] for i in [0, 2, 0, 4, 0, 4]]
+        assert intervals["end"].tolist() == [hours[i] for i in [0, 4, 0, 4, 0, 4]]
+        assert intervals["hours"].tolist() == [1, 3, 1, 1, 1, 1]
+
+    def test_bad_output(self):
+        with self.assertRaises(TypeError):
+            pmin_constraints(self.mock_scenario, output=1)
+        with self.assertRaises(ValueError):
+            ramp_constraints(self.mock_scenario, output="sparse")
+
+    def test_binding_constraints_report(self):
+        self.mock_scenario.state.grid.plant["type"] = ["solar", "coal", "coal", "ng"]
+        report = binding_constraints_report(self.mock_scenario)
+        plant = report["plant"]
+        for constraint, func in self.functions.items():
+            dense = func(self.mock_scenario)
+            assert plant[(constraint, "hours")].tolist() == dense.sum().tolist()
+            assert report["hour_of_day"][constraint].sum() == dense.sum().sum()
+        assert plant[("pmin", "longest")].tolist() == [3, 1, 1, 1]
+        assert plant[("ramp", "longest")].tolist() == [2, 4, 4, 3]
+        assert report["type"].loc["coal"].tolist() == [3, 1, 8]
+        assert report["hour_of_day"].loc[4].tolist() == [3, 1, 2]
+
+    def test_no_binding_constraints(self):
+        mock_plant = {
+            "plant_id": ["A"],
+            "type": ["coal"],
+            "Pmin": [0],
+            "Pmax": [10],
+            "ramp_30": [5],
+        }
+        mock_scenario = MockScenario(
+            {"plant": mock_plant}, pg=pd.DataFrame({"A": [4, 5, 6]})
+        )
+        intervals = pmax_constraints(mock_scenario, output="intervals")
+        assert len(intervals) == 0
+        report = binding_constraints_report(mock_scenario)
+        assert report["plant"].loc["A"].tolist() == [0, 0, 0, 0, 0, 0]
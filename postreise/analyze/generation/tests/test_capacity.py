@@ -1,14 +1,20 @@
+import numpy as np
 import pandas as pd
 import pytest
+from numpy.testing import assert_allclose
 from powersimdata.input.tests.test_helpers import check_dataframe_matches
 from powersimdata.tests.mock_scenario import MockScenario
 from pytest import approx
 
 from postreise.analyze.generation.capacity import (
+    calculate_capacity_values,
     calculate_net_load_peak,
     calculate_NLDC,
     get_capacity_by_resources,
+    get_capacity_factor_profiles,
+    get_capacity_factor_stats,
     get_capacity_factor_time_series,
+    get_load_duration_curves,
     get_storage_capacity,
     sum_capacity_by_type_zone,
 )
@@ -162,6 +168,53 @@ def test_NLDC_calculation_solar_wind():  # noqa: N802
     assert calculate_NLDC(scenario, ["solar", "wind"], 10) == approx(8478.9)
 
 
+def test_calculate_capacity_values():
+    values = calculate_capacity_values(
+        scenario,
+        {"wind": "wind", "solar": {"solar"}, "both": ["wind", "solar"]},
+        [5, 10],
+    )
+    assert values.index.tolist() == [
+        ("wind", 5),
+        ("wind", 10),
+        ("solar", 5),
+        ("solar", 10),
+        ("both", 5),
+        ("both", 10),
+    ]
+    assert values.loc[("wind", 5), "NLDC"] == approx(3343)
+    assert values.loc[("both", 10), "NLDC"] == approx(8478.9)
+    for (label, hours), row in values.iterrows():
+        resources = {"both": ["wind", "solar"]}.get(label, label)
+        assert row["NLDC"] == approx(calculate_NLDC(scenario, resources, hours))
+        assert row["net_load_peak"] == approx(
+            calculate_net_load_peak(scenario, resources, hours)
+        )
+
+
+def test_calculate_capacity_values_argument():
+    with pytest.raises(TypeError):
+        calculate_capacity_values(scenario, ["wind"], 10)
+    with pytest.raises(ValueError):
+        calculate_capacity_values(scenario, {}, 10)
+    with pytest.raises(ValueError):
+        calculate_capacity_values(scenario, {"geo": "geothermal"}, 10)
+    with pytest.raises(ValueError):
+        calculate_capacity_values(scenario, {"wind": "wind"}, [10, 100])
+
+
+def test_get_load_duration_curves():
+    curves = get_load_duration_curves(scenario, {"wind": "wind"})
+    assert curves.columns.tolist() == ["demand", "wind"]
+    assert curves.index[0] == 1
+    assert curves.index.name == "rank"
+    demand = mock_demand["201"]
+    net_demand = demand - mock_pg[[102, 103]].sum(axis=1)
+    assert_allclose(curves["demand"], demand.sort_values(ascending=False))
+    assert_allclose(curves["wind"], net_demand.sort_values(ascending=False))
+    assert get_load_duration_curves(scenario).columns.tolist() == ["demand"]
+
+
 def test_calculate_net_load_peak_solar():
     assert calculate_net_load_peak(scenario, {"solar"}, 10) == approx(2535.2)
 
@@ -255,3 +308,50 @@ def test_get_capacity_factor_time_series():
     check_dataframe_matches(
         expected_df, get_capacity_factor_time_series(scenario, "Washington", "solar")
     )
+
+
+def test_get_capacity_factor_time_series_dtype():
+    expected = get_capacity_factor_time_series(scenario, "Washington", "wind")
+    cf = get_capacity_factor_time_series(
+        scenario, "Washington", "wind", dtype="float32"
+    )
+    assert (cf.dtypes == np.float32).all()
+    assert_allclose(cf.to_numpy(), expected.to_numpy(), rtol=1e-6)
+
+
+def test_get_capacity_factor_time_series_zero_capacity():
+    plant = {**mock_plant, "Pmax": [9000, 0, 4000]}
+    mock = MockScenario(grid_attrs={"plant": plant}, pg=mock_pg)
+    cf = get_capacity_factor_time_series(mock, "Washington", "wind")
+    assert (cf[102] == 0).all()
+
+
+def test_get_capacity_factor_profiles():
+    profiles = get_capacity_factor_profiles(
+        scenario, ["Washington", "Oregon"], ["solar", "wind"]
+    )
+    assert list(profiles.columns) == [
+        ("Washington", "solar"),
+        ("Washington", "wind"),
+        ("Oregon", "solar"),
+        ("Oregon", "wind"),
+    ]
+    assert_allclose(profiles[("Washington", "solar")], mock_pg[101] / 9000)
+    assert_allclose(profiles[("Washington", "wind")], mock_pg[102] / 5000)
+    assert_allclose(profiles[("Oregon", "wind")], mock_pg[103] / 4000)
+    assert profiles[("Oregon", "solar")].isna().all()
+
+    wecc = get_capacity_factor_profiles(scenario, "Western", "wind")
+    assert_allclose(wecc[("Western", "wind")], (mock_pg[102] + mock_pg[103]) / 9000)
+
+
+def test_get_capacity_factor_stats():
+    stats = get_capacity_factor_stats(
+        scenario, ["Washington", "Oregon"], "wind", quantiles=[0.5]
+    )
+    cf = mock_pg[102] / 5000
+    assert list(stats.columns) == ["capacity", "mean", 0.5]
+    assert stats.loc[("Washington", "wind"), "capacity"] == 5000
+    assert stats.loc[("Washington", "wind"), "mean"] == approx(cf.mean())
+    assert stats.loc[("Washington", "wind"), 0.5] == approx(cf.median())
+    assert stats.loc[("Oregon", "wind"), "capacity"] == 4000
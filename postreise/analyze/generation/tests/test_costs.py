@@ -2,7 +2,7 @@ import pandas as pd
 import pytest
 from powersimdata.tests.mock_scenario import MockScenario
 
-from postreise.analyze.generation.costs import calculate_costs
+from postreise.analyze.generation.costs import calculate_costs, summarize_costs
 
 
 @pytest.fixture
@@ -87,3 +87,105 @@ def test_negative_pg(mock_gencost, mock_pg):
     with pytest.raises(ValueError) as excinfo:
         calculate_costs(gencost=mock_gencost, pg=-1 * mock_pg.iloc[:, 2])
     assert "PG must be non-negative" in str(excinfo.value)
+
+
+@pytest.fixture
+def mock_mixed_gencost():
+    nan = float("nan")
+    return pd.DataFrame(
+        {
+            "plant_id": [101, 102, 103, 104, 105],
+            "type": [2, 2, 1, 1, 2],
+            "n": [3, 2, 2, 3, 1],
+            "c2": [1, nan, nan, nan, nan],
+            "c1": [10, 20, nan, nan, nan],
+            "c0": [100, 200, nan, nan, 7],
+            "p1": [nan, nan, 0, 0, nan],
+            "f1": [nan, nan, 100, 0, nan],
+            "p2": [nan, nan, 10, 2, nan],
+            "f2": [nan, nan, 200, 10, nan],
+            "p3": [nan, nan, nan, 4, nan],
+            "f3": [nan, nan, nan, 30, nan],
+        }
+    ).set_index("plant_id")
+
+
+def test_calculate_costs_mixed_curves(mock_mixed_gencost, mock_pg):
+    expected = pd.DataFrame(
+        {
+            101: [100, 111, 124, 139],
+            102: [200, 240, 280, 320],
+            103: [100, 130, 160, 190],
+            104: [0, 30, 70, 110],
+            105: [7, 7, 7, 7],
+        },
+        index=mock_pg.index,
+        dtype=float,
+    )
+    costs = calculate_costs(gencost=mock_mixed_gencost, pg=mock_pg)
+    pd.testing.assert_frame_equal(costs, expected)
+
+    linear = mock_mixed_gencost.loc[[103, 104]]
+    costs = calculate_costs(gencost=linear, pg=mock_pg[[103, 104]])
+    pd.testing.assert_frame_equal(costs, expected[[103, 104]])
+
+
+def test_calculate_costs_bad_curves(mock_mixed_gencost, mock_pg):
+    gencost = mock_mixed_gencost.assign(type=[2, 2, 1, 1, 3])
+    with pytest.raises(ValueError):
+        calculate_costs(gencost=gencost, pg=mock_pg)
+    gencost = mock_mixed_gencost.assign(n=[3, 2, 1, 3, 1])
+    with pytest.raises(ValueError):
+        calculate_costs(gencost=gencost, pg=mock_pg)
+    gencost = mock_mixed_gencost.drop(columns="f3")
+    with pytest.raises(ValueError):
+        calculate_costs(gencost=gencost, pg=mock_pg)
+
+
+@pytest.fixture
+def mock_plant_scenario(mock_gencost_data, mock_plant, mock_pg):
+    plant = {**mock_plant, "zone_name": ["A", "B", "A", "B", "A"]}
+    return MockScenario(
+        grid_attrs={"plant": plant, "gencost_before": mock_gencost_data}, pg=mock_pg
+    )
+
+
+def test_summarize_costs(mock_plant_scenario):
+    costs = calculate_costs(scenario=mock_plant_scenario)
+    plant = mock_plant_scenario.state.grid.plant
+    assert summarize_costs(mock_plant_scenario) == pytest.approx(costs.sum().sum())
+
+    by_zone = summarize_costs(mock_plant_scenario, by="zone_name", chunk_size=3)
+    pd.testing.assert_series_equal(
+        by_zone, costs.sum().groupby(plant["zone_name"]).sum()
+    )
+
+    by_plant = summarize_costs(mock_plant_scenario, by="plant_id", freq="H")
+    pd.testing.assert_frame_equal(by_plant, costs, check_names=False)
+
+
+def test_summarize_costs_by_period(mock_plant_scenario):
+    costs = calculate_costs(scenario=mock_plant_scenario, decommit=True)
+    plant = mock_plant_scenario.state.grid.plant
+    expected = costs.T.groupby([plant["type"], plant["zone_name"]]).sum().T
+    expected = expected.resample("2H").sum()
+    for chunk_size in [1, 3, 744]:
+        summary = summarize_costs(
+            mock_plant_scenario,
+            by=["type", "zone_name"],
+            freq="2H",
+            decommit=True,
+            chunk_size=chunk_size,
+        )
+        pd.testing.assert_frame_equal(summary, expected, check_freq=False)
+
+
+def test_summarize_costs_argument(mock_plant_scenario):
+    with pytest.raises(TypeError):
+        summarize_costs(mock_plant_scenario, by=1)
+    with pytest.raises(ValueError):
+        summarize_costs(mock_plant_scenario, by="zone")
+    with pytest.raises(ValueError):
+        summarize_costs(mock_plant_scenario, freq="2D")
+    with pytest.raises(ValueError):
+        summarize_costs(mock_plant_scenario, chunk_size=0)
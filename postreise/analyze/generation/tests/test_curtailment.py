@@ -1,16 +1,20 @@
 import unittest
 
+import numpy as np
 import pandas as pd
-from numpy.testing import assert_array_equal
+from numpy.testing import assert_array_almost_equal, assert_array_equal
 from powersimdata.input.tests.test_helpers import check_dataframe_matches
 from powersimdata.tests.mock_scenario import MockScenario
 
 from postreise.analyze.generation.curtailment import (
+    CurtailmentResult,
     calculate_curtailment_percentage_by_resources,
+    calculate_curtailment_time_series,
     calculate_curtailment_time_series_by_areas,
     calculate_curtailment_time_series_by_areas_and_resources,
     calculate_curtailment_time_series_by_resources,
     calculate_curtailment_time_series_by_resources_and_areas,
+    get_curtailment_result,
     get_curtailment_time_series,
     summarize_curtailment_by_bus,
     summarize_curtailment_by_location,
@@ -70,6 +74,43 @@ grid_attrs = {"plant": mock_plant}
 scenario = MockScenario(grid_attrs, pg=mock_pg, solar=mock_solar, wind=mock_wind)
 
 
+class TestCurtailmentResult(unittest.TestCase):
+    def test_curtailment_result_is_computed_once(self):
+        curtailment = get_curtailment_result(scenario)
+        self.assertIsInstance(curtailment, CurtailmentResult)
+        self.assertIs(curtailment, get_curtailment_result(scenario))
+
+    def test_curtailment_result_to_frame(self):
+        curtailment = get_curtailment_result(scenario).to_frame()
+        check_dataframe_matches(
+            curtailment.sort_index(axis=1), mock_curtailment_data.sort_index(axis=1)
+        )
+
+    def test_curtailment_result_is_not_modified_by_callers(self):
+        expected = get_curtailment_result(scenario).to_frame().copy()
+        curtailment = calculate_curtailment_time_series(scenario)
+        curtailment.iloc[0, 0] = 100
+        curtailment["A"] *= 2
+        check_dataframe_matches(get_curtailment_result(scenario).to_frame(), expected)
+        check_dataframe_matches(calculate_curtailment_time_series(scenario), expected)
+
+    def test_curtailment_result_sum_by_type(self):
+        total = get_curtailment_result(scenario).sum_by_type()
+        assert_array_equal(total.index, ["solar", "wind", "wind_offshore"])
+        assert_array_equal(total["curtailment"], [3.5, 0.5, 2.5])
+        assert_array_equal(total["potential"], [25, 7, 16])
+
+    def test_curtailment_result_dtype(self):
+        curtailment = get_curtailment_result(scenario, dtype="float32")
+        self.assertIsNot(curtailment, get_curtailment_result(scenario))
+        self.assertEqual(curtailment.curtailment.dtype, np.float32)
+        curtailment = calculate_curtailment_time_series(scenario, dtype="float32")
+        self.assertTrue((curtailment.dtypes == np.float32).all())
+        assert_array_almost_equal(
+            curtailment.sort_index(axis=1), mock_curtailment_data.sort_index(axis=1)
+        )
+
+
 class TestCalculateCurtailmentTimeSeries(unittest.TestCase):
     def _check_curtailment_vs_expected(self, curtailment, expected):
         self.assertIsInstance(curtailment, dict)
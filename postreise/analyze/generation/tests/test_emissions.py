@@ -1,13 +1,14 @@
 import numpy as np
 import pandas as pd
 import pytest
-from numpy.testing import assert_array_almost_equal
+from numpy.testing import assert_allclose, assert_array_almost_equal
 from powersimdata.tests.mock_grid import MockGrid
 from powersimdata.tests.mock_scenario import MockScenario
 
 from postreise.analyze.generation.emissions import (
     carbon_diff,
     generate_emissions_stats,
+    iter_emissions_stats,
     summarize_emissions_by_bus,
 )
 
@@ -97,6 +98,18 @@ class TestEmissionStatsArguments:
             generate_emissions_stats(scenario, pollutant="nox", method="always-off")
         assert "method for nox must be one of: {'simple'}" in str(excinfo.value)
 
+    def test_chunk_size(self, scenario):
+        with pytest.raises(TypeError):
+            generate_emissions_stats(scenario, chunk_size=1.5)
+        with pytest.raises(ValueError):
+            iter_emissions_stats(scenario, chunk_size=0)
+
+    def test_total_by(self, scenario):
+        with pytest.raises(TypeError):
+            generate_emissions_stats(scenario, total_by=1)
+        with pytest.raises(ValueError):
+            generate_emissions_stats(scenario, total_by="zone")
+
 
 class TestCarbonCalculation:
     def test_carbon_calc_always_on(self, scenario, mock_plant):
@@ -154,6 +167,50 @@ class TestCarbonCalculation:
         )
 
 
+class TestChunkedCalculation:
+    @pytest.mark.parametrize("method", ["simple", "always-on", "decommit"])
+    def test_chunked_matches_full(self, scenario, method):
+        expected = generate_emissions_stats(scenario, method=method)
+        for chunk_size in (1, 3, 10):
+            emissions = generate_emissions_stats(
+                scenario, method=method, chunk_size=chunk_size
+            )
+            assert_array_almost_equal(expected.to_numpy(), emissions.to_numpy())
+            assert expected.index.equals(emissions.index)
+            assert expected.columns.equals(emissions.columns)
+
+    def test_iter_emissions_stats(self, scenario):
+        expected = generate_emissions_stats(scenario, method="always-on")
+        blocks = list(iter_emissions_stats(scenario, method="always-on", chunk_size=3))
+        assert [len(b) for b in blocks] == [3, 1]
+        assert_array_almost_equal(expected.to_numpy(), pd.concat(blocks).to_numpy())
+
+    def test_total_by_plant_and_hour(self, scenario):
+        expected = generate_emissions_stats(scenario, method="decommit")
+        by_plant = generate_emissions_stats(
+            scenario, method="decommit", chunk_size=3, total_by="plant"
+        )
+        by_hour = generate_emissions_stats(
+            scenario, method="decommit", chunk_size=3, total_by="hour"
+        )
+        assert_array_almost_equal(expected.sum().to_numpy(), by_plant.to_numpy())
+        assert_array_almost_equal(expected.sum(axis=1).to_numpy(), by_hour.to_numpy())
+        assert by_hour.index.equals(expected.index)
+
+    @pytest.mark.parametrize("method", ["simple", "always-on", "decommit"])
+    def test_float32(self, scenario, method):
+        expected = generate_emissions_stats(scenario, method=method)
+        emissions = generate_emissions_stats(
+            scenario, method=method, chunk_size=3, dtype="float32"
+        )
+        assert (emissions.dtypes == np.float32).all()
+        assert_allclose(emissions.to_numpy(), expected.to_numpy(), rtol=1e-6)
+        by_plant = generate_emissions_stats(
+            scenario, method=method, total_by="plant", dtype="float32"
+        )
+        assert by_plant.dtype == np.float32
+
+
 class TestNOxCalculation:
     def test_calculate_nox_simple(self, scenario):
         expected_values = np.array(
@@ -238,5 +295,22 @@ class TestEmissionsSummarization:
                 err_msg = "summation not correct for bus " + str(bus)
                 assert expected_sum[k][bus] == pytest.approx(summation[k][bus]), err_msg
 
+    def test_emissions_summarization_as_frame(self, scenario, mock_plant):
+        carbon = generate_emissions_stats(scenario, method="simple")
+        summation = summarize_emissions_by_bus(
+            carbon, MockGrid(grid_attrs={"plant": mock_plant}), as_frame=True
+        )
+        expected = summarize_emissions_by_bus(
+            carbon, MockGrid(grid_attrs={"plant": mock_plant})
+        )
+
+        assert isinstance(summation, pd.DataFrame)
+        assert set(summation.index) == set(expected.keys())
+        assert set(summation.columns) == {1003, 1004, 1005}
+        for r in expected:
+            for bus, value in expected[r].items():
+                assert summation.loc[r, bus] == pytest.approx(value)
+        assert summation.loc["biomass"].sum() == 0
+
     def test_carbon_diff(self, scenario):
         assert carbon_diff(scenario, scenario) == 0
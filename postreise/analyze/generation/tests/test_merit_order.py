@@ -0,0 +1,131 @@
+import pandas as pd
+import pytest
+from powersimdata.tests.mock_scenario import MockScenario
+
+from postreise.analyze.generation.costs import calculate_marginal_costs
+from postreise.analyze.generation.merit_order import (
+    get_marginal_units,
+    get_merit_order,
+)
+
+mock_plant = {
+    "plant_id": [101, 102, 103, 104],
+    "type": ["coal", "ng", "ng", "solar"],
+    "zone_name": ["A", "A", "B", "B"],
+    "Pmax": [100, 50, 80, 40],
+}
+
+mock_gencost = {
+    "plant_id": [101, 102, 103, 104],
+    "type": [2, 2, 2, 2],
+    "n": [3, 3, 3, 3],
+    "c2": [0.1, 0.5, 0, 0],
+    "c1": [20, 10, 30, 0],
+    "c0": [100, 50, 10, 0],
+}
+
+mock_pg = pd.DataFrame(
+    {
+        101: [0, 50, 100],
+        102: [20, 0, 50],
+        103: [0.5, 40, 80],
+        104: [40, 20, 0],
+    },
+    index=pd.date_range("2016-01-01", periods=3, freq="H"),
+)
+
+scenario = MockScenario(
+    grid_attrs={"plant": mock_plant, "gencost_before": mock_gencost}, pg=mock_pg
+)
+
+# derivative of the cost curves at pg: 2 * c2 * pg + c1
+expected_marginal_cost = pd.DataFrame(
+    {
+        101: [20.0, 30, 40],
+        102: [30.0, 10, 60],
+        103: [30.0, 30, 30],
+        104: [0.0, 0, 0],
+    },
+    index=mock_pg.index,
+)
+
+
+def test_calculate_marginal_costs():
+    pd.testing.assert_frame_equal(
+        calculate_marginal_costs(scenario), expected_marginal_cost
+    )
+
+
+def test_calculate_marginal_costs_piecewise_linear():
+    gencost = pd.DataFrame(
+        {
+            "type": [1],
+            "n": [3],
+            "p1": [0],
+            "f1": [0],
+            "p2": [10],
+            "f2": [50],
+            "p3": [20],
+            "f3": [150],
+        },
+        index=[101],
+    )
+    pg = pd.DataFrame(
+        {101: [5, 10, 15, 25]},
+        index=pd.date_range("2016-01-01", periods=4, freq="H"),
+    )
+    marginal_cost = calculate_marginal_costs(pg=pg, gencost=gencost)
+    assert marginal_cost[101].tolist() == [5, 10, 10, 10]
+
+
+def test_get_merit_order():
+    merit_order = get_merit_order(scenario)
+    assert merit_order["plant_id"].iloc[0].tolist() == [104, 101, 102, 103]
+    assert merit_order["plant_id"].iloc[1].tolist() == [104, 102, 101, 103]
+    assert merit_order["marginal_cost"].iloc[2].tolist() == [0, 30, 40, 60]
+    assert merit_order["capacity"].iloc[2].tolist() == [40, 120, 220, 270]
+    assert list(merit_order["capacity"].columns) == [1, 2, 3, 4]
+
+
+def test_get_marginal_units():
+    # all dispatched generators are at maximum power in the last hour
+    units = get_marginal_units(scenario)
+    assert units["plant_id"].tolist()[:2] == [102, 101]
+    assert units["marginal_cost"].tolist()[:2] == [30, 30]
+    assert units.iloc[2].isna().all()
+
+
+def test_get_marginal_units_excludes_generators_at_pmax():
+    pg = mock_pg.copy()
+    pg[101] = [0, 50, 99.9995]
+    pg[103] = [0.5, 40, 79]
+    at_pmax = MockScenario(
+        grid_attrs={"plant": mock_plant, "gencost_before": mock_gencost}, pg=pg
+    )
+    units = get_marginal_units(at_pmax)
+    assert units["plant_id"].tolist() == [102, 101, 103]
+    assert units["marginal_cost"].tolist() == [30, 30, 30]
+
+    units = get_marginal_units(at_pmax, epsilon=1e-4)
+    assert units["plant_id"].tolist() == [102, 101, 101]
+
+
+def test_get_marginal_units_by_zone():
+    units = get_marginal_units(scenario, by="zone_name")
+    assert units["plant_id"]["A"].tolist()[:2] == [102, 101]
+    assert units["plant_id"]["B"].iloc[1] == 103
+    assert units["plant_id"].iloc[0].isna().tolist() == [False, True]
+    assert units["plant_id"].iloc[2].isna().all()
+
+    units = get_marginal_units(scenario, by="zone_name", threshold=30)
+    assert units["plant_id"]["A"].isna().tolist() == [True, False, True]
+    assert units["plant_id"]["B"].isna().tolist() == [True, False, True]
+
+
+def test_get_marginal_units_argument():
+    with pytest.raises(TypeError):
+        get_marginal_units(scenario, threshold="1")
+    with pytest.raises(ValueError):
+        get_marginal_units(scenario, threshold=-1)
+    with pytest.raises(ValueError):
+        get_marginal_units(scenario, epsilon=-1)
@@ -144,6 +144,9 @@ class TestSumGenerationByTypeZone(unittest.TestCase):
         )
         expected_return.set_index("type", inplace=True)
         check_dataframe_matches(summed_generation, expected_return)
+        # the power generated by plants, shared by all the callers, is not modified
+        self.assertIsNone(self.scenario.get_pg().index.tz)
+        self.assertIsNone(self.scenario.get_pg().index.name)
 
     def test_print_statement(self):
         captured = io.StringIO()
@@ -0,0 +1,31 @@
+import numpy as np
+import pandas as pd
+from numpy.testing import assert_allclose
+from powersimdata.utility.distance import haversine as scalar_haversine
+
+from postreise.analyze.distance import get_line_length, haversine
+
+
+def test_haversine():
+    rng = np.random.default_rng(0)
+    from_lat, to_lat = rng.uniform(-90, 90, (2, 50))
+    from_lon, to_lon = rng.uniform(-180, 180, (2, 50))
+    expected = [
+        scalar_haversine(p1, p2)
+        for p1, p2 in zip(zip(from_lat, from_lon), zip(to_lat, to_lon))
+    ]
+    assert_allclose(haversine(from_lat, from_lon, to_lat, to_lon), expected)
+
+
+def test_get_line_length():
+    line = pd.DataFrame(
+        {
+            "from_lat": [47.6, 37.8],
+            "from_lon": [-122.3, -122.4],
+            "to_lat": [47.6, 34.1],
+            "to_lon": [-122.3, -118.2],
+        }
+    )
+    length = get_line_length(line)
+    assert length[0] == 0
+    assert_allclose(length[1], scalar_haversine((37.8, -122.4), (34.1, -118.2)))
@@ -1,13 +1,22 @@
+import gc
+from unittest.mock import patch
+
+import numpy as np
 import pandas as pd
 import pytest
 import pytz
 
 from postreise.analyze.time import (
+    _freq_cache,
+    _infer_freq,
     change_time_zone,
+    get_time_of_use_cube,
+    get_time_window_masks,
     is_24_hour_format,
     is_dst,
     resample_time_series,
     slice_time_series,
+    slice_time_series_by_windows,
 )
 
 nb_hours = 366 * 24
@@ -58,15 +67,84 @@ def test_slicing():
         assert len(ts_sliced.index) == 18
 
 
+def test_time_window_argument():
+    with pytest.raises(TypeError):
+        get_time_window_masks(ts_as_series, [{"dayofweek": {0}}])
+    with pytest.raises(TypeError):
+        get_time_window_masks(ts_as_series, {"peak": ["08:00", "20:00"]})
+    with pytest.raises(TypeError):
+        get_time_window_masks(ts_as_series, {"summer": {"month": [6, 7, 8]}})
+    with pytest.raises(ValueError):
+        get_time_window_masks(ts_as_series, {"summer": {"months": {6, 7, 8}}})
+    with pytest.raises(ValueError):
+        get_time_window_masks(ts_as_series, {"winter": {"month": {0, 1, 2}}})
+    with pytest.raises(ValueError):
+        get_time_window_masks(ts_as_series, {"peak": {"between_time": ["8", "20"]}})
+    with pytest.raises(ValueError):
+        get_time_window_masks(
+            ts_as_series, {"late": {"start": pd.Timestamp(2018, 1, 1)}}
+        )
+
+
+def test_slice_time_series_by_windows():
+    windows = {
+        "all": {},
+        "peak": {"between_time": ["08:00", "20:00"], "dayofweek": {0, 1, 2, 3, 4}},
+        "off_peak": {"between_time": ["21:00", "07:00"]},
+        "weekend": {"dayofweek": {5, 6}},
+        "june": {
+            "start": pd.Timestamp(2016, 6, 1),
+            "end": pd.Timestamp(2016, 6, 30, 23),
+        },
+        "summer_peak": {"between_time": ["14:00", "18:00"], "month": {6, 7, 8}},
+    }
+    expected = {
+        "all": ts_as_data_frame,
+        "peak": slice_time_series(
+            ts_as_data_frame,
+            ts_as_data_frame.index[0],
+            ts_as_data_frame.index[-1],
+            between_time=["08:00", "20:00"],
+            dayofweek={0, 1, 2, 3, 4},
+        ),
+        "off_peak": ts_as_data_frame.between_time("21:00", "07:00"),
+        "weekend": ts_as_data_frame[ts_as_data_frame.index.dayofweek >= 5],
+        "june": ts_as_data_frame["2016-06"],
+        "summer_peak": ts_as_data_frame["2016-06":"2016-08"].between_time(
+            "14:00", "18:00"
+        ),
+    }
+    slices = slice_time_series_by_windows(ts_as_data_frame, windows)
+    assert list(slices) == list(windows)
+    for name, ts in slices.items():
+        assert ts.equals(expected[name])
+
+    masks = get_time_window_masks(ts_as_series, windows)
+    assert masks.columns.tolist() == list(windows)
+    assert masks.index.equals(ts_as_series.index)
+    assert masks.T.dot(ts_as_series).tolist() == [len(expected[n]) for n in windows]
+
+
+def test_time_window_masks_time_zone():
+    ts = ts_as_series.tz_localize("UTC").tz_convert("US/Pacific")
+    masks = get_time_window_masks(ts, {"night": {"between_time": ["00:00", "05:00"]}})
+    assert masks["night"].sum() == len(ts.between_time("00:00", "05:00"))
+    assert (masks.index[masks["night"]].hour <= 5).all()
+
+
 def test_resampling_argument_value():
     arg = (
-        (ts_as_data_frame, "Q", "mean"),
+        (ts_as_data_frame, "B", "mean"),
+        (ts_as_data_frame, "0H", "mean"),
         (ts_as_series, "D", "median"),
-        (ts_as_data_frame.tz_localize("UTC").tz_convert("US/Pacific"), "W", "sum"),
+        (ts_as_series, "D", 1.5),
+        (ts_as_series, "D", []),
     )
     for a in arg:
         with pytest.raises(ValueError):
             resample_time_series(a[0], a[1], agg=a[2])
+    with pytest.raises(TypeError):
+        resample_time_series(ts_as_series, 24)
 
 
 def test_daily_resampling_sum():
@@ -174,7 +252,7 @@ def test_daily_resampling_incomplete_sum():
         assert str(ts_resampled.index[0]) == str(pd.Timestamp(2016, 1, 2))
         if i == 0:
             assert ts_resampled.sum().equals(
-                pd.Series([float(29 * 24), float(29 * 2 * 24)], index=["A", "B"])
+                pd.Series([29 * 24, 29 * 2 * 24], index=["A", "B"])
             )
         else:
             assert ts_resampled.sum() == 29 * 24
@@ -371,7 +449,7 @@ def test_weekly_resampling_incomplete_sum():
         assert str(ts_resampled.index[-1]) == str(pd.Timestamp(2016, 1, 24))
         if i == 0:
             assert ts_resampled.sum().equals(
-                pd.Series([float(4 * 7 * 24), float(4 * 7 * 2 * 24)], index=["A", "B"])
+                pd.Series([4 * 7 * 24, 4 * 7 * 2 * 24], index=["A", "B"])
             )
         else:
             assert ts_resampled.sum() == 4 * 7 * 24
@@ -686,6 +764,43 @@ def test_change_time_zone():
         assert set(ts_idx.year.unique()) == {2015, 2016}
 
 
+def test_change_time_zone_is_view():
+    for a in (ts_as_data_frame, ts_as_series):
+        ts = change_time_zone(a, "US/Pacific")
+        assert ts.index.name == "US/Pacific"
+        assert a.index.name is None
+        assert a.index.tz is None
+        assert np.shares_memory(ts.to_numpy(), a.to_numpy())
+        assert ts.values.tolist() == a.values.tolist()
+
+
+def test_infer_freq_cache():
+    index = pd.date_range("2016-01-01", periods=10, freq="H")
+    with patch("postreise.analyze.time.pd.infer_freq", return_value="H") as infer:
+        for _ in range(3):
+            assert _infer_freq(index) == "H"
+            change_time_zone(pd.Series(range(10), index=index), "US/Pacific")
+        assert infer.call_count == 1
+        _infer_freq(index.copy())
+        assert infer.call_count == 2
+
+    index = pd.date_range("2016-01-01", periods=10, freq="H")
+    _infer_freq(index)
+    assert id(index) in _freq_cache
+    key = id(index)
+    del index
+    gc.collect()
+    assert key not in _freq_cache
+
+
+def test_change_time_zone_without_validation():
+    ts = ts_as_series.iloc[::2]
+    with pytest.raises(ValueError):
+        change_time_zone(ts, "US/Pacific")
+    ts_converted = change_time_zone(ts, "US/Pacific", validate=False)
+    assert ts_converted.index.tz == pytz.timezone("US/Pacific")
+
+
 def test_is_dst():
     arg = (
         ts_as_data_frame.tz_localize("UTC").tz_convert("ETC/GMT+8"),
@@ -698,3 +813,148 @@ def test_is_dst():
             assert not is_dst(a)
         else:
             assert is_dst(a)
+
+
+def test_is_dst_sparse_index():
+    winter = pd.DatetimeIndex(["2016-01-15", "2016-12-15"], tz="US/Pacific")
+    assert not is_dst(pd.Series([1, 2], index=winter))
+    summer = winter.insert(1, pd.Timestamp("2016-07-01", tz="US/Pacific"))
+    assert is_dst(pd.Series([1, 2, 3], index=summer))
+    assert is_dst(pd.Series([2, 1, 3], index=summer[[1, 0, 2]]))
+
+
+def test_is_dst_time_span():
+    ts = ts_as_series.tz_localize("UTC").tz_convert("US/Pacific")
+    assert not is_dst(ts["2016-11-07":"2017-03-11"])
+    assert is_dst(ts["2016-11-06 00:00":"2016-11-06 00:59"])
+    assert not is_dst(ts["2016-11-06 02:00":"2016-11-06 05:00"])
+    assert is_dst(ts["2016-03-13 03:00":"2016-03-13 03:59"])
+    assert not is_dst(ts.iloc[:0])
+
+
+def test_daily_resampling_dst_sum():
+    ts = ts_as_data_frame.tz_localize("UTC").tz_convert("US/Pacific")
+    ts_resampled = resample_time_series(ts, "D")
+    # first day (2015/12/31) and last day (2016/12/31) are incomplete
+    assert len(ts_resampled) == 365
+    assert ts_resampled.index[0] == pd.Timestamp("2016-01-01", tz="US/Pacific")
+    assert ts_resampled.loc["2016-03-13", "A"].item() == 23
+    assert ts_resampled.loc["2016-11-06", "A"].item() == 25
+    assert ts_resampled.loc["2016-07-04", "B"].item() == 48
+    assert ts_resampled["A"].sum() == 366 * 24 - 16 - 8
+
+
+def test_monthly_resampling_dst_mean():
+    ts = ts_as_series.tz_localize("UTC").tz_convert("US/Eastern")
+    ts_resampled = resample_time_series(ts, "M", agg="mean")
+    assert len(ts_resampled) == 13
+    assert ts_resampled.index[0] == pd.Timestamp("2015-12-01", tz="US/Eastern")
+    assert (ts_resampled == 1).all()
+
+
+def test_hourly_multiple_and_quarterly_resampling():
+    ts_resampled = resample_time_series(ts_as_series, "6H")
+    assert len(ts_resampled) == 366 * 4
+    assert (ts_resampled == 6).all()
+    ts_resampled = resample_time_series(ts_as_series, "Q")
+    assert ts_resampled.index.tolist() == list(
+        pd.date_range("2016-01-01", periods=4, freq="QS")
+    )
+    assert ts_resampled.tolist() == [91 * 24, 91 * 24, 92 * 24, 92 * 24]
+    assert len(resample_time_series(ts_as_series[:-1], "A")) == 0
+    assert resample_time_series(ts_as_series[:-1], "A", complete=False).item() == (
+        366 * 24 - 1
+    )
+
+
+def test_resampling_missing_values_sum(capsys):
+    ts = ts_as_data_frame.astype(float)
+    ts.iloc[30, 1] = np.nan
+    ts_resampled = resample_time_series(ts, "D")
+    # the second day has a missing value in column B
+    assert len(ts_resampled) == 365
+    assert pd.Timestamp(2016, 1, 2) not in ts_resampled.index
+    assert len(resample_time_series(ts["A"], "D")) == 366
+    assert len(resample_time_series(ts, "M")) == 11
+    assert len(resample_time_series(ts, "6H")) == 366 * 4 - 1
+    assert "clip incomplete 6H periods" in capsys.readouterr().out
+
+
+def test_resampling_multiple_aggregations():
+    ts = ts_as_data_frame.copy()
+    ts["A"] = range(len(ts))
+    ts_resampled = resample_time_series(ts, "D", agg=["sum", "max", 0.5])
+    assert ts_resampled.columns.tolist() == [
+        ("A", "sum"),
+        ("A", "max"),
+        ("A", 0.5),
+        ("B", "sum"),
+        ("B", "max"),
+        ("B", 0.5),
+    ]
+    assert ts_resampled.iloc[1].tolist() == [
+        sum(range(24, 48)),
+        47,
+        35.5,
+        48,
+        2,
+        2,
+    ]
+    ts_resampled = resample_time_series(ts["A"][:30], "D", agg=["mean", "min"])
+    # incomplete days are kept since sum is not computed
+    assert ts_resampled.columns.tolist() == ["mean", "min"]
+    assert ts_resampled["min"].tolist() == [0, 24]
+
+
+def test_time_of_use_cube_argument():
+    with pytest.raises(TypeError):
+        get_time_of_use_cube(ts_as_series, period={"month"})
+    with pytest.raises(ValueError):
+        get_time_of_use_cube(ts_as_series, period="week")
+    with pytest.raises(ValueError):
+        get_time_of_use_cube(ts_as_series, agg="median")
+    with pytest.raises(ValueError):
+        get_time_of_use_cube(ts_as_series, period=[])
+
+
+def test_time_of_use_cube():
+    ts = ts_as_data_frame.copy()
+    ts["A"] = ts.index.hour + 100 * ts.index.month
+    ts.iloc[1, 1] = np.nan
+    cubes, periods, columns = get_time_of_use_cube(
+        ts, agg=["sum", "mean", "max", "count"]
+    )
+    assert periods.tolist() == list(range(1, 13))
+    assert periods.name == "month"
+    assert columns.tolist() == ["A", "B"]
+    assert cubes["mean"].shape == (12, 24, 2)
+    assert cubes["mean"][1, 5, 0] == 205
+    assert cubes["max"][11, 23, 0] == 1223
+    assert cubes["sum"][0, 1].tolist() == [31 * 101, 30 * 2]
+    assert cubes["count"][0, 1].tolist() == [31, 30]
+    assert (cubes["mean"][:, :, 1] == 2).all()
+
+
+def test_time_of_use_cube_time_zone():
+    cube, periods, columns = get_time_of_use_cube(
+        ts_as_series.rename("load"),
+        period=["season", "dayofweek"],
+        agg="count",
+        time_zone="US/Pacific",
+    )
+    assert cube.shape == (28, 24, 1)
+    assert columns.tolist() == ["load"]
+    assert periods.names == ["season", "dayofweek"]
+    assert periods[0] == ("winter", 0)
+    assert cube.sum() == len(ts_as_series)
+    # 2016/03/13 is a Sunday in spring, clocks go from 2:00 to 3:00
+    spring_sunday = periods.get_loc(("spring", 6))
+    assert cube[spring_sunday, 2, 0] == 13 - 1
+    assert cube[spring_sunday, 3, 0] == 13
+
+    cube, dates, _ = get_time_of_use_cube(
+        ts_as_series, period="date", time_zone="US/Pacific"
+    )
+    assert len(dates) == 367
+    assert np.isnan(cube[0, :16, 0]).all()
+    assert (cube[0, 16:, 0] == 1).all()
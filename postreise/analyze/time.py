@@ -1,5 +1,8 @@
 import re
+import weakref
+from functools import lru_cache
 
+import numpy as np
 import pandas as pd
 import pytz
 from powersimdata.input.check import (
@@ -7,6 +10,10 @@ from powersimdata.input.check import (
     _check_time_series,
 )
 
+_window_keys = {"start", "end", "between_time", "dayofweek", "month"}
+_seasons = ["winter", "spring", "summer", "fall"]
+_freq_cache = {}
+
 
 def is_24_hour_format(time):
     """Check if the input string is in 24-hour format
@@ -20,7 +27,73 @@ def is_24_hour_format(time):
     return m is not None
 
 
-def slice_time_series(ts, start, end, between_time=None, dayofweek=None):
+def _infer_freq(index):
+    """Infer the frequency of an index. The result is kept as long as the index is
+    alive, indexes being immutable.
+
+    :param pandas.DatetimeIndex index: index.
+    :return: (*str*) -- frequency, None if it cannot be inferred.
+    """
+    key = id(index)
+    if key in _freq_cache and _freq_cache[key][0]() is index:
+        return _freq_cache[key][1]
+    freq = pd.infer_freq(index)
+    _freq_cache[key] = (
+        weakref.ref(index, lambda _, k=key: _freq_cache.pop(k, None)),
+        freq,
+    )
+    return freq
+
+
+def _check_between_time(between_time):
+    """Ensure a time range of the day is valid.
+
+    :param list between_time: start hour and end hour of each day.
+    :raises TypeError:
+        if between_time is provided but not a list and/or
+        if not all elements of between_time are strings.
+    :raises ValueError:
+        if between_time is provided but does not have exactly two elements and/or
+        if not all elements of between_time are in 24 hour format.
+    """
+    if between_time is not None and not isinstance(between_time, list):
+        raise TypeError("between_time must be a list")
+    if between_time:
+        if len(between_time) != 2:
+            raise ValueError("between_time must be a list with start_time and end_time")
+        if not all([isinstance(t, str) for t in between_time]):
+            raise TypeError("every element of between_time must be a string")
+        if not all([is_24_hour_format(t) for t in between_time]):
+            raise ValueError("every element of between_time must be in 24 hour format")
+
+
+def _check_dayofweek(dayofweek):
+    """Ensure a set of days of week is valid.
+
+    :param set dayofweek: days of week, 0 being Monday and 6 being Sunday.
+    :raises TypeError: if dayofweek is provided but not a set.
+    :raises ValueError: if dayofweek is not a subset of integers in [0, 6].
+    """
+    if dayofweek is not None and not isinstance(dayofweek, set):
+        raise TypeError("dayofweek must be a set")
+    if dayofweek and not dayofweek.issubset(set(range(7))):
+        raise ValueError(f"dayofweek must be a subset of {set(range(7))}")
+
+
+def _check_month(month):
+    """Ensure a set of months is valid.
+
+    :param set month: months, 1 being January and 12 being December.
+    :raises TypeError: if month is provided but not a set.
+    :raises ValueError: if month is not a subset of integers in [1, 12].
+    """
+    if month is not None and not isinstance(month, set):
+        raise TypeError("month must be a set")
+    if month and not month.issubset(set(range(1, 13))):
+        raise ValueError(f"month must be a subset of {set(range(1, 13))}")
+
+
+def slice_time_series(ts, start, end, between_time=None, dayofweek=None, validate=True):
     """Slice a time series.
 
     :param pandas.DataFrame/pandas.Series ts: time series to slice.
@@ -33,6 +106,8 @@ def slice_time_series(ts, start, end, between_time=None, dayofweek=None):
     :param set dayofweek: specify the interest days of week, which is a subset of
         integers in [0, 6] with 0 being Monday and 6 being Sunday, default to None,
         which includes every day of a week.
+    :param bool validate: check the arguments. Set to False to skip the checks when
+        the arguments are known to be valid.
     :return: (*pandas.DataFrame/pandas.Series*) -- the sliced time series.
     :raises TypeError:
         if between_time is provided but not a list and/or
@@ -43,38 +118,234 @@ def slice_time_series(ts, start, end, between_time=None, dayofweek=None):
         if not all elements of between_time are in 24 hour format and/or
         if dayofweek is provided but not a subset of integers in [0, 6].
     """
-    _check_date_range_in_time_series(ts, start, end)
+    if validate:
+        _check_date_range_in_time_series(ts, start, end)
+        _check_between_time(between_time)
+        _check_dayofweek(dayofweek)
     ts = ts[start:end]
-    if between_time is not None and not isinstance(between_time, list):
-        raise TypeError("between_time must be a list")
     if between_time:
-        if len(between_time) != 2:
-            raise ValueError("between_time must be a list with start_time and end_time")
-        if not all([isinstance(t, str) for t in between_time]):
-            raise TypeError("every element of between_time must be a string")
-        if not all([is_24_hour_format(t) for t in between_time]):
-            raise ValueError("every element of between_time must be in 24 hour format")
         ts = ts.between_time(*between_time)
 
-    if dayofweek is not None and not isinstance(dayofweek, set):
-        raise TypeError("dayofweek must be a set")
     if dayofweek:
-        if not dayofweek.issubset(set(range(7))):
-            raise ValueError(f"dayofweek must be a subset of {set(range(7))}")
         ts = ts[ts.index.dayofweek.isin(dayofweek)]
 
     return ts
 
 
-def resample_time_series(ts, freq, agg="sum"):
-    """Resample a time series.
+def _check_time_windows(ts, windows):
+    """Ensure time windows are valid.
+
+    :param pandas.DataFrame/pandas.Series ts: time series.
+    :param dict windows: time windows, see :func:`get_time_window_masks`.
+    :raises TypeError: if windows is not a dict or a window is not a dict or the
+        filters of a window have invalid types.
+    :raises ValueError: if a window has unknown keys or invalid filters.
+    """
+    if not isinstance(windows, dict):
+        raise TypeError("windows must be a dict")
+    for name, window in windows.items():
+        if not isinstance(window, dict):
+            raise TypeError(f"window {name} must be a dict")
+        unknown = set(window) - _window_keys
+        if unknown:
+            raise ValueError(f"unknown key(s) in window {name}: {unknown}")
+        if "start" in window or "end" in window:
+            _check_date_range_in_time_series(
+                ts, window.get("start", ts.index[0]), window.get("end", ts.index[-1])
+            )
+        _check_between_time(window.get("between_time"))
+        _check_dayofweek(window.get("dayofweek"))
+        _check_month(window.get("month"))
+
+
+def _get_between_time_mask(seconds, between_time):
+    """Flag times of the day within a time range.
+
+    :param numpy.ndarray seconds: seconds elapsed since midnight.
+    :param list between_time: start hour and end hour, inclusive. If the end hour is
+        before the start hour, the complementary hours of a day are flagged.
+    :return: (*numpy.ndarray*) -- boolean mask.
+    """
+    start, end = [
+        sum(int(x) * m for x, m in zip(t.split(":"), (3600, 60))) for t in between_time
+    ]
+    if start <= end:
+        return (seconds >= start) & (seconds <= end)
+    return (seconds >= start) | (seconds <= end)
+
+
+def _get_lookup_mask(values, selected, size):
+    """Flag values in a set of small non-negative integers.
+
+    :param numpy.ndarray values: values in [0, size).
+    :param set selected: values to flag.
+    :param int size: number of possible values.
+    :return: (*numpy.ndarray*) -- boolean mask.
+    """
+    lookup = np.zeros(size, dtype=bool)
+    lookup[list(selected)] = True
+    return lookup[values]
+
+
+def get_time_window_masks(ts, windows, validate=True):
+    """Flag the timestamps of a time series falling in time windows.
+
+    :param pandas.DataFrame/pandas.Series ts: time series.
+    :param dict windows: keys are window names, values are dict with the
+        optional keys: *'start'* and *'end'* (inclusive dates, see
+        :func:`slice_time_series`), *'between_time'* (start hour and end hour of each
+        day, see :func:`slice_time_series`), *'dayofweek'* (set of integers in
+        [0, 6] with 0 being Monday) and *'month'* (set of integers in [1, 12] with 1
+        being January). A window without key includes every timestamp.
+    :param bool validate: check the arguments. Set to False to skip the checks when
+        the arguments are known to be valid.
+    :return: (*pandas.DataFrame*) -- boolean data frame. Index is the index of the
+        time series and columns are the window names.
+    :raises TypeError: if windows is not a dict or a window is not a dict or the
+        filters of a window have invalid types.
+    :raises ValueError: if a window has unknown keys or invalid filters.
+
+    .. note::
+        The hour, day of week and month of the timestamps are extracted once and
+        shared by all the windows. Integer positions of a window are given by
+        ``numpy.flatnonzero(masks[name])`` and the time series can be aggregated over
+        all the windows at once, e.g. ``masks.T.dot(ts)``.
+    """
+    if validate:
+        _check_time_series(ts, "time series")
+        _check_time_windows(ts, windows)
+    index = ts.index
+    fields = {}
+
+    def get_field(name):
+        if name not in fields:
+            if name == "seconds":
+                fields[name] = (
+                    index.hour.to_numpy() * 3600
+                    + index.minute.to_numpy() * 60
+                    + index.second.to_numpy()
+                )
+            else:
+                fields[name] = getattr(index, name).to_numpy()
+        return fields[name]
+
+    masks = {}
+    for name, window in windows.items():
+        mask = np.ones(len(index), dtype=bool)
+        if "start" in window:
+            mask &= index >= pd.Timestamp(window["start"])
+        if "end" in window:
+            mask &= index <= pd.Timestamp(window["end"])
+        if window.get("between_time"):
+            mask &= _get_between_time_mask(get_field("seconds"), window["between_time"])
+        if window.get("dayofweek"):
+            mask &= _get_lookup_mask(get_field("dayofweek"), window["dayofweek"], 7)
+        if window.get("month"):
+            mask &= _get_lookup_mask(get_field("month"), window["month"], 13)
+        masks[name] = mask
+    return pd.DataFrame(masks, index=index, columns=list(windows))
+
+
+def slice_time_series_by_windows(ts, windows, validate=True):
+    """Slice a time series over several time windows.
+
+    :param pandas.DataFrame/pandas.Series ts: time series to slice.
+    :param dict windows: keys are window names, values are dict defining the
+        windows, see :func:`get_time_window_masks`.
+    :param bool validate: check the arguments. Set to False to skip the checks when
+        the arguments are known to be valid.
+    :return: (*dict*) -- keys are window names, values are the sliced time series.
+    :raises TypeError: if windows is not a dict or a window is not a dict or the
+        filters of a window have invalid types.
+    :raises ValueError: if a window has unknown keys or invalid filters.
+    """
+    masks = get_time_window_masks(ts, windows, validate=validate)
+    return {name: ts[masks[name].to_numpy()] for name in masks}
+
+
+_resample_rule = {"D": "D", "W": "W-SUN", "M": "MS", "Q": "QS", "A": "AS"}
+_resample_label = {
+    "D": "days",
+    "W": "weeks",
+    "M": "months",
+    "Q": "quarters",
+    "A": "years",
+}
+
+
+def _get_resample_rule(freq):
+    """Get the pandas offset alias used to resample a time series.
+
+    :param str freq: frequency. Either *'D'* (day), *'W'* (week), *'M'* (month),
+        *'Q'* (quarter), *'A'* (year), *'H'* or a multiple of hours, e.g. *'6H'*.
+    :return: (*str*) -- offset alias.
+    :raises TypeError: if freq is not a str.
+    :raises ValueError: if freq is not supported.
+    """
+    if not isinstance(freq, str):
+        raise TypeError("frequency must be a str")
+    if freq in _resample_rule:
+        return _resample_rule[freq]
+    if re.fullmatch(r"[1-9][0-9]*H|H", freq):
+        return freq
+    raise ValueError("frequency must be one of 'D', 'W', 'M', 'Q', 'A' or 'nH'")
+
+
+def _check_resample_agg(agg):
+    """Ensure aggregation methods are supported.
+
+    :param str/float/list agg: aggregation method(s).
+    :return: (*list*) -- aggregation methods.
+    :raises ValueError: if an aggregation method is not supported.
+    """
+    aggs = agg if isinstance(agg, list) else [agg]
+    if len(aggs) == 0:
+        raise ValueError("at least one aggregation method must be given")
+    for a in aggs:
+        if isinstance(a, str):
+            if a not in {"sum", "mean", "min", "max"}:
+                raise ValueError(
+                    "aggregation method must be 'sum', 'mean', 'min', 'max' or a "
+                    "quantile"
+                )
+        elif not (isinstance(a, float) and 0 <= a <= 1):
+            raise ValueError("quantile must be a float in [0, 1]")
+    return aggs
+
+
+def _get_expected_size(labels, rule):
+    """Get the number of hours in bins.
+
+    :param pandas.DatetimeIndex labels: left edges of contiguous bins.
+    :param str rule: offset alias of the bins.
+    :return: (*numpy.ndarray*) -- number of hours in each bin. Bins are built in the
+        time zone of the labels, e.g. days have 23 or 25 hours when DST starts or ends.
+    """
+    edges = pd.date_range(labels[0], periods=len(labels) + 1, freq=rule)
+    return np.diff(edges.asi8) // pd.Timedelta(hours=1).value
+
+
+def resample_time_series(ts, freq, agg="sum", complete=None, validate=True):
+    """Resample an hourly time series.
 
     :param pandas.DataFrame/pandas.Series ts: time series to resample.
-    :param str freq: frequency. Either *'D'* (day), *'W'* (week), *'M'* (month).
-    :param str agg: aggregation method. Either *'sum'* or *'mean'*.
-    :return: (*pandas.DataFrame/pandas.Series*) -- the resampled time series.
-    :raises ValueError: if freq is not one of *'D'*, *'W'*, *'M'* or agg is not one of
-        *'sum'* or *'mean'* or ts is time zone aware with DST.
+    :param str freq: frequency. Either *'D'* (day), *'W'* (week), *'M'* (month),
+        *'Q'* (quarter), *'A'* (year), *'H'* or a multiple of hours, e.g. *'6H'*.
+    :param str/float/list agg: aggregation method(s). Either *'sum'*, *'mean'*,
+        *'min'*, *'max'* or a float in [0, 1] for a quantile. If a list is given, all
+        the aggregations are computed from the same bins.
+    :param bool complete: keep only complete bins. Defaults to None, which clips
+        incomplete bins when *'sum'* is one of the aggregation methods.
+    :param bool validate: check the arguments. Set to False to skip the checks when
+        the arguments are known to be valid.
+    :return: (*pandas.DataFrame/pandas.Series*) -- the resampled time series. If a
+        list of aggregation methods is given, a data frame whose columns are the
+        aggregation methods (series) or a (column, aggregation method) multi index
+        (data frame).
+    :raises TypeError: if freq is not a str.
+    :raises ValueError: if freq is not one of *'D'*, *'W'*, *'M'*, *'Q'*, *'A'* or
+        *'nH'* or agg is not one of *'sum'*, *'mean'*, *'min'*, *'max'* or a float in
+        [0, 1].
 
     .. note::
         When resampling:
@@ -83,76 +354,118 @@ def resample_time_series(ts, freq, agg="sum"):
         * the left bin edge is used to label the interval.
         * intervals start at midnight when freq is *'D'*.
         * intervals start on Sunday when freq is *'W'*.
-        * incomplete days, weeks and months are clipped when agg is *'sum'*.
-        * incomplete days, weeks and months are calculated using available data
-          samples when agg is *'mean'*.
+        * intervals start on the first day of the month/quarter/year when freq is
+          *'M'*, *'Q'* or *'A'*.
+        * bins follow the local time of time zone aware series. Days have 23 or 25
+          hours when Daylight Saving Time starts or ends.
+        * a bin is complete when it has one non-missing sample per hour in every
+          column. Incomplete bins are clipped when agg is *'sum'*.
+        * incomplete days, weeks, months, etc. are calculated using available data
+          samples when agg is not *'sum'*.
     """
-    _check_time_series(ts, "time series")
-    if is_dst(ts):
-        raise ValueError(
-            "DST is not supported. Use ETC/GMT+x or ETC/GMT-x where x is the offset"
-        )
+    if validate:
+        _check_time_series(ts, "time series")
+        _check_resample_agg(agg)
+    rule = _get_resample_rule(freq)
+    aggs = agg if isinstance(agg, list) else [agg]
+    if complete is None:
+        complete = "sum" in aggs
 
-    if freq not in ["D", "W", "M"]:
-        raise ValueError("frequency must be one of 'D', 'W', 'M'")
+    if complete:
+        print("clip incomplete %s" % _resample_label.get(freq, f"{freq} periods"))
 
-    if agg not in ["sum", "mean"]:
-        raise ValueError("aggregation method must 'sum' or 'mean'")
-
-    if agg == "sum":
-        print("clip incomplete %s" % {"D": "days", "W": "weeks", "M": "months"}[freq])
-
-    if freq == "D":
-        if agg == "sum":
-            return ts.resample("D").sum(min_count=24).dropna()
+    resampler = ts.resample(rule, label="left", closed="left")
+    resampled = {
+        a: getattr(resampler, a)() if isinstance(a, str) else resampler.quantile(a)
+        for a in aggs
+    }
+    if isinstance(agg, list):
+        if isinstance(ts, pd.Series):
+            resampled = pd.DataFrame(resampled)
         else:
-            return ts.resample("D").mean()
-    elif freq == "W":
-        if agg == "sum":
-            return (
-                ts.resample("W", label="left", closed="left")
-                .sum(min_count=7 * 24)
-                .dropna()
+            resampled = pd.concat(resampled, axis=1).swaplevel(axis=1)
+            resampled = resampled.reindex(
+                columns=pd.MultiIndex.from_product([ts.columns, aggs])
             )
-        else:
-            return ts.resample("W", label="left", closed="left").mean()
-    elif freq == "M":
-        if agg == "sum":
-            # coerce Series to DataFrame as necessary, grab first column, count entries by month
-            count = pd.DataFrame(ts).iloc[:, 0].resample("MS").count().to_dict()
-            keep = [k for k, v in count.items() if k.days_in_month * 24 == v]
-            return ts.resample("MS").sum().filter(items=keep, axis=0)
-        else:
-            return ts.resample("MS").mean()
+    else:
+        resampled = resampled[agg]
+
+    if complete and len(resampled) > 0:
+        # a bin is complete when no value is missing in any column
+        count = resampler.count()
+        if isinstance(count, pd.DataFrame):
+            count = count.min(axis=1)
+        keep = count.to_numpy() == _get_expected_size(resampled.index, rule)
+        resampled = resampled.loc[keep]
+    return resampled
 
 
-def change_time_zone(ts, tz):
+def change_time_zone(ts, tz, validate=True):
     """Convert hourly time series to new time zone. UTC is assumed if no time zone is
     assigned to the input time series.
 
     :param pandas.DataFrame/pands.Series ts: time series.
     :param str tz: new time zone.
+    :param bool validate: check the arguments. Set to False to skip the checks when
+        the arguments are known to be valid.
     :return: (*pandas.DataFrame/pandas.Series*) -- time series with new time zone.
+        The data is not copied, the returned object is a view of ts with a new index.
+        ts itself is not modified.
     :raises TypeError: if tz is not a str.
     :raises ValueError: if tz is invalid or the time series has already been resampled.
     """
-    _check_time_series(ts, "time series")
+    if validate:
+        _check_time_series(ts, "time series")
 
-    if pd.infer_freq(ts.index) != "H":
-        raise ValueError("frequency of time series must be 1h")
+        if _infer_freq(ts.index) != "H":
+            raise ValueError("frequency of time series must be 1h")
 
-    if not isinstance(tz, str):
-        raise TypeError("time zone must be a str")
-    try:
-        pytz.timezone(tz)
-    except pytz.exceptions.UnknownTimeZoneError:
-        raise ValueError("Unknown time zone %s" % tz)
+        if not isinstance(tz, str):
+            raise TypeError("time zone must be a str")
+        try:
+            pytz.timezone(tz)
+        except pytz.exceptions.UnknownTimeZoneError:
+            raise ValueError("Unknown time zone %s" % tz)
 
-    ts.index.name = tz
-    if ts.index.tz is None:
-        return ts.tz_localize("UTC").tz_convert(tz)
-    else:
-        return ts.tz_convert(tz)
+    index = ts.index if ts.index.tz is not None else ts.index.tz_localize("UTC")
+    # shallow copy: the new object has its own index but shares the data of ts
+    converted = ts.copy(deep=False)
+    converted.index = index.tz_convert(tz).rename(tz)
+    return converted
+
+
+@lru_cache(maxsize=None)
+def _get_transitions(tz):
+    """Get the transition table of a time zone.
+
+    :param pytz.tzinfo.DstTzInfo tz: time zone.
+    :return: (*tuple*) -- UTC transition times in microseconds and flag indicating
+        whether DST is observed after each transition, as numpy.ndarray.
+    """
+    times = np.array(tz._utc_transition_times, dtype="datetime64[us]").astype(np.int64)
+    dst = np.array([info[1].total_seconds() != 0 for info in tz._transition_info])
+    return times, dst
+
+
+@lru_cache(maxsize=128)
+def _get_dst_periods(tz, start, end):
+    """Get the DST periods of a time zone within a time span.
+
+    :param pytz.tzinfo.DstTzInfo tz: time zone.
+    :param int start: start of the time span (UTC, in microseconds).
+    :param int end: end of the time span (UTC, in microseconds), inclusive.
+    :return: (*tuple*) -- start (inclusive) and end (exclusive) of each DST period
+        within the time span (UTC, in microseconds).
+    """
+    times, dst = _get_transitions(tz)
+    first = max(np.searchsorted(times, start, side="right") - 1, 0)
+    last = np.searchsorted(times, end, side="right")
+    bounds = np.append(times[first:last], np.iinfo(np.int64).max)
+    bounds[0] = start
+    return tuple(
+        (bounds[i], min(bounds[i + 1], end + 1))
+        for i in np.flatnonzero(dst[first:last])
+    )
 
 
 def is_dst(ts):
@@ -160,8 +473,159 @@ def is_dst(ts):
 
     :param pandas.DataFrame/pands.Series ts: time series.
     :return: (*bool*) -- True if time zone observes DST.
+
+    .. note::
+        For pytz time zones, the DST periods are looked up in the transition table of
+        the time zone over the time span of the series and are cached by time zone and
+        time span. Other time zones are checked timestamp by timestamp.
     """
-    if ts.index.tz is None:
+    tz = ts.index.tz
+    if tz is None or len(ts.index) == 0:
+        return False
+    if isinstance(tz, pytz.tzinfo.DstTzInfo):
+        utc = ts.index.asi8 // 1000
+        if not ts.index.is_monotonic_increasing:
+            utc = np.sort(utc)
+        periods = _get_dst_periods(tz, int(utc[0]), int(utc[-1]))
+        return any(utc[np.searchsorted(utc, start)] < end for start, end in periods)
+    if isinstance(tz, pytz.BaseTzInfo):
         return False
+    return ts.index.map(lambda x: x.dst().total_seconds() != 0).any()
+
+
+def _get_period_codes(index, field):
+    """Get the period of each timestamp.
+
+    :param pandas.DatetimeIndex index: timestamps.
+    :param str field: either *'date'*, *'month'*, *'season'* or *'dayofweek'*.
+    :return: (*tuple*) -- period code of each timestamp as numpy.ndarray and period
+        labels as pandas.Index, in ascending order.
+    :raises ValueError: if field is invalid.
+    """
+    if field == "date":
+        values = index.normalize()
+    elif field in {"month", "dayofweek"}:
+        values = getattr(index, field).to_numpy()
+    elif field == "season":
+        # winter is December, January and February
+        values = index.month.to_numpy() % 12 // 3
     else:
-        return ts.index.map(lambda x: x.dst().total_seconds() != 0).any()
+        raise ValueError("period must be one of 'date', 'month', 'season', 'dayofweek'")
+    codes, labels = pd.factorize(values, sort=True)
+    if field == "season":
+        labels = [_seasons[i] for i in labels]
+    return codes, pd.Index(labels, name=field)
+
+
+def _reduce_by_code(values, codes, size, agg):
+    """Aggregate rows sharing the same code.
+
+    :param numpy.ndarray values: 2-D array of values.
+    :param numpy.ndarray codes: code of each row, in [0, size).
+    :param int size: number of codes.
+    :param list agg: aggregation methods, *'sum'*, *'mean'*, *'min'*, *'max'* or
+        *'count'*. Missing values are ignored.
+    :return: (*dict*) -- keys are aggregation methods, values are 2-D arrays with one
+        row per code. Codes without any row are NaN (0 for *'count'*).
+    """
+    # Rows are sorted by code once so that each code is a contiguous block
+    if (codes[1:] < codes[:-1]).any():
+        order = np.argsort(codes, kind="stable")
+        values, codes = values[order], codes[order]
+    starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+
+    is_valid = ~np.isnan(values)
+    count = np.add.reduceat(is_valid, starts, axis=0, dtype=int)
+
+    def reduce(a):
+        if a == "count":
+            return count
+        if a in {"sum", "mean"}:
+            total = np.add.reduceat(np.where(is_valid, values, 0), starts, axis=0)
+            if a == "sum":
+                return total
+            return np.where(count > 0, total, np.nan) / np.maximum(count, 1)
+        ufunc = {"min": np.fmin, "max": np.fmax}[a]
+        return ufunc.reduceat(values, starts, axis=0)
+
+    result = {}
+    for a in agg:
+        result[a] = np.full((size, values.shape[1]), 0 if a == "count" else np.nan)
+        result[a][codes[starts]] = reduce(a)
+    return result
+
+
+def _check_time_of_use_arguments(ts, period, agg):
+    """Ensure the arguments of :func:`get_time_of_use_cube` are valid.
+
+    :param pandas.DataFrame/pandas.Series ts: time series.
+    :param str/list period: field(s) defining the periods.
+    :param str/list agg: aggregation method(s).
+    :raises TypeError: if period or agg are not a str or a list.
+    :raises ValueError: if period or agg are invalid.
+    """
+    _check_time_series(ts, "time series")
+    if not isinstance(period, (str, list)):
+        raise TypeError("period must be a str or a list")
+    if not isinstance(agg, (str, list)):
+        raise TypeError("agg must be a str or a list")
+    fields = [period] if isinstance(period, str) else period
+    aggs = [agg] if isinstance(agg, str) else agg
+    if not set(fields) <= {"date", "month", "season", "dayofweek"}:
+        raise ValueError("period must be one of 'date', 'month', 'season', 'dayofweek'")
+    if len(fields) == 0 or len(aggs) == 0:
+        raise ValueError("period and agg must not be empty")
+    if not set(aggs) <= {"sum", "mean", "min", "max", "count"}:
+        raise ValueError("agg must be one of 'sum', 'mean', 'min', 'max', 'count'")
+
+
+def get_time_of_use_cube(ts, period="month", agg="mean", time_zone=None, validate=True):
+    """Aggregate a time series by period and hour of the day.
+
+    :param pandas.DataFrame/pandas.Series ts: time series.
+    :param str/list period: field(s) defining the periods. Either *'date'*,
+        *'month'*, *'season'* (winter being December, January and February) or
+        *'dayofweek'* (0 being Monday), or a list of these fields, e.g.
+        ['season', 'dayofweek'].
+    :param str/list agg: aggregation method(s). Either *'sum'*, *'mean'*, *'min'*,
+        *'max'* or *'count'*.
+    :param str time_zone: time zone to convert the time series to before
+        aggregating, see :func:`change_time_zone`. If None, the time zone of the
+        time series is used.
+    :param bool validate: check the arguments. Set to False to skip the checks when
+        the arguments are known to be valid.
+    :return: (*tuple*) -- aggregated values as a numpy.ndarray of shape
+        (period, hour, column) (a dict of arrays keyed by aggregation method if agg
+        is a list), period labels as pandas.Index (pandas.MultiIndex if several
+        fields are given) and column labels as pandas.Index.
+    :raises TypeError: if period or agg are not a str or a list.
+    :raises ValueError: if period or agg are invalid.
+
+    .. note::
+        Hours of periods without data are NaN, except for *'count'*. Missing values
+        are ignored, as in pandas. When several fields are given, periods are all the
+        combinations of the labels found for each field. The hour of the day is the
+        hour of the local time, i.e. the same hour may appear twice in a day (or not
+        at all) when Daylight Saving Time ends (starts).
+    """
+    if validate:
+        _check_time_of_use_arguments(ts, period, agg)
+    fields = [period] if isinstance(period, str) else period
+    aggs = [agg] if isinstance(agg, str) else agg
+    if time_zone is not None:
+        ts = change_time_zone(ts, time_zone, validate=validate)
+
+    df = ts.to_frame() if isinstance(ts, pd.Series) else ts
+    codes, labels = zip(*[_get_period_codes(df.index, f) for f in fields])
+    shape = tuple(len(lab) for lab in labels)
+    period_codes = np.ravel_multi_index(codes, shape) if len(codes) > 1 else codes[0]
+    n_periods = int(np.prod(shape))
+    cubes = _reduce_by_code(
+        df.to_numpy(dtype=float),
+        period_codes * 24 + df.index.hour.to_numpy(),
+        n_periods * 24,
+        aggs,
+    )
+    cubes = {a: c.reshape(n_periods, 24, df.shape[1]) for a, c in cubes.items()}
+    periods = labels[0] if len(labels) == 1 else pd.MultiIndex.from_product(labels)
+    return cubes if isinstance(agg, list) else cubes[agg], periods, df.columns
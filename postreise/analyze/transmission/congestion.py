@@ -3,6 +3,8 @@ import pandas as pd
 from powersimdata.input.helpers import summarize_plant_to_bus
 from powersimdata.scenario.check import _check_scenario_is_in_analyze_state
 
+from postreise.cache import get_bus_demand, get_grid, get_lmp, get_pg
+
 
 def calculate_congestion_surplus(scenario):
     """Calculates hourly congestion surplus.
@@ -12,11 +14,11 @@ def calculate_congestion_surplus(scenario):
     """
     _check_scenario_is_in_analyze_state(scenario)
 
-    grid = scenario.get_grid()
-    lmp = scenario.get_lmp()
-    pg = scenario.get_pg()
+    grid = get_grid(scenario)
+    lmp = get_lmp(scenario)
+    pg = get_pg(scenario)
 
-    bus_demand = scenario.get_bus_demand()
+    bus_demand = get_bus_demand(scenario)
     bus_pg = summarize_plant_to_bus(pg, grid, all_buses=True)
 
     congestion_surplus = (lmp.to_numpy() * (bus_demand - bus_pg)).sum(axis=1)
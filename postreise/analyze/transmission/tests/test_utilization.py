@@ -1,10 +1,13 @@
+import numpy as np
 import pandas as pd
+import pytest
+from numpy.testing import assert_allclose, assert_array_equal
 from pandas.testing import assert_frame_equal
 from powersimdata.input.tests.test_helpers import check_dataframe_matches
 from powersimdata.tests.mock_grid import MockGrid
 
 from postreise.analyze.transmission.utilization import (
-    _count_hours_gt_threshold,
+    _sweep_utilization,
     generate_cong_stats,
     get_utilization,
 )
@@ -45,12 +48,14 @@ def test_get_utilization_median():
     )
 
 
-def test_count_hours_gt_threshold():
-    threshold = 0.25
-    expected = pd.Series(data=[3, 3], index=[101, 102])
-
-    utilization = get_utilization(mock_grid.branch, mock_pf)
-    assert _count_hours_gt_threshold(utilization, threshold).equals(expected)
+def test_get_utilization_dtype():
+    for median in (False, True):
+        expected = get_utilization(mock_grid.branch, mock_pf, median=median)
+        utilization = get_utilization(
+            mock_grid.branch, mock_pf, median=median, dtype="float32"
+        )
+        assert (utilization.dtypes == np.float32).all()
+        assert_allclose(utilization.to_numpy(), expected.to_numpy(), rtol=1e-6)
 
 
 def test_generate_cong_stats():
@@ -79,3 +84,50 @@ def test_generate_cong_stats():
         mock_pf, mock_grid.branch, util=util, threshold=threshold
     )
     assert_frame_equal(expected, statistics.drop("dist", axis=1))
+
+
+def test_generate_cong_stats_argument_value():
+    with pytest.raises(ValueError):
+        generate_cong_stats(mock_pf, mock_grid.branch, util=[0.5, 0.75], threshold=[1])
+    with pytest.raises(ValueError):
+        generate_cong_stats(mock_pf, mock_grid.branch, util=[], threshold=[])
+
+
+def test_generate_cong_stats_levels():
+    n = len(mock_pf)
+    statistics = generate_cong_stats(
+        mock_pf, mock_grid.branch, util=[0.3, 0.5, 0.75, 0.85], threshold=[0.5] * 4
+    )
+    assert_array_equal(
+        statistics[[f"per_util{i}" for i in range(1, 5)]],
+        [[3 / n, 2 / n, 1 / n, 1 / n], [3 / n, 3 / n, 2 / n, 1 / n]],
+    )
+    assert_array_equal(statistics["sumflag"], [2, 3])
+    assert_array_equal(statistics["risk"], [-6.0, 23.0])
+
+    statistics = generate_cong_stats(
+        mock_pf, mock_grid.branch, util=[0.5], threshold=[0.5]
+    )
+    assert_array_equal(statistics["per_util1"], [2 / n, 3 / n])
+    assert_array_equal(statistics["risk"], [-6.0, 23.0])
+    assert "per_util2" not in statistics.columns
+
+
+def test_generate_cong_stats_removes_lines_below_75_percent():
+    # peak utilization of branch 101 is 0.9 * 0.8 = 0.72
+    pf = mock_pf.copy()
+    pf[101] *= 0.8
+    statistics = generate_cong_stats(
+        pf, mock_grid.branch, util=[0.5, 0.8, 0.9], threshold=[0.5, 0.2, 0.05]
+    )
+    assert_array_equal(statistics.index, [102])
+
+
+def test_sweep_utilization_chunks():
+    values = mock_pf.to_numpy()
+    rate = mock_grid.branch.rateA.to_numpy(dtype=float)
+    expected = _sweep_utilization(values, rate, [0.5, 0.75], 0.75)
+    for actual, e in zip(
+        _sweep_utilization(values, rate, [0.5, 0.75], 0.75, 1), expected
+    ):
+        assert_array_equal(actual, e)
@@ -2,31 +2,26 @@ import numpy as np
 import pandas as pd
 from powersimdata.utility.distance import great_circle_distance
 
+from postreise.precision import get_dtype
 
-def get_utilization(branch, pf, median=False):
+
+def get_utilization(branch, pf, median=False, dtype=None):
     """Generate utilization table to be used as input for congestion analyses.
 
     :param pandas.DataFrame branch: branch data frame.
     :param pandas.DataFrame pf: power flow data frame.
     :param boolean median: take medians of pf for utilization calculation
+    :param str/type/numpy.dtype dtype: floating point type of the utilization. If
+        None, the package-level precision is used, see
+        :func:`postreise.precision.set_precision`.
     :return: (*pandas.DataFrame*) -- power flow data frame (per-unit).
     """
-    pf = pf.abs()
+    dtype = get_dtype(dtype)
+    pf = pf.astype(dtype, copy=False).abs()
     if median:
-        pf = pd.DataFrame(pf.median()).T
-
-    return pf.divide(branch.rateA).replace(np.inf, 0)
+        pf = pd.DataFrame(pf.median()).T.astype(dtype, copy=False)
 
-
-def _count_hours_gt_threshold(utilization, threshold):
-    """Calculate number of hours above a given utilization threshold.
-
-    :param pandas.DataFrame utilization: normalized power flow data frame as returned
-        by :func:`get_utilization`.
-    :param float threshold: utilization threshold ([0,1]).
-    :return: (*pandas.Series*) -- number of hours above utilization threshold.
-    """
-    return (utilization > threshold).sum()
+    return pf.divide(branch.rateA.astype(dtype)).replace(np.inf, 0)
 
 
 def _flag(statistics, utilname, threshold, uflagname):
@@ -42,7 +37,42 @@ def _flag(statistics, utilname, threshold, uflagname):
     return (statistics[utilname] >= threshold).astype(int).rename(uflagname)
 
 
-def generate_cong_stats(pf, branch, util=None, threshold=None):
+def _sweep_utilization(pf, rate, util, risk_util, chunk_size=256):
+    """Calculate utilization statistics of branches in one pass over blocks of
+    columns of the power flow data.
+
+    :param numpy.ndarray pf: power flow (hour, branch).
+    :param numpy.ndarray rate: capacity of the branches.
+    :param list util: utilization levels.
+    :param float risk_util: utilization level above which flows are summed.
+    :param int chunk_size: number of branches processed at once.
+    :return: (*tuple*) -- peak utilization, number of hours above each utilization
+        level (level, branch), number of binding hours and risk of each branch.
+    """
+    n_branch = pf.shape[1]
+    peak = np.zeros(n_branch)
+    counts = np.zeros((len(util), n_branch), dtype=np.int64)
+    bind = np.zeros(n_branch, dtype=np.int64)
+    risk = np.zeros(n_branch)
+    for start in range(0, n_branch, chunk_size):
+        columns = slice(start, start + chunk_size)
+        flow = pf[:, columns]
+        utilization = np.abs(flow, dtype=float)
+        peak[columns] = utilization.max(axis=0, initial=0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            utilization /= rate[columns]
+        utilization[np.isinf(utilization)] = 0
+        for i, u in enumerate(util):
+            counts[i, columns] = np.count_nonzero(utilization > u, axis=0)
+        bind[columns] = np.count_nonzero(utilization >= 1, axis=0)
+        risk[columns] = np.where(utilization > risk_util, flow, 0).sum(axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        peak /= rate
+    peak[np.isinf(peak)] = 0
+    return peak, counts, bind, risk
+
+
+def generate_cong_stats(pf, branch, util=None, threshold=None, risk_util=None):
     """Generate congestion/utilization statistics from powerflow data (WECC congestion
     reports' analyses are the inspiration for these analyses and are the source of the
     default parameters). The report is available `here
@@ -50,81 +80,67 @@ def generate_cong_stats(pf, branch, util=None, threshold=None):
 
     :param pandas.DataFrame pf: power flow data frame
     :param pandas.DataFrame branch: branch data frame
-    :param list util: utilization (float) flag level 1, 2, 3. Default values are values
+    :param list util: utilization (float) flag levels. Default values are values
         used by WECC: 0.75, 0.9, 99.
-    :param list threshold: threshold for proportion time, for flag level 1, 2, 3.
+    :param list threshold: threshold for proportion time, one for each flag level.
         Default values are values used by WECC: 0.5, 0.2, 0.05.
+    :param float risk_util: utilization above which power flows are summed in
+        *'risk'*. Default to the second utilization level (the first one if a single
+        level is given).
     :return: (*pandas.DataFrame*) -- congestion statistics.
-        *'per_util1'*, *'per_util2'*, *'per_util3'*, *'u1flag'*, *'u2flag'*,
-        *'u3flag'*, *'sumflag'*, *'bind'*, *'risk'*.
+        *'per_util1'*, ..., *'per_utilN'*, *'bind'*, *'risk'*, *'uflag1'*, ...,
+        *'uflagN'*, *'sumflag'*, *'dist'* where N is the number of utilization levels.
+    :raises ValueError: if ``util`` and ``threshold`` have different lengths or are
+        empty.
     """
 
     if util is None:
         util = [0.75, 0.9, 0.99]
     if threshold is None:
         threshold = [0.5, 0.2, 0.05]
+    if len(util) == 0 or len(util) != len(threshold):
+        raise ValueError("util and threshold must be non-empty and of same length")
+    if risk_util is None:
+        risk_util = util[1] if len(util) > 1 else util[0]
+
     print("Removing non line branches")
     branch = branch[branch.branch_device_type == "Line"]
-    pf = pf.loc[:, branch.index]
+    position = pf.columns.get_indexer(branch.index)
+    if (position < 0).any():
+        raise KeyError("power flow is missing for some lines")
+    values = pf.to_numpy()
+    if not np.array_equal(position, np.arange(len(pf.columns))):
+        values = values[:, position]
+
+    print("Calculating utilization statistics")
+    n_hours = len(pf)
+    peak, counts, bind, risk = _sweep_utilization(
+        values, branch.rateA.to_numpy(dtype=float), util, risk_util
+    )
 
     print("Removing lines that never are >75% utilized")
-    pf = pf.loc[:, pf.abs().max().divide(branch.rateA).replace(np.inf, 0) > 0.75]
-    branch = branch.loc[pf.columns, :]
-
-    print("Getting utilization")
-    utilization_df = get_utilization(branch, pf)
-
-    print("Counting hours")
-    n_hours = len(utilization_df)
-
-    print("Getting fraction of hours above threshold")
-    per_util1 = _count_hours_gt_threshold(utilization_df, util[0]) / n_hours
-    per_util2 = _count_hours_gt_threshold(utilization_df, util[1]) / n_hours
-    per_util3 = _count_hours_gt_threshold(utilization_df, util[2]) / n_hours
-
-    print("Calculating binding hours")
-    bind = (utilization_df >= 1).sum()
-
-    print("Calculating risk")
-    risk = (pf[utilization_df > util[1]].sum()).fillna(0)
+    keep = peak > 0.75
+    branch = branch.loc[keep]
 
     print("Combining branch and utilization info")
-    statistics = pd.concat(
-        [
-            branch["rateA"],
-            branch["branch_device_type"],
-            per_util1,
-            per_util2,
-            per_util3,
-            bind,
-            risk,
-        ],
-        axis=1,
+    statistics = pd.DataFrame(
+        {
+            "capacity": branch["rateA"],
+            "branch_device_type": branch["branch_device_type"],
+            **{f"per_util{i + 1}": c[keep] / n_hours for i, c in enumerate(counts)},
+            "bind": bind[keep],
+            "risk": risk[keep],
+        },
+        index=branch.index,
     )
+    statistics.loc[statistics.capacity == 0, ["capacity"]] = np.nan
 
-    statistics.loc[statistics.rateA == 0, ["rateA"]] = np.nan
-    statistics.columns = [
-        "capacity",
-        "branch_device_type",
-        "per_util1",
-        "per_util2",
-        "per_util3",
-        "bind",
-        "risk",
-    ]
-
-    vals = [
-        ["per_util1", threshold[0], "uflag1"],
-        ["per_util2", threshold[1], "uflag2"],
-        ["per_util3", threshold[2], "uflag3"],
-    ]
-
-    for x in vals:
-        statistics = pd.concat(
-            [statistics, _flag(statistics, x[0], x[1], x[2])], axis=1
+    for i, t in enumerate(threshold):
+        statistics[f"uflag{i + 1}"] = _flag(
+            statistics, f"per_util{i + 1}", t, f"uflag{i + 1}"
         )
 
-    col_list = ["uflag1", "uflag2", "uflag3"]
+    col_list = [f"uflag{i + 1}" for i in range(len(threshold))]
     statistics["sumflag"] = statistics[col_list].sum(axis=1)
 
     print("Calculating distance and finalizing results")
@@ -0,0 +1,119 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+from powersimdata.input.check import _check_time_series
+
+
+def _get_paths(path):
+    """Get the paths of the files of an array source.
+
+    :param str path: path to the source, with or without the *.npy* extension.
+    :return: (*tuple*) -- path to the array and path to the metadata.
+    """
+    path = path[:-4] if path.endswith(".npy") else path
+    return f"{path}.npy", f"{path}.meta.npz"
+
+
+def save_array_source(ts, path):
+    """Save a time series as an array source that can be memory-mapped, see
+    :class:`ArraySource`.
+
+    :param pandas.DataFrame ts: time series, e.g. PG, PF or LMP.
+    :param str path: path to the source. The values are written to *<path>.npy* and
+        the timestamps and columns to *<path>.meta.npz*. Columns that are neither
+        numbers nor dates are stored as str.
+    :raises TypeError: if ``ts`` is not a data frame or ``path`` is not a str.
+    :raises ValueError: if ``ts`` is not a time series with numeric values.
+
+    .. note::
+        Values are written column by column (Fortran order) so that reading a subset
+        of the columns only touches the pages of these columns.
+    """
+    if not isinstance(ts, pd.DataFrame):
+        raise TypeError("time series must be a pandas.DataFrame")
+    if not isinstance(path, str):
+        raise TypeError("path must be a str")
+    _check_time_series(ts, "time series")
+    values = ts.to_numpy()
+    if not np.issubdtype(values.dtype, np.number):
+        raise ValueError("time series must have numeric values")
+    data_path, meta_path = _get_paths(path)
+    np.save(data_path, np.asfortranarray(values))
+    attrs = {
+        "tz": None if ts.index.tz is None else str(ts.index.tz),
+        "index_name": ts.index.name,
+        "columns_name": ts.columns.name,
+    }
+    columns = ts.columns.to_numpy()
+    if columns.dtype == object:
+        # object arrays cannot be loaded without pickle
+        columns = columns.astype(str)
+    np.savez(
+        meta_path,
+        index=ts.index.asi8,
+        columns=columns,
+        attrs=np.array(json.dumps(attrs)),
+    )
+
+
+class ArraySource:
+    """Time series backed by a memory-mapped array. The values are read from disk
+    on access only and the pages read are shared, through the page cache of the
+    operating system, by all the processes opening the same source.
+
+    :param str path: path to a source written by :func:`save_array_source`.
+    :raises FileNotFoundError: if the files of the source do not exist.
+
+    .. note::
+        Data frames returned by the instance are read-only views of the array and
+        must not be modified in place.
+    """
+
+    def __init__(self, path):
+        """Constructor."""
+        data_path, meta_path = _get_paths(path)
+        for p in (data_path, meta_path):
+            if not os.path.isfile(p):
+                raise FileNotFoundError(f"{p} does not exist")
+        self.path = data_path
+        self.data = np.load(data_path, mmap_mode="r")
+        with np.load(meta_path, allow_pickle=False) as meta:
+            attrs = json.loads(meta["attrs"].item())
+            index = pd.DatetimeIndex(meta["index"], name=attrs["index_name"])
+            if attrs["tz"] is not None:
+                # timestamps of time zone aware series are stored in UTC
+                index = index.tz_localize("UTC").tz_convert(attrs["tz"])
+            self.index = index
+            self.columns = pd.Index(meta["columns"], name=attrs["columns_name"])
+        self._frame = None
+
+    @property
+    def shape(self):
+        """Shape of the time series.
+
+        :return: (*tuple*) -- number of timestamps and number of columns.
+        """
+        return self.data.shape
+
+    def to_frame(self, columns=None):
+        """Get the time series as a data frame.
+
+        :param iterable columns: columns to read. If None, a data frame backed by
+            the memory-mapped array is returned and no value is read until used.
+        :return: (*pandas.DataFrame*) -- time series.
+        :raises KeyError: if some columns are not in the source.
+        """
+        if columns is None:
+            if self._frame is None:
+                self._frame = pd.DataFrame(
+                    self.data, index=self.index, columns=self.columns, copy=False
+                )
+            return self._frame
+        columns = pd.Index(columns, name=self.columns.name)
+        position = self.columns.get_indexer(columns)
+        if (position < 0).any():
+            missing = columns[position < 0]
+            raise KeyError(f"columns not in source: {missing[:5].tolist()}")
+        return pd.DataFrame(self.data[:, position], index=self.index, columns=columns)
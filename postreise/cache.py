@@ -0,0 +1,463 @@
+import sys
+import threading
+import weakref
+from collections import OrderedDict
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+from postreise.array_source import ArraySource
+from postreise.grid_index import GridIndex
+
+
+class ScenarioCache:
+    """Size-bounded cache of scenario data and of products derived from them. Entries
+    are keyed by scenario instance and are evicted in least recently used order when
+    the total size of the cache exceeds ``max_bytes``. Entries of a scenario are
+    discarded when the scenario instance is garbage collected.
+
+    :param int max_bytes: maximum size of the cache in bytes.
+
+    .. note::
+        Cached objects are shared between callers and must not be modified in place.
+    """
+
+    def __init__(self, max_bytes=2 * 1024**3):
+        """Constructor."""
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.nbytes = 0
+        self._entries = OrderedDict()
+        self._scenarios = {}
+        self._pinned = {}
+        self._lock = threading.RLock()
+
+    def get(self, scenario, key, func):
+        """Get a cached object, calculating and storing it on a miss.
+
+        :param powersimdata.scenario.scenario.Scenario scenario: scenario instance.
+        :param tuple/str key: identifier of the object for the scenario.
+        :param callable func: function with no argument returning the object.
+        :return: (*object*) -- the cached object.
+        """
+        scenario_key = self._register(scenario)
+        if scenario_key is None:
+            with self._lock:
+                self.misses += 1
+            return func()
+
+        entry_key = (scenario_key, key)
+        with self._lock:
+            if entry_key in self._entries:
+                self.hits += 1
+                self._entries.move_to_end(entry_key)
+                return self._entries[entry_key][0]
+            self.misses += 1
+
+        value = func()
+        nbytes = _get_size(value)
+        with self._lock:
+            is_pinned = scenario_key in self._pinned
+            if entry_key not in self._entries and (
+                nbytes <= self.max_bytes or is_pinned
+            ):
+                self._entries[entry_key] = (value, nbytes)
+                self.nbytes += nbytes
+                self._evict()
+        return value
+
+    @contextmanager
+    def pin(self, scenario):
+        """Keep the entries of a scenario in the cache while the context is active.
+        Entries of a pinned scenario are never evicted and are stored even when they
+        are larger than the cache. Least recently used entries are evicted once the
+        scenario is unpinned if the cache exceeds its limit.
+
+        :param powersimdata.scenario.scenario.Scenario scenario: scenario instance.
+        """
+        scenario_key = self._register(scenario)
+        if scenario_key is None:
+            yield
+            return
+        with self._lock:
+            self._pinned[scenario_key] = self._pinned.get(scenario_key, 0) + 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._pinned[scenario_key] -= 1
+                if self._pinned[scenario_key] == 0:
+                    del self._pinned[scenario_key]
+                self._evict()
+
+    def resize(self, max_bytes):
+        """Change the maximum size of the cache, evicting entries if necessary.
+
+        :param int max_bytes: maximum size of the cache in bytes.
+        :raises TypeError: if ``max_bytes`` is not an int.
+        :raises ValueError: if ``max_bytes`` is negative.
+        """
+        if not isinstance(max_bytes, int):
+            raise TypeError("max_bytes must be an int")
+        if max_bytes < 0:
+            raise ValueError("max_bytes must be positive")
+        with self._lock:
+            self.max_bytes = max_bytes
+            self._evict()
+
+    def clear(self, scenario=None):
+        """Remove entries from the cache. Counters are reset if all entries are
+        removed.
+
+        :param powersimdata.scenario.scenario.Scenario scenario: scenario instance
+            whose entries are removed. If None, the whole cache is cleared.
+        """
+        with self._lock:
+            if scenario is None:
+                self._entries.clear()
+                self.hits = self.misses = self.evictions = self.nbytes = 0
+            else:
+                self._discard(id(scenario))
+
+    def get_stats(self):
+        """Get usage statistics of the cache.
+
+        :return: (*dict*) -- number of hits, misses and evictions, number of entries,
+            total size of the cache and maximum size of the cache in bytes.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self.nbytes,
+                "max_bytes": self.max_bytes,
+            }
+
+    def _register(self, scenario):
+        """Track a scenario instance so that its entries are discarded once it is
+        garbage collected.
+
+        :param powersimdata.scenario.scenario.Scenario scenario: scenario instance.
+        :return: (*int*) -- key of the scenario in the cache, None if the scenario
+            cannot be tracked.
+        """
+        scenario_key = id(scenario)
+        with self._lock:
+            if scenario_key not in self._scenarios:
+                try:
+                    self._scenarios[scenario_key] = weakref.finalize(
+                        scenario, self._forget, scenario_key
+                    )
+                except TypeError:
+                    return None
+        return scenario_key
+
+    def _forget(self, scenario_key):
+        """Discard the entries of a scenario that has been garbage collected.
+
+        :param int scenario_key: key of the scenario in the cache.
+        """
+        with self._lock:
+            self._scenarios.pop(scenario_key, None)
+            self._discard(scenario_key)
+
+    def _discard(self, scenario_key):
+        """Remove all entries of a scenario.
+
+        :param int scenario_key: key of the scenario in the cache.
+        """
+        for entry_key in [k for k in self._entries if k[0] == scenario_key]:
+            self.nbytes -= self._entries.pop(entry_key)[1]
+
+    def _evict(self):
+        """Remove least recently used entries of scenarios that are not pinned until
+        the cache fits in its limit.
+        """
+        for entry_key in list(self._entries):
+            if self.nbytes <= self.max_bytes:
+                break
+            if entry_key[0] in self._pinned:
+                continue
+            self.nbytes -= self._entries.pop(entry_key)[1]
+            self.evictions += 1
+
+
+def _get_size(obj, depth=2):
+    """Estimate the memory footprint of an object.
+
+    :param object obj: object to measure.
+    :param int depth: how deep containers and object attributes are inspected.
+    :return: (*int*) -- size in bytes.
+    """
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(index=True).sum())
+    if isinstance(obj, (pd.Series, pd.Index)):
+        return int(obj.memory_usage())
+    if isinstance(obj, np.ndarray):
+        return obj.nbytes
+    if isinstance(obj, GridIndex):
+        # the grid is accounted for in its own entry
+        return sys.getsizeof(obj)
+    size = sys.getsizeof(obj)
+    if depth == 0:
+        return size
+    if isinstance(obj, dict):
+        return size + sum(_get_size(v, depth - 1) for v in obj.values())
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        return size + sum(_get_size(v, depth - 1) for v in obj)
+    if hasattr(obj, "__dict__"):
+        return size + sum(_get_size(v, depth - 1) for v in vars(obj).values())
+    return size
+
+
+_cache = ScenarioCache()
+
+
+def memoize(scenario, key, func):
+    """Get an object derived from a scenario from the cache, calculating it on a miss.
+
+    :param powersimdata.scenario.scenario.Scenario scenario: scenario instance.
+    :param tuple/str key: identifier of the object for the scenario.
+    :param callable func: function with no argument returning the object.
+    :return: (*object*) -- the cached object.
+    """
+    return _cache.get(scenario, key, func)
+
+
+def get_cache_stats():
+    """Get usage statistics of the scenario cache.
+
+    :return: (*dict*) -- see :meth:`ScenarioCache.get_stats`.
+    """
+    return _cache.get_stats()
+
+
+def pin_scenario(scenario):
+    """Keep the entries of a scenario in the scenario cache while the context is
+    active, see :meth:`ScenarioCache.pin`.
+
+    :param powersimdata.scenario.scenario.Scenario scenario: scenario instance.
+    :return: (*contextlib.AbstractContextManager*) -- context pinning the scenario.
+    """
+    return _cache.pin(scenario)
+
+
+def set_cache_size(max_bytes):
+    """Set the maximum size of the scenario cache.
+
+    :param int max_bytes: maximum size of the cache in bytes.
+    """
+    _cache.resize(max_bytes)
+
+
+def clear_cache(scenario=None):
+    """Clear the scenario cache.
+
+    :param powersimdata.scenario.scenario.Scenario scenario: scenario instance whose
+        entries are removed. If None, the whole cache is cleared.
+    """
+    _cache.clear(scenario)
+
+
+_array_source_names = {"pg", "pf", "dcline_pf", "lmp", "storage_pg", "storage_e"}
+_array_sources = {}
+
+
+def set_array_source(scenario, name, source):
+    """Read a time series of a scenario from a memory-mapped array source instead of
+    loading it in memory. Entries of the scenario in the cache are cleared.
+
+    :param powersimdata.scenario.scenario.Scenario scenario: scenario instance.
+    :param str name: one of *'pg'*, *'pf'*, *'dcline_pf'*, *'lmp'*, *'storage_pg'*
+        or *'storage_e'*.
+    :param str/postreise.array_source.ArraySource source: array source or path to
+        an array source, see :func:`postreise.array_source.save_array_source`. If
+        None, the time series is loaded from the scenario again.
+    :raises ValueError: if ``name`` is unknown.
+    :raises TypeError: if ``source`` is not None, a str or an array source.
+    """
+    if name not in _array_source_names:
+        raise ValueError(
+            f"name must be one of: {', '.join(sorted(_array_source_names))}"
+        )
+    if isinstance(source, str):
+        source = ArraySource(source)
+    if source is not None and not isinstance(source, ArraySource):
+        raise TypeError("source must be a str or an ArraySource")
+
+    scenario_key = id(scenario)
+    if scenario_key not in _array_sources:
+        _array_sources[scenario_key] = {}
+        weakref.finalize(scenario, _array_sources.pop, scenario_key, None)
+    if source is None:
+        _array_sources[scenario_key].pop(name, None)
+    else:
+        _array_sources[scenario_key][name] = source
+    _cache.clear(scenario)
+
+
+def _get_output(scenario, name, func):
+    """Get a time series of a scenario from its array source if any, from the cache
+    otherwise.
+
+    :param powersimdata.scenario.scenario.Scenario scenario: scenario instance.
+    :param str name: name of the time series.
+    :param callable func: function with no argument loading the time series.
+    :return: (*pandas.DataFrame*) -- time series.
+    """
+    source = _array_sources.get(id(scenario), {}).get(name)
+    if source is not None:
+        return source.to_frame()
+    return memoize(scenario, name, func)
+
+
+def get_grid(scenario):
+    """Get the grid of a scenario.
+
+    :param powersimdata.scenario.scenario.Scenario scenario: scenario instance.
+    :return: (*powersimdata.input.grid.Grid*) -- grid instance.
+    """
+    return memoize(scenario, "grid", scenario.get_grid)
+
+
+def get_pg(scenario):
+    """Get the PG data frame of a scenario.
+
+    :param powersimdata.scenario.scenario.Scenario scenario: scenario instance.
+    :return: (*pandas.DataFrame*) -- data frame of power generated.
+    """
+    return _get_output(scenario, "pg", scenario.get_pg)
+
+
+def get_pf(scenario):
+    """Get the PF data frame of a scenario.
+
+    :param powersimdata.scenario.scenario.Scenario scenario: scenario instance.
+    :return: (*pandas.DataFrame*) -- data frame of power flow.
+    """
+    return _get_output(scenario, "pf", scenario.get_pf)
+
+
+def get_dcline_pf(scenario):
+    """Get the PF_DCLINE data frame of a scenario.
+
+    :param powersimdata.scenario.scenario.Scenario scenario: scenario instance.
+    :return: (*pandas.DataFrame*) -- data frame of power flow on DC line(s).
+    """
+    return _get_output(scenario, "dcline_pf", scenario.get_dcline_pf)
+
+
+def get_lmp(scenario):
+    """Get the LMP data frame of a scenario.
+
+    :param powersimdata.scenario.scenario.Scenario scenario: scenario instance.
+    :return: (*pandas.DataFrame*) -- data frame of locational marginal price.
+    """
+    return _get_output(scenario, "lmp", scenario.get_lmp)
+
+
+def get_storage_pg(scenario):
+    """Get the STORAGE_PG data frame of a scenario.
+
+    :param powersimdata.scenario.scenario.Scenario scenario: scenario instance.
+    :return: (*pandas.DataFrame*) -- data frame of power generated by storage units.
+    """
+    return _get_output(scenario, "storage_pg", scenario.get_storage_pg)
+
+
+def get_storage_e(scenario):
+    """Get the STORAGE_E data frame of a scenario.
+
+    :param powersimdata.scenario.scenario.Scenario scenario: scenario instance.
+    :return: (*pandas.DataFrame*) -- data frame of energy state of storage units.
+    """
+    return _get_output(scenario, "storage_e", scenario.get_storage_e)
+
+
+def get_demand(scenario):
+    """Get the original demand profile of a scenario.
+
+    :param powersimdata.scenario.scenario.Scenario scenario: scenario instance.
+    :return: (*pandas.DataFrame*) -- data frame of demand (hour, zone).
+    """
+    return memoize(scenario, "demand", scenario.get_demand)
+
+
+def get_bus_demand(scenario):
+    """Get the demand profile of each bus in a scenario.
+
+    :param powersimdata.scenario.scenario.Scenario scenario: scenario instance.
+    :return: (*pandas.DataFrame*) -- data frame of demand (hour, bus).
+    """
+    return memoize(scenario, "bus_demand", scenario.get_bus_demand)
+
+
+def get_solar(scenario):
+    """Get the solar profile of a scenario.
+
+    :param powersimdata.scenario.scenario.Scenario scenario: scenario instance.
+    :return: (*pandas.DataFrame*) -- data frame of solar energy output.
+    """
+    return memoize(scenario, "solar", scenario.get_solar)
+
+
+def get_wind(scenario):
+    """Get the wind profile of a scenario.
+
+    :param powersimdata.scenario.scenario.Scenario scenario: scenario instance.
+    :return: (*pandas.DataFrame*) -- data frame of wind energy output.
+    """
+    return memoize(scenario, "wind", scenario.get_wind)
+
+
+def get_grid_index(scenario):
+    """Get the index of the grid of a scenario.
+
+    :param powersimdata.scenario.scenario.Scenario scenario: scenario instance.
+    :return: (*postreise.grid_index.GridIndex*) -- index of the grid.
+    """
+    return memoize(scenario, "grid_index", lambda: GridIndex(get_grid(scenario)))
+
+
+def get_plant_id_for_resources_in_area(scenario, area, resources, area_type=None):
+    """Get the list of plant ids of certain resources in the specific area of a
+    scenario.
+
+    :param powersimdata.scenario.scenario.Scenario scenario: scenario instance
+    :param str area: one of *loadzone*, *state*, *state abbreviation*,
+        *interconnect*, *'all'*
+    :param str/list resources: one or a list of resources
+    :param str area_type: one of *'loadzone'*, *'state'*, *'state_abbr'*,
+        *'interconnect'*
+    :return: (*list*) -- list of plant id
+    """
+    return get_grid_index(scenario).get_plant_id(area, resources, area_type=area_type)
+
+
+def get_storage_id_in_area(scenario, area, area_type=None):
+    """Get the list of storage ids in the specific area of a scenario
+
+    :param powersimdata.scenario.scenario.Scenario scenario: scenario instance
+    :param str area: one of *loadzone*, *state*, *state abbreviation*,
+        *interconnect*, *'all'*
+    :param str area_type: one of *'loadzone'*, *'state'*, *'state_abbr'*,
+        *'interconnect'*
+    :return: (*list*) -- list of storage id
+    """
+    return get_grid_index(scenario).get_storage_id(area, area_type=area_type)
+
+
+def get_plant_groups(scenario, column):
+    """Get the plant ids grouped by the values of a column of the plant table.
+
+    :param powersimdata.scenario.scenario.Scenario scenario: scenario instance.
+    :param str column: column of the plant table, e.g. *'type'* or *'zone_id'*.
+    :return: (*dict*) -- keys are the values of the column, values are plant ids as
+        a pandas.Index.
+    """
+    return get_grid_index(scenario).get_plant_groups(column)
@@ -0,0 +1,208 @@
+import numpy as np
+import pandas as pd
+
+
+class GridIndex:
+    """Positional lookups into the tables of a grid. Lookups are built on first use and
+    kept for the lifetime of the instance, so that selecting plants by resource and
+    area, grouping plants or locating the buses of plants and lines do not filter the
+    tables of the grid again.
+
+    :param powersimdata.input.grid.Grid grid: grid instance.
+
+    .. note::
+        The grid must not be modified once the index is built. Positions are row
+        positions in the tables of the grid, i.e. they can be used with
+        ``DataFrame.iloc`` or to index the arrays of the columns.
+    """
+
+    def __init__(self, grid):
+        """Constructor."""
+        self.grid = grid
+        self._lookups = {}
+
+    def _get(self, key, func):
+        """Get a lookup, building it on first access.
+
+        :param tuple/str key: identifier of the lookup.
+        :param callable func: function with no argument building the lookup.
+        :return: (*object*) -- the lookup.
+        """
+        if key not in self._lookups:
+            self._lookups[key] = func()
+        return self._lookups[key]
+
+    def get_plant_positions_by(self, column):
+        """Get the positions of the plants sharing the same value in a column of the
+        plant table.
+
+        :param str column: column of the plant table.
+        :return: (*dict*) -- keys are the values of the column, values are sorted
+            positions of the plants as numpy.ndarray.
+        """
+        return self._get(
+            ("plant_positions", column),
+            lambda: _get_positions_by_value(self.grid.plant[column]),
+        )
+
+    def get_plant_groups(self, column):
+        """Get the plant ids grouped by the values of a column of the plant table.
+
+        :param str column: column of the plant table, e.g. *'type'* or *'zone_id'*.
+        :return: (*dict*) -- keys are the values of the column, values are plant ids
+            as a pandas.Index.
+        """
+        return self._get(
+            ("plant_groups", column),
+            lambda: {
+                k: self.grid.plant.index[v]
+                for k, v in sorted(self.get_plant_positions_by(column).items())
+            },
+        )
+
+    def get_loadzones(self, area, area_type=None):
+        """Get the load zones of an area.
+
+        :param str area: one of *loadzone*, *state*, *state abbreviation*,
+            *interconnect*, *'all'*.
+        :param str area_type: one of *'loadzone'*, *'state'*, *'state_abbr'*,
+            *'interconnect'*.
+        :return: (*set*) -- load zone names.
+        """
+        return self._get(
+            ("loadzones", area, area_type),
+            lambda: self.grid.model_immutables.area_to_loadzone(
+                area, area_type=area_type
+            ),
+        )
+
+    def get_plant_positions(self, area=None, resources=None, area_type=None):
+        """Get the positions of the plants fueled by resource(s) in an area.
+
+        :param str area: one of *loadzone*, *state*, *state abbreviation*,
+            *interconnect*, *'all'*. If None, plants are not filtered by area.
+        :param str/list/set resources: one or several resources. If None, plants are
+            not filtered by resource.
+        :param str area_type: one of *'loadzone'*, *'state'*, *'state_abbr'*,
+            *'interconnect'*.
+        :return: (*numpy.ndarray*) -- sorted positions of the plants.
+        """
+        mask = np.ones(len(self.grid.plant), dtype=bool)
+        if resources is not None:
+            resources = {resources} if isinstance(resources, str) else set(resources)
+            mask &= self._get_plant_mask(self.get_plant_positions_by("type"), resources)
+        if area is not None:
+            loadzones = self.get_loadzones(area, area_type=area_type)
+            mask &= self._get_plant_mask(
+                self.get_plant_positions_by("zone_name"), loadzones
+            )
+        return np.flatnonzero(mask)
+
+    def get_plant_id(self, area=None, resources=None, area_type=None):
+        """Get the ids of the plants fueled by resource(s) in an area.
+
+        :param str area: see :meth:`get_plant_positions`.
+        :param str/list/set resources: see :meth:`get_plant_positions`.
+        :param str area_type: see :meth:`get_plant_positions`.
+        :return: (*list*) -- plant ids in the order of the plant table.
+        """
+        positions = self.get_plant_positions(area, resources, area_type=area_type)
+        return self.grid.plant.index[positions].tolist()
+
+    def get_storage_id(self, area, area_type=None):
+        """Get the ids of the storage units in an area.
+
+        :param str area: see :meth:`get_plant_positions`.
+        :param str area_type: see :meth:`get_plant_positions`.
+        :return: (*list*) -- storage ids in the order of the storage table.
+        """
+        zone2id = self.grid.zone2id
+        zone_id = {
+            zone2id[lz] for lz in self.get_loadzones(area, area_type) if lz in zone2id
+        }
+        storage_zone_id = self._get(
+            "storage_zone_id",
+            lambda: self.grid.bus["zone_id"].to_numpy()[
+                self.get_bus_position(self.grid.storage["gen"]["bus_id"])
+            ],
+        )
+        gen = self.grid.storage["gen"]
+        return gen.index[np.isin(storage_zone_id, list(zone_id))].tolist()
+
+    def get_bus_position(self, bus_id):
+        """Get the positions of buses in the bus table.
+
+        :param iterable bus_id: bus ids.
+        :return: (*numpy.ndarray*) -- positions of the buses.
+        :raises KeyError: if some buses are not in the bus table.
+        """
+        bus_index = self._get("bus_index", lambda: pd.Index(self.grid.bus.index))
+        position = bus_index.get_indexer(bus_id)
+        if (position < 0).any():
+            missing = np.asarray(bus_id)[position < 0]
+            raise KeyError(f"buses not in grid: {missing[:5].tolist()}")
+        return position
+
+    def get_line_bus_position(self, table="branch"):
+        """Get the positions of the end buses of lines in the bus table.
+
+        :param str table: either *'branch'* or *'dcline'*.
+        :return: (*tuple*) -- positions of the from buses and positions of the to
+            buses as numpy.ndarray, in the order of the line table.
+        :raises ValueError: if ``table`` is not one of *'branch'* or *'dcline'*.
+        """
+        if table not in {"branch", "dcline"}:
+            raise ValueError("table must be one of: branch, dcline")
+        line = getattr(self.grid, table)
+        return self._get(
+            ("line_bus_position", table),
+            lambda: (
+                self.get_bus_position(line["from_bus_id"]),
+                self.get_bus_position(line["to_bus_id"]),
+            ),
+        )
+
+    def get_line_coordinates(self, table="branch"):
+        """Get the coordinates of the end buses of lines.
+
+        :param str table: either *'branch'* or *'dcline'*.
+        :return: (*dict*) -- keys are *'from_lat'*, *'from_lon'*, *'to_lat'* and
+            *'to_lon'*, values are numpy.ndarray in the order of the line table.
+        """
+        from_bus, to_bus = self.get_line_bus_position(table)
+        lat = self.grid.bus["lat"].to_numpy()
+        lon = self.grid.bus["lon"].to_numpy()
+        return {
+            "from_lat": lat[from_bus],
+            "from_lon": lon[from_bus],
+            "to_lat": lat[to_bus],
+            "to_lon": lon[to_bus],
+        }
+
+    def _get_plant_mask(self, positions_by_value, values):
+        """Build a boolean mask selecting the plants with a value in a set.
+
+        :param dict positions_by_value: positions of each value as returned by
+            :meth:`get_plant_positions_by`.
+        :param set values: values to select.
+        :return: (*numpy.ndarray*) -- boolean mask over the plant table.
+        """
+        mask = np.zeros(len(self.grid.plant), dtype=bool)
+        for v in values & positions_by_value.keys():
+            mask[positions_by_value[v]] = True
+        return mask
+
+
+def _get_positions_by_value(values):
+    """Get the positions of each distinct value of a series.
+
+    :param pandas.Series values: series.
+    :return: (*dict*) -- keys are distinct values, values are sorted positions as
+        numpy.ndarray.
+    """
+    codes, uniques = pd.factorize(values.to_numpy())
+    order = np.argsort(codes, kind="stable")
+    counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+    start = np.count_nonzero(codes < 0)
+    positions = np.split(order[start:], np.cumsum(counts)[:-1])
+    return dict(zip(uniques.tolist(), positions))
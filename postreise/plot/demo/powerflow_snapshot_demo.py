@@ -31,3 +31,11 @@ if __name__ == "__main__":
         legend_font_size=20,
         num_dc_arrows=4,
     )
+    # Browse the hours of a day with a slider
+    plot_powerflow_snapshot(
+        scenario,
+        pd.date_range(start="2016-11-02", periods=24, freq="H"),
+        b2b_dclines=b2b_dclines,
+        demand_centers=demand_centers,
+        legend_font_size=20,
+    )
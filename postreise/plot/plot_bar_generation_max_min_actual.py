@@ -6,6 +6,7 @@ from postreise.analyze.generation.summarize import (
     sum_generation_by_state,
     sum_generation_by_type_zone,
 )
+from postreise.cache import get_grid, get_grid_index
 
 
 def plot_bar_generation_max_min_actual(
@@ -44,10 +45,12 @@ def plot_bar_generation_max_min_actual(
     if not isinstance(fontsize, (int, float)):
         raise TypeError("fontsize must be either a int or a float")
 
-    grid = scenario.get_grid()
+    grid = get_grid(scenario)
     _check_resources_are_in_grid_and_format(gen_type, grid)
 
-    plant = grid.plant[grid.plant.type == gen_type]
+    plant = grid.plant.iloc[
+        get_grid_index(scenario).get_plant_positions(resources=gen_type)
+    ]
     mi = grid.model_immutables
     if interconnect not in mi.zones["interconnect"]:
         raise ValueError(
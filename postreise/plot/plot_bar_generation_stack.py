@@ -9,6 +9,8 @@ from postreise.analyze.generation.curtailment import (
     calculate_curtailment_time_series_by_areas_and_resources,
 )
 from postreise.analyze.generation.summarize import sum_generation_by_type_zone
+from postreise.cache import get_demand, get_grid
+from postreise.plot.scenario_loader import load_scenarios
 
 
 def plot_bar_generation_stack(
@@ -26,6 +28,7 @@ def plot_bar_generation_stack(
     save=False,
     filenames=None,
     filepath=None,
+    max_workers=None,
 ):
     """Plot any number of scenarios as generation stack bar for selected resources in
     each specified areas.
@@ -59,6 +62,8 @@ def plot_bar_generation_stack(
         in string, use area as filename if None.
     :param str filepath: if save is True, user specified filepath, use current
         directory if None.
+    :param int max_workers: number of scenarios loaded at once, defaults to None. See
+        :func:`postreise.plot.scenario_loader.load_scenarios`.
     :return: (*list*) -- matplotlib.axes.Axes object of each plot in a list.
     :raises TypeError:
         if ``resources`` is not a list or str.
@@ -92,9 +97,15 @@ def plot_bar_generation_stack(
         raise TypeError("titles must be a dictionary")
     if filenames is not None and not isinstance(filenames, dict):
         raise TypeError("filenames must be a dictionary")
-    s_list = []
-    for sid in scenario_ids:
-        s_list.append(Scenario(sid))
+
+    loaded = load_scenarios(
+        scenario_ids,
+        _sum_generation_load_curtailment_by_zone,
+        max_workers=max_workers,
+        factory=Scenario,
+    )
+    s_list = [loaded[sid][0] for sid in scenario_ids]
+    all_loadzone_data = {sid: loaded[sid][1] for sid in scenario_ids}
     mi = ModelImmutables(s_list[0].info["grid_model"])
     type2color = mi.plants["type2color"]
     type2color.update(
@@ -114,35 +125,6 @@ def plot_bar_generation_stack(
     if t2hc:
         type2hatchcolor.update(t2hc)
 
-    all_loadzone_data = dict()
-    for sid, scenario in zip(scenario_ids, s_list):
-        curtailment = calculate_curtailment_time_series_by_areas_and_resources(
-            scenario,
-            areas={
-                "loadzone": mi.zones["interconnect2loadzone"][
-                    scenario.info["interconnect"]
-                ]
-            },
-        )
-        for area in curtailment:
-            for r in curtailment[area]:
-                curtailment[area][r] = curtailment[area][r].sum().sum()
-        curtailment = (
-            pd.DataFrame(curtailment).rename(columns=mi.zones["loadzone2id"]).T
-        )
-        curtailment.rename(
-            columns={c: c + "_curtailment" for c in curtailment.columns}, inplace=True
-        )
-        curtailment["curtailment"] = curtailment.sum(axis=1)
-        all_loadzone_data[sid] = pd.concat(
-            [
-                sum_generation_by_type_zone(scenario).T,
-                scenario.get_demand().sum().T.rename("load"),
-                curtailment,
-            ],
-            axis=1,
-        ).rename(index=mi.zones["id2loadzone"])
-
     width = 0.4
     x_scale = 0.6
     ax_list = []
@@ -240,3 +222,37 @@ def plot_bar_generation_stack(
                 pad_inches=0,
             )
     return ax_list
+
+
+def _sum_generation_load_curtailment_by_zone(scenario):
+    """Sum generation by resource type, load and curtailment by resource type in each
+    load zone of a scenario.
+
+    :param powersimdata.scenario.scenario.Scenario scenario: scenario instance.
+    :return: (*pandas.DataFrame*) -- index: load zone names, columns: resource types,
+        *'load'*, curtailable resource types suffixed by *'_curtailment'* and
+        *'curtailment'*.
+    """
+    mi = get_grid(scenario).model_immutables
+    curtailment = calculate_curtailment_time_series_by_areas_and_resources(
+        scenario,
+        areas={
+            "loadzone": mi.zones["interconnect2loadzone"][scenario.info["interconnect"]]
+        },
+    )
+    for area in curtailment:
+        for r in curtailment[area]:
+            curtailment[area][r] = curtailment[area][r].sum().sum()
+    curtailment = pd.DataFrame(curtailment).rename(columns=mi.zones["loadzone2id"]).T
+    curtailment.rename(
+        columns={c: c + "_curtailment" for c in curtailment.columns}, inplace=True
+    )
+    curtailment["curtailment"] = curtailment.sum(axis=1)
+    return pd.concat(
+        [
+            sum_generation_by_type_zone(scenario).T,
+            get_demand(scenario).sum().T.rename("load"),
+            curtailment,
+        ],
+        axis=1,
+    ).rename(index=mi.zones["id2loadzone"])
@@ -3,8 +3,10 @@ import pandas as pd
 from powersimdata.network.model import ModelImmutables, area_to_loadzone
 from powersimdata.scenario.scenario import Scenario
 
-from postreise.analyze.generation.capacity import sum_capacity_by_type_zone
-from postreise.analyze.generation.summarize import sum_generation_by_type_zone
+from postreise.plot.scenario_loader import (
+    load_scenarios,
+    sum_generation_and_capacity_by_type_zone,
+)
 
 
 def plot_bar_generation_vs_capacity(
@@ -19,6 +21,7 @@ def plot_bar_generation_vs_capacity(
     resource_labels=None,
     horizontal=False,
     plot_show=True,
+    max_workers=None,
 ):
     """Plot any number of scenarios as bar or horizontal bar charts with two columns per
     scenario - generation and capacity.
@@ -43,6 +46,9 @@ def plot_bar_generation_vs_capacity(
         being labels to show in the plots, defaults to None, which uses
         resource_types as labels.
     :param bool horizontal: display bars horizontally, default to False.
+    :param bool plot_show: display the generated figure or not, defaults to True.
+    :param int max_workers: number of scenarios loaded at once, defaults to None. See
+        :func:`postreise.plot.scenario_loader.load_scenarios`.
     :return: (*matplotlib.axes.Axes*) -- axes object of the plot.
     :raises TypeError:
         if ``resource_labels`` is not a dict.
@@ -79,19 +85,17 @@ def plot_bar_generation_vs_capacity(
     if not isinstance(resource_labels, dict):
         raise TypeError("resource_labels must be a dict")
 
+    loaded = load_scenarios(
+        scenario_ids,
+        lambda s: sum_generation_and_capacity_by_type_zone(s, time_range, time_zone),
+        max_workers=max_workers,
+        factory=Scenario,
+    )
     all_loadzone_data = {}
     scenario_data = {}
     for i, sid in enumerate(scenario_ids):
-        scenario = Scenario(sid)
+        scenario, all_loadzone_data[sid] = loaded[sid]
         mi = ModelImmutables(scenario.info["grid_model"])
-        all_loadzone_data[sid] = {
-            "gen": sum_generation_by_type_zone(scenario, time_range, time_zone).rename(
-                columns=mi.zones["id2loadzone"]
-            ),
-            "cap": sum_capacity_by_type_zone(scenario).rename(
-                columns=mi.zones["id2loadzone"]
-            ),
-        }
         scenario_data[sid] = {
             "name": scenario_names[i] if scenario_names else scenario.info["name"],
             "grid_model": mi.model,
@@ -10,6 +10,7 @@ from postreise.analyze.generation.summarize import (
     sum_generation_by_state,
     sum_generation_by_type_zone,
 )
+from postreise.cache import get_grid, get_grid_index
 
 
 def plot_bar_renewable_max_profile_actual(
@@ -48,12 +49,14 @@ def plot_bar_renewable_max_profile_actual(
     if not isinstance(fontsize, (int, float)):
         raise TypeError("fontsize must be either a int or a float")
 
-    grid = scenario.get_grid()
+    grid = get_grid(scenario)
     mi = grid.model_immutables
     _check_resources_are_in_grid_and_format(gen_type, grid)
     _check_resources_are_renewable_and_format(gen_type, mi=mi)
 
-    plant = grid.plant[grid.plant.type == gen_type]
+    plant = grid.plant.iloc[
+        get_grid_index(scenario).get_plant_positions(resources=gen_type)
+    ]
     if interconnect not in mi.zones["interconnect"]:
         raise ValueError(
             f"interconnect must be one of {sorted(mi.zones['interconnect'])}"
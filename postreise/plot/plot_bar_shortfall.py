@@ -8,6 +8,8 @@ from powersimdata.design.generation.clean_capacity_scaling import (
 )
 from powersimdata.scenario.scenario import Scenario
 
+from postreise.plot.scenario_loader import load_scenarios
+
 
 def plot_bar_shortfall(
     areas,
@@ -18,6 +20,7 @@ def plot_bar_shortfall(
     baseline_scenario=None,
     baseline_scenario_name=None,
     plot_show=True,
+    max_workers=None,
 ):
     """Plot a stacked bar chart of generation shortfall based on given targets for
     any number of scenarios.
@@ -39,6 +42,8 @@ def plot_bar_shortfall(
         shown in the bar chart, default to None, in which case the name of the
         scenario will be used.
     :param bool plot_show: display the generated figure or not, defaults to True.
+    :param int max_workers: number of scenarios loaded at once, defaults to None. See
+        :func:`postreise.plot.scenario_loader.load_scenarios`.
     :return: (*matplotlib.axes.Axes*) -- axes object of the plot.
     :raises ValueError:
         if length of ``scenario_names`` and ``scenario_ids`` is different.
@@ -69,17 +74,21 @@ def plot_bar_shortfall(
     ):
         raise TypeError("baseline_scenario_name must be a str")
 
-    scenarios = dict()
-    targets = dict()
-    all_sids = scenario_ids + [baseline_scenario] if baseline_scenario else scenario_ids
-    for sid in all_sids:
-        s = Scenario(sid)
+    def _add_scenario_data_to_targets(s):
         tmp_df = target_df.copy()
         tmp_df = add_resource_data_to_targets(tmp_df, s)
         tmp_df = add_demand_to_targets(tmp_df, s)
-        tmp_df = add_shortfall_to_targets(tmp_df)
-        scenarios[sid] = s
-        targets[sid] = tmp_df
+        return add_shortfall_to_targets(tmp_df)
+
+    all_sids = scenario_ids + [baseline_scenario] if baseline_scenario else scenario_ids
+    loaded = load_scenarios(
+        all_sids,
+        _add_scenario_data_to_targets,
+        max_workers=max_workers,
+        factory=Scenario,
+    )
+    scenarios = {sid: s for sid, (s, _) in loaded.items()}
+    targets = {sid: tmp_df for sid, (_, tmp_df) in loaded.items()}
     for area in areas:
         if area not in target_df.index and area != "all":
             print(f"{area} is skipped due to lack of target information in target_df!")
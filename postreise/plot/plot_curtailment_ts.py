@@ -52,7 +52,9 @@ def plot_curtailment_time_series(
         is pandas.Timestamp/numpy.datetime64/datetime.datetime. If None, the entire
         time range is used for the given scenario.
     :param str time_zone: new time zone.
-    :param str time_freq: frequency. Either *'D'* (day), *'W'* (week), *'M'* (month).
+    :param str time_freq: frequency. Either *'H'* (hour), *'D'* (day), *'W'* (week),
+        *'M'* (month), *'Q'* (quarter), *'A'* (year) or a multiple of hours, e.g.
+        *'6H'*.
     :param bool show_demand: show demand line in the plot or not, default is True.
     :param bool percentage: plot the curtailment in terms of percentage or not,
         default is True.
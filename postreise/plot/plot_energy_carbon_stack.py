@@ -6,6 +6,10 @@ import numpy as np
 from powersimdata.network.model import ModelImmutables
 from powersimdata.scenario.scenario import Scenario
 
+from postreise.analyze.generation.aggregates import (
+    get_aggregate_store,
+    get_monthly_aggregates,
+)
 from postreise.analyze.generation.emissions import generate_emissions_stats
 
 # Define common classifications
@@ -20,6 +24,11 @@ def plot_n_scenarios(*args):
 
     :param powersimdata.scenario.scenario.Scenario args: scenario instances.
     :raises ValueError: if arguments are not scenario instances.
+
+    .. note::
+        If an aggregate store is set, see
+        :func:`postreise.analyze.generation.aggregates.set_aggregate_store`, energy
+        and carbon emissions are derived from the stored monthly aggregates.
     """
     if not all([isinstance(a, Scenario) for a in args]):
         raise ValueError("all inputs must be Scenario objects")
@@ -33,11 +42,16 @@ def plot_n_scenarios(*args):
     type2color = ModelImmutables(args[0].info["grid_model"]).plants["type2color"]
     carbon_by_type, energy_by_type = {}, {}
     for id, scenario in scenarios.items():
-        # Calculate raw numbers
-        annual_plant_energy = scenario.get_pg().sum()
-        raw_energy_by_type = annual_plant_energy.groupby(plant[id].type).sum()
-        annual_plant_carbon = generate_emissions_stats(scenario).sum()
-        raw_carbon_by_type = annual_plant_carbon.groupby(plant[id].type).sum()
+        # Calculate raw numbers, from the stored aggregates if any
+        if get_aggregate_store() is not None:
+            aggregates = get_monthly_aggregates(scenario).groupby(level="type").sum()
+            raw_energy_by_type = aggregates["generation"]
+            raw_carbon_by_type = aggregates["emissions"]
+        else:
+            annual_plant_energy = scenario.get_pg().sum()
+            raw_energy_by_type = annual_plant_energy.groupby(plant[id].type).sum()
+            annual_plant_carbon = generate_emissions_stats(scenario).sum()
+            raw_carbon_by_type = annual_plant_carbon.groupby(plant[id].type).sum()
         # Drop fuels with zero energy (e.g. all offshore_wind scaled to 0 MW)
         energy_by_type[id] = raw_energy_by_type[raw_energy_by_type != 0]
         carbon_by_type[id] = raw_carbon_by_type[raw_energy_by_type != 0]
@@ -61,7 +61,9 @@ def plot_generation_time_series_stack(
         is pandas.Timestamp/numpy.datetime64/datetime.datetime. If None, the entire
         time range is used for the given scenario.
     :param str time_zone: new time zone.
-    :param str time_freq: frequency. Either *'D'* (day), *'W'* (week), *'M'* (month).
+    :param str time_freq: frequency. Either *'H'* (hour), *'D'* (day), *'W'* (week),
+        *'M'* (month), *'Q'* (quarter), *'A'* (year) or a multiple of hours, e.g.
+        *'6H'*.
     :param bool show_demand: show demand line in the plot or not, default is True.
     :param bool show_net_demand: show net demand line in the plot or not, default is
         True.
@@ -5,7 +5,7 @@ import matplotlib.pyplot as plt
 import pandas as pd
 from powersimdata.input.check import _check_time_series
 
-from postreise.analyze.time import change_time_zone
+from postreise.analyze.time import get_time_of_use_cube
 
 
 def plot_heatmap(
@@ -55,15 +55,9 @@ def plot_heatmap(
     _check_time_series(series, "series")
     df = series.to_frame(name="values").asfreq("H")
     year = df.index[0].year
-    if time_zone is not None:
-        df = change_time_zone(df, time_zone)
-    df["date"] = df.index.date
-    df["hour"] = df.index.hour
-    df_reshaped = pd.pivot(
-        df,
-        index="date",
-        columns="hour",
-        values="values",
+    cube, dates, _ = get_time_of_use_cube(df, period="date", time_zone=time_zone)
+    df_reshaped = pd.DataFrame(
+        cube[:, :, 0], index=dates.date, columns=pd.RangeIndex(24, name="hour")
     )
     xlims = mdates.date2num([df_reshaped.index[0], df_reshaped.index[-1]])
     ylims = mdates.date2num([dt.datetime(year, 1, 1, 0), dt.datetime(year, 1, 1, 23)])
@@ -4,8 +4,10 @@ import pandas as pd
 from powersimdata.network.model import ModelImmutables, area_to_loadzone
 from powersimdata.scenario.scenario import Scenario
 
-from postreise.analyze.generation.capacity import sum_capacity_by_type_zone
-from postreise.analyze.generation.summarize import sum_generation_by_type_zone
+from postreise.plot.scenario_loader import (
+    load_scenarios,
+    sum_generation_and_capacity_by_type_zone,
+)
 
 
 def plot_pie_generation_vs_capacity(
@@ -19,6 +21,7 @@ def plot_pie_generation_vs_capacity(
     resource_labels=None,
     resource_colors=None,
     min_percentage=0,
+    max_workers=None,
 ):
     """Plot any number of scenarios as pie charts with two columns per scenario -
     generation and capacity.
@@ -49,6 +52,8 @@ def plot_pie_generation_vs_capacity(
     :param float min_percentage: roll up small pie pieces into a single category,
         resources with percentage less than the set value will be pooled together,
         defaults to 0.
+    :param int max_workers: number of scenarios loaded at once, defaults to None. See
+        :func:`postreise.plot.scenario_loader.load_scenarios`.
     :raises ValueError:
         if length of ``area_types`` and ``areas`` is different.
         if length of ``scenario_names`` and ``scenario_ids`` is different.
@@ -94,21 +99,19 @@ def plot_pie_generation_vs_capacity(
     if not isinstance(resource_colors, dict):
         raise TypeError("resource_colors must be a dict")
 
+    loaded = load_scenarios(
+        scenario_ids,
+        lambda s: sum_generation_and_capacity_by_type_zone(s, time_range, time_zone),
+        max_workers=max_workers,
+        factory=Scenario,
+    )
     all_loadzone_data = {}
     scenario_data = {}
     for i, sid in enumerate(scenario_ids):
-        scenario = Scenario(sid)
+        scenario, all_loadzone_data[sid] = loaded[sid]
         mi = ModelImmutables(
             scenario.info["grid_model"], interconnect=scenario.info["interconnect"]
         )
-        all_loadzone_data[sid] = {
-            "gen": sum_generation_by_type_zone(scenario, time_range, time_zone).rename(
-                columns=mi.zones["id2loadzone"]
-            ),
-            "cap": sum_capacity_by_type_zone(scenario).rename(
-                columns=mi.zones["id2loadzone"]
-            ),
-        }
         scenario_data[sid] = {
             "name": scenario_names[i] if scenario_names else scenario.info["name"],
             "grid_model": mi.model,
@@ -1,17 +1,107 @@
+import numpy as np
 import pandas as pd
-from bokeh.models import Arrow, VeeHead
+from bokeh.layouts import column
+from bokeh.models import ColumnDataSource, CustomJS, Slider
 from powersimdata.input.check import _check_date_range_in_scenario
 from powersimdata.scenario.check import _check_scenario_is_in_analyze_state
-from powersimdata.utility.distance import haversine
 
+from postreise.analyze.distance import get_line_length
+from postreise.cache import (
+    get_dcline_pf,
+    get_demand,
+    get_grid,
+    get_grid_index,
+    get_pf,
+    get_pg,
+)
 from postreise.plot.canvas import create_map_canvas
 from postreise.plot.check import _check_func_kwargs
 from postreise.plot.plot_states import add_state_borders
 from postreise.plot.projection_helpers import project_branch, project_bus
 
+_SLIDER_CODE = """
+const i = cb_obj.value
+for (const name in sources) {
+    sources[name].data = {...sources[name].data, ...frames[name][i]}
+}
+cb_obj.title = labels[i]
+"""
+
+
+def _get_arrow_data(line, pf, arrow_size, pf_threshold=0, dist_threshold=0, n=1):
+    """Compute the coordinates, orientation and size of the arrows along lines.
+
+    :param pandas.DataFrame line: data frame containing:
+        'dist', 'from_x', 'from_y', 'to_x', 'to_y'.
+    :param numpy.ndarray pf: power flow on each line.
+    :param numpy.ndarray arrow_size: size of the arrows on each line.
+    :param int/float pf_threshold: minimum power flow for a line to get arrow(s).
+    :param int/float dist_threshold: minimum distance for a line to get arrow(s).
+    :param int n: number of arrows to plot along each line.
+    :return: (*dict*) -- keys are *'x_start'*, *'y_start'*, *'x_end'*, *'y_end'*,
+        *'angle'* and *'size'*, values are numpy.ndarray.
+    """
+    dist = line["dist"].to_numpy()
+    positive = (pf > pf_threshold) & (dist > dist_threshold)
+    negative = (pf < -1 * pf_threshold) & (dist > dist_threshold)
+    selected = positive | negative
+    # Swap direction of negative arrows
+    from_x = np.where(negative, line["to_x"], line["from_x"])[selected]
+    from_y = np.where(negative, line["to_y"], line["from_y"])[selected]
+    to_x = np.where(negative, line["from_x"], line["to_x"])[selected]
+    to_y = np.where(negative, line["from_y"], line["to_y"])[selected]
+    size = np.asarray(arrow_size)[selected]
+
+    # Split each line into n consecutive arrows
+    start_fraction = np.repeat(np.arange(n) / n, len(size))
+    end_fraction = np.repeat(np.arange(1, n + 1) / n, len(size))
+    dx, dy = np.tile(to_x - from_x, n), np.tile(to_y - from_y, n)
+    x0, y0 = np.tile(from_x, n), np.tile(from_y, n)
+    return {
+        "x_start": x0 + dx * start_fraction,
+        "y_start": y0 + dy * start_fraction,
+        "x_end": x0 + dx * end_fraction,
+        "y_end": y0 + dy * end_fraction,
+        # triangle markers point upward when not rotated
+        "angle": np.arctan2(dy, dx) - np.pi / 2,
+        "size": np.tile(size, n),
+    }
+
+
+def _add_arrow_glyphs(canvas, source, color):
+    """Draw arrows from a data source.
+
+    :param bokeh.plotting.figure.Figure canvas: canvas to plot arrows onto.
+    :param bokeh.models.sources.ColumnDataSource source: data source with the
+        columns returned by :func:`_get_arrow_data`.
+    :param str color: arrow line color.
+    """
+    canvas.segment(
+        x0="x_start",
+        y0="y_start",
+        x1="x_end",
+        y1="y_end",
+        line_color=color,
+        line_alpha=0.7,
+        source=source,
+    )
+    canvas.triangle(
+        x="x_end",
+        y="y_end",
+        angle="angle",
+        size="size",
+        line_color="black",
+        fill_color="gray",
+        line_width=2,
+        fill_alpha=0.5,
+        line_alpha=0.5,
+        source=source,
+    )
+
 
 def add_arrows(canvas, branch, color, pf_threshold=0, dist_threshold=0, n=1):
-    """Add addorws for powerflow to figure.
+    """Add addorws for powerflow to figure. All the arrows are drawn with one segment
+    glyph and one triangle glyph sharing a single data source.
 
     :param bokeh.plotting.figure.Figure canvas: canvas to plot arrows onto.
     :param pandas.DataFrame branch: data frame containing:
@@ -22,43 +112,20 @@ def add_arrows(canvas, branch, color, pf_threshold=0, dist_threshold=0, n=1):
     :param int/float pf_threshold: minimum power flow for a branch to get arrow(s).
     :param int/float pf_threshold: minimum distance for a branch to get arrow(s).
     :param int n: number of arrows to plot along each branch.
+    :return: (*bokeh.models.sources.ColumnDataSource*) -- data source of the arrows.
     """
-    positive_arrows = branch.loc[
-        (branch.pf > pf_threshold) & (branch.dist > dist_threshold)
-    ]
-    negative_arrows = branch.loc[
-        (branch.pf < -1 * pf_threshold) & (branch.dist > dist_threshold)
-    ]
-    # Swap direction of negative arrows
-    negative_arrows = negative_arrows.rename(
-        columns={"from_x": "to_x", "to_x": "from_x", "to_y": "from_y", "from_y": "to_y"}
-    )
-    # Finally, plot arrows
-    arrows = pd.concat([positive_arrows, negative_arrows])
-    for i in range(n):
-        start_fraction = i / n
-        end_fraction = (i + 1) / n
-        arrows.apply(
-            lambda a: canvas.add_layout(
-                Arrow(
-                    end=VeeHead(
-                        line_color="black",
-                        fill_color="gray",
-                        line_width=2,
-                        fill_alpha=0.5,
-                        line_alpha=0.5,
-                        size=a["arrow_size"],
-                    ),
-                    x_start=(a["from_x"] + (a["to_x"] - a["from_x"]) * start_fraction),
-                    y_start=(a["from_y"] + (a["to_y"] - a["from_y"]) * start_fraction),
-                    x_end=(a["from_x"] + (a["to_x"] - a["from_x"]) * end_fraction),
-                    y_end=(a["from_y"] + (a["to_y"] - a["from_y"]) * end_fraction),
-                    line_color=color,
-                    line_alpha=0.7,
-                )
-            ),
-            axis=1,
+    source = ColumnDataSource(
+        _get_arrow_data(
+            branch,
+            branch["pf"].to_numpy(),
+            branch["arrow_size"].to_numpy(),
+            pf_threshold=pf_threshold,
+            dist_threshold=dist_threshold,
+            n=n,
         )
+    )
+    _add_arrow_glyphs(canvas, source, color)
+    return source
 
 
 def aggregate_plant_generation(plant, coordinate_rounding=0):
@@ -77,6 +144,35 @@ def aggregate_plant_generation(plant, coordinate_rounding=0):
     return aggregated
 
 
+def _group_plants(plant, coordinate_rounding=0):
+    """Group plants based on similar lat/lon coordinates.
+
+    :param pandas.DataFrame plant: data frame containing: 'lat', 'lon'.
+    :param int coordinate_rounding: number of digits to round lat & lon for aggregation.
+    :return: (*tuple*) -- group of each plant as numpy.ndarray and data frame with the
+        mean 'x', 'y' of each group, ordered as in :func:`aggregate_plant_generation`.
+    """
+    plant_w_xy = project_bus(plant)
+    grouped = plant_w_xy.groupby(
+        [
+            plant_w_xy["lat"].round(coordinate_rounding),
+            plant_w_xy["lon"].round(coordinate_rounding),
+        ]
+    )
+    return grouped.ngroup().to_numpy(), grouped[["x", "y"]].mean()
+
+
+def _sum_by_group(pg, group):
+    """Sum generation of plants by group.
+
+    :param pandas.DataFrame pg: generation, intervals as index and plants as columns.
+    :param numpy.ndarray group: group of each plant.
+    :return: (*numpy.ndarray*) -- generation of each group, intervals as rows and
+        groups as columns.
+    """
+    return pg.T.groupby(group).sum().T.to_numpy()
+
+
 def plot_powerflow_snapshot(
     scenario,
     hour,
@@ -105,7 +201,9 @@ def plot_powerflow_snapshot(
     """Plot a snapshot of powerflow.
 
     :param powersimdata.scenario.scenario.Scenario scenario: scenario to plot.
-    :param pandas.Timestamp/numpy.datetime64/datetime.datetime hour: snapshot interval.
+    :param pandas.Timestamp/numpy.datetime64/datetime.datetime/list hour: snapshot
+        interval(s). If several intervals are given, the map is drawn once and a
+        slider selects the interval to display.
     :param dict b2b_dclines: which DC lines are actually B2B facilities. Keys are:
         {"from", "to"}, values are iterables of DC line indices to plot (indices in
         "from" get plotted at the "from" end, and vice versa).
@@ -131,39 +229,42 @@ def plot_powerflow_snapshot(
     :param tuple(float, float) x_range: x range to zoom plot to (EPSG:3857).
     :param tuple(float, float) y_range: y range to zoom plot to (EPSG:3857).
     :param int/str legend_font_size: size to display legend specified as e.g. 12/'12pt'.
-    :return: (*bokeh.plotting.figure*) -- power flow snapshot map.
+    :return: (*bokeh.plotting.figure/bokeh.models.layouts.Column*) -- power flow
+        snapshot map. If several intervals are given, a column with a slider above
+        the map.
+    :raises ValueError: if ``hour`` is empty.
+
+    .. note::
+        When several intervals are given, the map, the state borders and the
+        background lines are drawn once. The line widths, the arrows and the size
+        of the circles of each interval are computed upfront and embedded in the
+        document, the slider only swaps them.
     """
     _check_scenario_is_in_analyze_state(scenario)
-    _check_date_range_in_scenario(scenario, hour, hour)
+    hours = pd.DatetimeIndex(hour if pd.api.types.is_list_like(hour) else [hour])
+    if len(hours) == 0:
+        raise ValueError("hour must contain at least one interval")
+    _check_date_range_in_scenario(scenario, hours.min(), hours.max())
     # Get scenario data
-    grid = scenario.get_grid()
-    bus = grid.bus
+    grid = get_grid(scenario)
     plant = grid.plant
+    # Keep the branches carrying power in at least one of the intervals
+    ac_pf = get_pf(scenario).loc[hours, grid.branch.index].to_numpy()
+    is_loaded = (ac_pf != 0).any(axis=0)
+    ac_pf = ac_pf[:, is_loaded]
+    branch = grid.branch.loc[is_loaded]
     # Augment the branch dataframe with extra info needed for plotting
-    branch = grid.branch
-    branch["pf"] = scenario.get_pf().loc[hour]
-    branch = branch.query("pf != 0").copy()
-    branch["dist"] = branch.apply(
-        lambda x: haversine((x.from_lat, x.from_lon), (x.to_lat, x.to_lon)), axis=1
-    )
-    branch["arrow_size"] = branch["pf"].abs() * pf_width_scale_factor + min_arrow_size
-    branch = project_branch(branch)
+    branch = project_branch(branch.assign(dist=get_line_length(branch)))
     # Augment the dcline dataframe with extra info needed for plotting
-    dcline = grid.dcline
-    dcline["pf"] = scenario.get_dcline_pf().loc[hour]
-    dcline["from_lat"] = dcline.apply(lambda x: bus.loc[x.from_bus_id, "lat"], axis=1)
-    dcline["from_lon"] = dcline.apply(lambda x: bus.loc[x.from_bus_id, "lon"], axis=1)
-    dcline["to_lat"] = dcline.apply(lambda x: bus.loc[x.to_bus_id, "lat"], axis=1)
-    dcline["to_lon"] = dcline.apply(lambda x: bus.loc[x.to_bus_id, "lon"], axis=1)
-    dcline["dist"] = dcline.apply(
-        lambda x: haversine((x.from_lat, x.from_lon), (x.to_lat, x.to_lon)), axis=1
+    dc_pf = get_dcline_pf(scenario).loc[hours, grid.dcline.index].to_numpy()
+    dcline = grid.dcline.assign(
+        **get_grid_index(scenario).get_line_coordinates("dcline")
     )
-    dcline["arrow_size"] = dcline["pf"].abs() * pf_width_scale_factor + min_arrow_size
-    dcline = project_branch(dcline)
+    dcline = project_branch(dcline.assign(dist=get_line_length(dcline)))
     # Create a dataframe for demand plotting, if necessary
     if demand_centers is not None:
-        demand = scenario.get_demand()
-        demand_centers["demand"] = demand.loc[hour]
+        demand = get_demand(scenario).loc[hours]
+        demand = demand.reindex(columns=demand_centers.index).to_numpy()
         demand_centers = project_bus(demand_centers)
 
     # create canvas
@@ -185,8 +286,11 @@ def plot_powerflow_snapshot(
         # Append the pseudo AC lines to the branch dataframe, remove from dcline
         all_b2b_dclines = list(b2b_dclines["to"]) + list(b2b_dclines["from"])
         pseudo_ac_lines = dcline.loc[all_b2b_dclines]
-        pseudo_ac_lines["rateA"] = pseudo_ac_lines[["Pmin", "Pmax"]].abs().max(axis=1)
-        branch = branch.append(pseudo_ac_lines)
+        pseudo_ac_lines = pseudo_ac_lines.assign(
+            rateA=pseudo_ac_lines[["Pmin", "Pmax"]].abs().max(axis=1)
+        )
+        branch = pd.concat([branch, pseudo_ac_lines])
+        ac_pf = np.hstack([ac_pf, dc_pf[:, dcline.index.get_indexer(all_b2b_dclines)]])
         # Construct b2b dataframe so that all get plotted at their 'from' x/y
         b2b_from = dcline.loc[b2b_dclines["from"]]
         b2b_to = dcline.loc[b2b_dclines["to"]].rename(
@@ -194,7 +298,10 @@ def plot_powerflow_snapshot(
             axis=1,
         )
         b2b = pd.concat([b2b_from, b2b_to])
-        dcline = dcline.loc[~dcline.index.isin(all_b2b_dclines)]
+        b2b_pf = dc_pf[:, dcline.index.get_indexer(b2b.index)]
+        is_dc = ~dcline.index.isin(all_b2b_dclines)
+        dcline = dcline.loc[is_dc]
+        dc_pf = dc_pf[:, is_dc]
 
     # Plot grid background in grey
     canvas.multi_line(
@@ -260,6 +367,67 @@ def plot_powerflow_snapshot(
         visible=False,
     )
 
+    # Aggregate solar and wind for plotting
+    pg = get_pg(scenario).loc[hours]
+    solar = plant.query("type == 'solar'")
+    solar_group, grouped_solar = _group_plants(solar)
+    solar_pg = _sum_by_group(pg.reindex(columns=solar.index), solar_group)
+    wind = plant.query("type == 'wind'")
+    wind_group, grouped_wind = _group_plants(wind)
+    wind_pg = _sum_by_group(pg.reindex(columns=wind.index), wind_group)
+
+    def get_frame(i):
+        ac_size = np.abs(ac_pf[i]) * pf_width_scale_factor
+        dc_size = np.abs(dc_pf[i]) * pf_width_scale_factor
+        frame = {
+            "solar": {"size": (solar_pg[i] * circle_scale_factor) ** 0.5},
+            "wind": {"size": (wind_pg[i] * circle_scale_factor) ** 0.5},
+            "ac": {"line_width": ac_size},
+            "ac_arrows": _get_arrow_data(
+                branch,
+                ac_pf[i],
+                ac_size + min_arrow_size,
+                pf_threshold=arrow_pf_threshold,
+                dist_threshold=arrow_dist_threshold,
+                n=num_ac_arrows,
+            ),
+            "dc": {"line_width": dc_size},
+            "dc_arrows": _get_arrow_data(
+                dcline, dc_pf[i], dc_size + min_arrow_size, n=num_dc_arrows
+            ),
+        }
+        if demand_centers is not None:
+            frame["demand"] = {"size": (demand[i] * circle_scale_factor) ** 0.5}
+        if b2b_dclines is not None:
+            frame["b2b"] = {"size": np.abs(b2b_pf[i]) * pf_width_scale_factor * 5}
+        return frame
+
+    frames = [get_frame(i) for i in range(len(hours))]
+    sources = {
+        "ac": ColumnDataSource(
+            {
+                "xs": branch[["from_x", "to_x"]].to_numpy().tolist(),
+                "ys": branch[["from_y", "to_y"]].to_numpy().tolist(),
+            }
+        ),
+        "dc": ColumnDataSource(
+            {
+                "xs": dcline[["from_x", "to_x"]].to_numpy().tolist(),
+                "ys": dcline[["from_y", "to_y"]].to_numpy().tolist(),
+            }
+        ),
+        "ac_arrows": ColumnDataSource(),
+        "dc_arrows": ColumnDataSource(),
+        "solar": ColumnDataSource(grouped_solar[["x", "y"]]),
+        "wind": ColumnDataSource(grouped_wind[["x", "y"]]),
+    }
+    if demand_centers is not None:
+        sources["demand"] = ColumnDataSource(demand_centers[["x", "y"]])
+    if b2b_dclines is not None:
+        sources["b2b"] = ColumnDataSource({"x": b2b["from_x"], "y": b2b["from_y"]})
+    for name, data in frames[0].items():
+        sources[name].data.update(data)
+
     # Plot demand
     if demand_centers is not None:
         canvas.circle(
@@ -272,76 +440,53 @@ def plot_powerflow_snapshot(
             visible=False,
         )
         canvas.circle(
-            demand_centers.x,
-            demand_centers.y,
+            "x",
+            "y",
             color=demand_color,
             alpha=0.3,
-            size=(demand_centers.demand * circle_scale_factor) ** 0.5,
+            size="size",
+            source=sources["demand"],
         )
 
-    # Aggregate solar and wind for plotting
-    plant_with_pg = plant.copy()
-    plant_with_pg["pg"] = scenario.get_pg().loc[hour]
-    grouped_solar = aggregate_plant_generation(plant_with_pg.query("type == 'solar'"))
-    grouped_wind = aggregate_plant_generation(plant_with_pg.query("type == 'wind'"))
     # Plot solar, wind
     canvas.circle(
-        grouped_solar.x,
-        grouped_solar.y,
-        color=solar_color,
-        alpha=0.6,
-        size=(grouped_solar.pg * circle_scale_factor) ** 0.5,
+        "x", "y", color=solar_color, alpha=0.6, size="size", source=sources["solar"]
     )
     canvas.circle(
-        grouped_wind.x,
-        grouped_wind.y,
-        color=wind_color,
-        alpha=0.6,
-        size=(grouped_wind.pg * circle_scale_factor) ** 0.5,
+        "x", "y", color=wind_color, alpha=0.6, size="size", source=sources["wind"]
     )
 
     # Plot powerflow on AC branches
     canvas.multi_line(
-        branch[["from_x", "to_x"]].to_numpy().tolist(),
-        branch[["from_y", "to_y"]].to_numpy().tolist(),
+        "xs",
+        "ys",
         color=ac_branch_color,
         alpha=branch_alpha,
-        line_width=(branch["pf"].abs() * pf_width_scale_factor),
-    )
-    add_arrows(
-        canvas,
-        branch,
-        color=ac_branch_color,
-        pf_threshold=arrow_pf_threshold,
-        dist_threshold=arrow_dist_threshold,
-        n=num_ac_arrows,
+        line_width="line_width",
+        source=sources["ac"],
     )
+    _add_arrow_glyphs(canvas, sources["ac_arrows"], ac_branch_color)
 
     # Plot powerflow on DC lines
     canvas.multi_line(
-        dcline[["from_x", "to_x"]].to_numpy().tolist(),
-        dcline[["from_y", "to_y"]].to_numpy().tolist(),
+        "xs",
+        "ys",
         color=dc_branch_color,
         alpha=branch_alpha,
-        line_width=(dcline["pf"].abs() * pf_width_scale_factor),
-    )
-    add_arrows(
-        canvas,
-        dcline,
-        color=dc_branch_color,
-        pf_threshold=0,
-        dist_threshold=0,
-        n=num_dc_arrows,
+        line_width="line_width",
+        source=sources["dc"],
     )
+    _add_arrow_glyphs(canvas, sources["dc_arrows"], dc_branch_color)
     # B2Bs
     if b2b_dclines is not None:
         canvas.scatter(
-            x=b2b.from_x,
-            y=b2b.from_y,
+            "x",
+            "y",
             color=dc_branch_color,
             alpha=0.5,
             marker="triangle",
-            size=(b2b["pf"].abs() * pf_width_scale_factor * 5),
+            size="size",
+            source=sources["b2b"],
         )
 
     canvas.legend.location = "bottom_left"
@@ -350,4 +495,31 @@ def plot_powerflow_snapshot(
             legend_font_size = f"{legend_font_size}pt"
         canvas.legend.label_text_font_size = legend_font_size
 
-    return canvas
+    if len(hours) == 1:
+        return canvas
+
+    labels = hours.strftime("%Y-%m-%d %H:%M").tolist()
+    slider = Slider(
+        start=0,
+        end=len(hours) - 1,
+        value=0,
+        step=1,
+        title=labels[0],
+        show_value=False,
+        width=figsize[0],
+    )
+    slider.js_on_change(
+        "value",
+        CustomJS(
+            args={
+                "sources": sources,
+                "frames": {
+                    name: [{k: v.tolist() for k, v in f[name].items()} for f in frames]
+                    for name in frames[0]
+                },
+                "labels": labels,
+            },
+            code=_SLIDER_CODE,
+        ),
+    )
+    return column(slider, canvas)
@@ -0,0 +1,94 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from powersimdata.scenario.scenario import Scenario
+
+from postreise.analyze.generation.capacity import sum_capacity_by_type_zone
+from postreise.analyze.generation.summarize import sum_generation_by_type_zone
+from postreise.cache import get_grid, get_pg, pin_scenario
+
+_lock = threading.Lock()
+
+
+def _check_max_workers(max_workers):
+    """Ensure the number of workers is valid.
+
+    :param int max_workers: number of workers.
+    :raises TypeError: if ``max_workers`` is not None or an int.
+    :raises ValueError: if ``max_workers`` is not positive.
+    """
+    if max_workers is None:
+        return
+    if not isinstance(max_workers, int):
+        raise TypeError("max_workers must be an int")
+    if max_workers < 1:
+        raise ValueError("max_workers must be positive")
+
+
+def load_scenarios(scenario_ids, func, max_workers=None, factory=Scenario):
+    """Load and process scenarios concurrently.
+
+    :param list scenario_ids: scenario id(s).
+    :param callable func: function taking a scenario instance and returning data
+        derived from it, e.g. aggregated generation.
+    :param int max_workers: number of scenarios loaded at once, defaults to None,
+        which uses one thread per scenario up to the number of CPUs. If 1, scenarios
+        are processed sequentially.
+    :param callable factory: function building a scenario instance from its id.
+    :return: (*dict*) -- keys are scenario ids, values are tuples of the scenario
+        instance and the object returned by ``func``, in the order of
+        ``scenario_ids``.
+    :raises TypeError: if ``max_workers`` is not None or an int.
+    :raises ValueError: if ``max_workers`` is not positive.
+
+    .. note::
+        Threads are used since most of the time is spent reading data, which releases
+        the GIL, and since scenario instances cannot be shared between processes. The
+        PG data frames of the scenarios are read concurrently. The instantiation of
+        scenarios, of their grid and of the objects built by ``func``, e.g. model
+        immutables, is not thread-safe: it is done, along with the calls to ``func``,
+        one scenario at a time. The entries of a scenario in the scenario cache are
+        pinned until ``func`` returns, so that ``func`` uses the grid and the PG data
+        frame loaded beforehand, see :func:`postreise.cache.pin_scenario`.
+    """
+    _check_max_workers(max_workers)
+    scenario_ids = list(scenario_ids)
+
+    def _load(sid):
+        with _lock:
+            scenario = factory(sid)
+        with pin_scenario(scenario):
+            with _lock:
+                get_grid(scenario)
+            get_pg(scenario)
+            with _lock:
+                return scenario, func(scenario)
+
+    if len(scenario_ids) <= 1 or max_workers == 1:
+        return {sid: _load(sid) for sid in scenario_ids}
+
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(scenario_ids))) as pool:
+        return dict(zip(scenario_ids, pool.map(_load, scenario_ids)))
+
+
+def sum_generation_and_capacity_by_type_zone(scenario, time_range=None, time_zone=None):
+    """Sum generation and capacity of a scenario by resource type and load zone.
+
+    :param powersimdata.scenario.scenario.Scenario scenario: scenario instance.
+    :param tuple time_range: [start_timestamp, end_timestamp] where each time stamp
+        is pandas.Timestamp/numpy.datetime64/datetime.datetime. If None, the entire
+        time range is used for the given scenario.
+    :param str time_zone: new time zone, defaults to None, which uses UTC.
+    :return: (*dict*) -- keys are *'gen'* and *'cap'*, values are data frames with
+        resource types as index and load zone names as columns.
+    """
+    id2loadzone = get_grid(scenario).model_immutables.zones["id2loadzone"]
+    return {
+        "gen": sum_generation_by_type_zone(scenario, time_range, time_zone).rename(
+            columns=id2loadzone
+        ),
+        "cap": sum_capacity_by_type_zone(scenario).rename(columns=id2loadzone),
+    }
@@ -0,0 +1,140 @@
+import numpy as np
+import pandas as pd
+from bokeh.models import Scatter, Segment, Slider
+from bokeh.plotting import figure
+from numpy.testing import assert_allclose, assert_array_equal
+from powersimdata.tests.mock_scenario import MockScenario
+
+from postreise.plot.plot_powerflow_snapshot import add_arrows, plot_powerflow_snapshot
+
+mock_branch = pd.DataFrame(
+    {
+        "pf": [100, -200, 50, 0],
+        "dist": [30, 40, 50, 60],
+        "arrow_size": [6, 7, 8, 9],
+        "from_x": [0.0, 0.0, 0.0, 0.0],
+        "from_y": [0.0, 0.0, 0.0, 0.0],
+        "to_x": [10.0, 0.0, 5.0, 1.0],
+        "to_y": [0.0, 20.0, 5.0, 1.0],
+    },
+    index=[11, 12, 13, 14],
+)
+
+
+def test_add_arrows():
+    canvas = figure()
+    source = add_arrows(canvas, mock_branch, "red", pf_threshold=60, n=2)
+    glyphs = [r.glyph for r in canvas.renderers]
+    assert len(glyphs) == 2
+    assert isinstance(glyphs[0], Segment)
+    assert isinstance(glyphs[1], Scatter)
+    assert glyphs[1].marker == "triangle"
+    assert all(r.data_source is source for r in canvas.renderers)
+
+    # branch 11 goes east, branch 12 is reversed and goes south
+    assert_array_equal(source.data["x_start"], [0, 0, 5, 0])
+    assert_array_equal(source.data["y_start"], [0, 20, 0, 10])
+    assert_array_equal(source.data["x_end"], [5, 0, 10, 0])
+    assert_array_equal(source.data["y_end"], [0, 10, 0, 0])
+    assert_array_equal(source.data["size"], [6, 7, 6, 7])
+    assert_allclose(source.data["angle"], [-np.pi / 2, -np.pi, -np.pi / 2, -np.pi])
+
+
+def test_add_arrows_thresholds():
+    canvas = figure()
+    source = add_arrows(canvas, mock_branch, "red", dist_threshold=45)
+    assert_array_equal(source.data["x_end"], [5])
+    source = add_arrows(canvas, mock_branch, "red", pf_threshold=500)
+    assert len(source.data["x_end"]) == 0
+
+
+mock_grid = {
+    "bus": {
+        "bus_id": [1, 2, 3],
+        "lat": [47.6, 45.5, 37.8],
+        "lon": [-122.3, -122.7, -122.4],
+    },
+    "branch": {
+        "branch_id": [101, 102, 103],
+        "from_bus_id": [1, 2, 1],
+        "to_bus_id": [2, 3, 3],
+        "from_lat": [47.6, 45.5, 47.6],
+        "from_lon": [-122.3, -122.7, -122.3],
+        "to_lat": [45.5, 37.8, 37.8],
+        "to_lon": [-122.7, -122.4, -122.4],
+        "rateA": [5000, 4000, 1000],
+        "x": [0.1, 0.1, 0.1],
+    },
+    "dcline": {
+        "dcline_id": [0],
+        "from_bus_id": [3],
+        "to_bus_id": [1],
+        "Pmin": [-1000],
+        "Pmax": [1000],
+    },
+    "plant": {
+        "plant_id": ["A", "B", "C"],
+        "type": ["solar", "wind", "solar"],
+        "lat": [47.6, 37.8, 47.7],
+        "lon": [-122.3, -122.4, -122.4],
+    },
+}
+mock_index = pd.date_range(start="2016-01-01", periods=3, freq="H")
+mock_pf = pd.DataFrame(
+    {101: [4000, 10, 0], 102: [-3500, 0, 20], 103: [0, 0, 0]}, index=mock_index
+)
+mock_dcline_pf = pd.DataFrame({0: [-800, 0, 400]}, index=mock_index)
+mock_pg = pd.DataFrame(
+    {"A": [10, 20, 30], "B": [30, 40, 50], "C": [1, 2, 3]}, index=mock_index
+)
+
+
+def _get_scenario(monkeypatch):
+    scenario = MockScenario(mock_grid, pf=mock_pf, pg=mock_pg)
+    scenario.info["start_date"] = "2016-01-01 00:00:00"
+    scenario.info["end_date"] = "2016-01-01 02:00:00"
+    monkeypatch.setattr(
+        "postreise.plot.plot_powerflow_snapshot.get_dcline_pf",
+        lambda scenario: mock_dcline_pf,
+    )
+    return scenario
+
+
+def test_plot_powerflow_snapshot_hours(monkeypatch):
+    scenario = _get_scenario(monkeypatch)
+    layout = plot_powerflow_snapshot(
+        scenario, list(mock_index), pf_width_scale_factor=0.001, num_ac_arrows=2
+    )
+    slider, canvas = layout.children
+    assert isinstance(slider, Slider)
+    assert slider.end == 2
+    assert slider.title == "2016-01-01 00:00"
+    callback = slider.js_property_callbacks["change:value"][0]
+    assert callback.args["labels"][2] == "2016-01-01 02:00"
+    frames = callback.args["frames"]
+    assert all(len(f) == 3 for f in frames.values())
+    # branch 103 carries no power and is not drawn
+    assert frames["ac"][1] == {"line_width": [0.01, 0.0]}
+    assert_allclose(frames["dc"][2]["line_width"], [0.4])
+    # plants A and C share the same rounded coordinates
+    assert_allclose(frames["solar"][2]["size"], [(33 * 0.25) ** 0.5])
+    assert len(frames["ac_arrows"][0]["x_end"]) == 4
+    assert len(frames["ac_arrows"][1]["x_end"]) == 0
+    # the data sources hold the first interval
+    assert_array_equal(callback.args["sources"]["ac"].data["line_width"], [4, 3.5])
+
+
+def test_plot_powerflow_snapshot_hour(monkeypatch):
+    scenario = _get_scenario(monkeypatch)
+    canvas = plot_powerflow_snapshot(scenario, mock_index[1])
+    assert not hasattr(canvas, "children")
+    widths = [
+        r.data_source.data.get("line_width")
+        for r in canvas.renderers
+        if "line_width" in r.data_source.data
+    ]
+    # background of AC branches and DC lines, then power flow
+    assert_allclose(widths[0], [5])
+    assert_allclose(widths[2], [0.0125])
+    assert_allclose(widths[3], [0])
+    assert scenario.get_grid().branch.columns.tolist().count("pf") == 0
@@ -0,0 +1,142 @@
+import threading
+import time
+
+import pandas as pd
+import pytest
+from powersimdata.tests.mock_scenario import MockScenario
+
+from postreise.cache import get_cache_stats, set_cache_size
+from postreise.plot import scenario_loader
+from postreise.plot.scenario_loader import (
+    load_scenarios,
+    sum_generation_and_capacity_by_type_zone,
+)
+
+mock_plant = {
+    "plant_id": ["A", "B", "C"],
+    "zone_id": [301, 301, 302],
+    "Pmax": [100, 75, 150],
+    "type": ["solar", "wind", "solar"],
+}
+
+mock_pg = pd.DataFrame(
+    {"A": [80, 75], "B": [22, 22], "C": [130, 120]},
+    index=pd.date_range(start="2016-01-01", periods=2, freq="H"),
+)
+
+
+def _factory(sid):
+    scenario = MockScenario({"plant": mock_plant}, pg=mock_pg)
+    scenario.info["id"] = sid
+    return scenario
+
+
+def test_load_scenarios_argument_type():
+    with pytest.raises(TypeError, match="max_workers must be an int"):
+        load_scenarios([1, 2], str, max_workers=1.5, factory=_factory)
+
+
+def test_load_scenarios_argument_value():
+    with pytest.raises(ValueError, match="max_workers must be positive"):
+        load_scenarios([1, 2], str, max_workers=0, factory=_factory)
+
+
+def test_load_scenarios_order():
+    def func(scenario):
+        sid = scenario.info["id"]
+        time.sleep(0.01 * (5 - sid))
+        return sid * 10
+
+    for max_workers in (None, 1, 2):
+        loaded = load_scenarios(
+            [4, 1, 3, 2], func, max_workers=max_workers, factory=_factory
+        )
+        assert list(loaded.keys()) == [4, 1, 3, 2]
+        assert [s.info["id"] for s, _ in loaded.values()] == [4, 1, 3, 2]
+        assert [v for _, v in loaded.values()] == [40, 10, 30, 20]
+
+
+def test_load_scenarios_concurrently():
+    threads = set()
+    barrier = threading.Barrier(3, timeout=5)
+
+    def factory(sid):
+        scenario = _factory(sid)
+        get_pg = scenario.state.get_pg
+
+        def wait_and_get_pg():
+            threads.add(threading.get_ident())
+            barrier.wait()
+            return get_pg()
+
+        scenario.state.get_pg = wait_and_get_pg
+        return scenario
+
+    running = []
+
+    def func(scenario):
+        running.append(scenario.info["id"])
+        time.sleep(0.01)
+        assert running == [scenario.info["id"]]
+        running.pop()
+        return scenario.info["id"]
+
+    loaded = load_scenarios(["a", "b", "c"], func, max_workers=3, factory=factory)
+    assert {sid: v for sid, (_, v) in loaded.items()} == {"a": "a", "b": "b", "c": "c"}
+    assert len(threads) == 3
+
+
+def test_load_scenarios_default_max_workers(monkeypatch):
+    threads = set()
+    monkeypatch.setattr(scenario_loader.os, "cpu_count", lambda: 2)
+
+    def func(scenario):
+        threads.add(threading.get_ident())
+        time.sleep(0.01)
+        return scenario.info["id"]
+
+    load_scenarios([1, 2, 3, 4], func, factory=_factory)
+    assert len(threads) <= 2
+
+
+def test_load_scenarios_reads_pg_once():
+    calls = []
+
+    def factory(sid):
+        scenario = _factory(sid)
+        get_pg = scenario.state.get_pg
+
+        def count_and_get_pg():
+            calls.append(sid)
+            return get_pg()
+
+        scenario.state.get_pg = count_and_get_pg
+        return scenario
+
+    max_bytes = get_cache_stats()["max_bytes"]
+    set_cache_size(0)
+    try:
+        loaded = load_scenarios(
+            [1, 2, 3], sum_generation_and_capacity_by_type_zone, factory=factory
+        )
+    finally:
+        set_cache_size(max_bytes)
+    assert sorted(calls) == [1, 2, 3]
+    assert loaded[2][1]["gen"].loc["solar", "Far West"] == 155
+
+
+def test_load_scenarios_raises():
+    def func(scenario):
+        if scenario.info["id"] == 2:
+            raise ValueError("cannot load")
+        return scenario.info["id"]
+
+    with pytest.raises(ValueError, match="cannot load"):
+        load_scenarios([1, 2, 3], func, factory=_factory)
+
+
+def test_sum_generation_and_capacity_by_type_zone():
+    data = sum_generation_and_capacity_by_type_zone(_factory(1))
+    assert data["gen"].loc["solar", "Far West"] == 155
+    assert data["gen"].loc["solar", "North"] == 250
+    assert data["cap"].loc["wind", "Far West"] == 75
@@ -0,0 +1,65 @@
+import numpy as np
+
+_allowed_dtypes = {np.dtype("float32"), np.dtype("float64")}
+_precision = {"dtype": np.dtype("float64")}
+
+
+def _check_dtype(dtype):
+    """Ensure a floating point type is supported.
+
+    :param str/type/numpy.dtype dtype: floating point type.
+    :return: (*numpy.dtype*) -- the floating point type.
+    :raises TypeError: if ``dtype`` is not understood by numpy.
+    :raises ValueError: if ``dtype`` is not float32 or float64.
+    """
+    try:
+        dtype = np.dtype(dtype)
+    except TypeError:
+        raise TypeError(f"{dtype} is not a data type")
+    if dtype not in _allowed_dtypes:
+        raise ValueError("dtype must be one of: float32, float64")
+    return dtype
+
+
+def set_precision(dtype):
+    """Set the floating point type of the time series returned by the analysis
+    functions: :func:`postreise.analyze.generation.costs.calculate_costs`,
+    :func:`postreise.analyze.generation.emissions.generate_emissions_stats`,
+    :func:`postreise.analyze.generation.curtailment.calculate_curtailment_time_series`
+    (and the other curtailment functions),
+    :func:`postreise.analyze.generation.capacity.get_capacity_factor_time_series`
+    and :func:`postreise.analyze.transmission.utilization.get_utilization`. The
+    ``dtype`` argument of these functions overrides this setting.
+
+    :param str/type/numpy.dtype dtype: either float32 or float64 (default).
+
+    .. note::
+        float32 halves the memory footprint of the time series at the cost of
+        precision. Its machine epsilon is 1.2e-7, i.e. each hourly value carries a
+        relative error below 6e-8: 1e-3 MW for a 10 GW flow, 0.06 $/h for a 1 M$/h
+        cost. Sums over hours or generators are running sums accumulated in float32,
+        so their relative error grows with the number of values summed: up to about
+        1e-3 for the 8784 hours of a year, typically about 1e-5, e.g. 100 t for 10 Mt
+        of annual emissions. Comparisons against thresholds (binding lines, decommitted
+        generators) may flip for values within this error of the threshold.
+    """
+    _precision["dtype"] = _check_dtype(dtype)
+
+
+def get_precision():
+    """Get the floating point type of the time series returned by the analysis
+    functions.
+
+    :return: (*numpy.dtype*) -- floating point type.
+    """
+    return _precision["dtype"]
+
+
+def get_dtype(dtype=None):
+    """Get the floating point type to use in a calculation.
+
+    :param str/type/numpy.dtype dtype: floating point type requested by the caller.
+        If None, the package-level precision is used.
+    :return: (*numpy.dtype*) -- floating point type.
+    """
+    return get_precision() if dtype is None else _check_dtype(dtype)
@@ -0,0 +1,59 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from postreise.array_source import ArraySource, save_array_source
+
+index = pd.date_range("2016-01-01", periods=6, freq="H", name="UTC")
+ts = pd.DataFrame(
+    np.arange(18, dtype=float).reshape(6, 3),
+    index=index,
+    columns=pd.Index([101, 102, 103], name="plant_id"),
+)
+
+
+def test_save_and_load(tmp_path):
+    path = str(tmp_path / "pg")
+    save_array_source(ts, path)
+    assert sorted(os.listdir(tmp_path)) == ["pg.meta.npz", "pg.npy"]
+    source = ArraySource(f"{path}.npy")
+    assert source.shape == (6, 3)
+    assert isinstance(source.data, np.memmap)
+
+    frame = source.to_frame()
+    pd.testing.assert_frame_equal(frame, ts, check_freq=False)
+    assert frame is source.to_frame()
+    assert np.shares_memory(frame.to_numpy(), source.data)
+
+
+def test_load_columns(tmp_path):
+    path = str(tmp_path / "pg")
+    save_array_source(ts, path)
+    source = ArraySource(path)
+    pd.testing.assert_frame_equal(
+        source.to_frame([103, 101]), ts[[103, 101]], check_freq=False
+    )
+    with pytest.raises(KeyError):
+        source.to_frame([104])
+
+
+def test_time_zone(tmp_path):
+    path = str(tmp_path / "lmp")
+    # the time series includes the ambiguous hour at the end of daylight saving time
+    local = pd.DataFrame(
+        {"A": range(4)},
+        index=pd.date_range("2016-11-06 07:00", periods=4, freq="H", tz="UTC"),
+    ).tz_convert("US/Pacific")
+    save_array_source(local, path)
+    assert ArraySource(path).to_frame().index.equals(local.index)
+
+
+def test_argument_type(tmp_path):
+    with pytest.raises(TypeError):
+        save_array_source(ts.to_numpy(), str(tmp_path / "pg"))
+    with pytest.raises(ValueError):
+        save_array_source(ts.astype(str), str(tmp_path / "pg"))
+    with pytest.raises(FileNotFoundError):
+        ArraySource(str(tmp_path / "pf"))
@@ -0,0 +1,134 @@
+import gc
+
+import numpy as np
+import pandas as pd
+import pytest
+from powersimdata.tests.mock_scenario import MockScenario
+
+from postreise.array_source import save_array_source
+from postreise.cache import ScenarioCache, get_pg, memoize, set_array_source
+
+mock_plant = {"plant_id": ["A", "B"], "type": ["solar", "wind"]}
+
+mock_pg = pd.DataFrame({"A": [1.0, 2.0], "B": [3.0, 4.0]})
+
+
+@pytest.fixture
+def scenario():
+    return MockScenario({"plant": mock_plant}, pg=mock_pg.copy())
+
+
+def test_hit_and_miss(scenario):
+    cache = ScenarioCache()
+    calls = []
+
+    def func():
+        calls.append(1)
+        return np.ones(10)
+
+    first = cache.get(scenario, "ones", func)
+    second = cache.get(scenario, "ones", func)
+    assert first is second
+    assert len(calls) == 1
+    stats = cache.get_stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["entries"] == 1
+    assert stats["bytes"] == 80
+
+
+def test_entries_are_scenario_scoped(scenario):
+    cache = ScenarioCache()
+    other = MockScenario({"plant": mock_plant}, pg=mock_pg.copy())
+    cache.get(scenario, "pg", scenario.get_pg)
+    cache.get(other, "pg", other.get_pg)
+    assert cache.get_stats()["misses"] == 2
+
+
+def test_lru_eviction_by_bytes(scenario):
+    cache = ScenarioCache(max_bytes=200)
+    cache.get(scenario, "a", lambda: np.zeros(10))
+    cache.get(scenario, "b", lambda: np.zeros(10))
+    cache.get(scenario, "a", lambda: np.zeros(10))
+    cache.get(scenario, "c", lambda: np.zeros(10))
+    stats = cache.get_stats()
+    assert stats["evictions"] == 1
+    assert stats["bytes"] == 160
+    cache.get(scenario, "a", lambda: np.zeros(10))
+    assert cache.get_stats()["hits"] == 2
+
+
+def test_object_larger_than_cache_is_not_stored(scenario):
+    cache = ScenarioCache(max_bytes=10)
+    cache.get(scenario, "a", lambda: np.zeros(10))
+    assert cache.get_stats()["entries"] == 0
+
+
+def test_resize_and_clear(scenario):
+    cache = ScenarioCache()
+    cache.get(scenario, "a", lambda: np.zeros(10))
+    cache.get(scenario, "b", lambda: np.zeros(10))
+    cache.resize(100)
+    assert cache.get_stats()["entries"] == 1
+    cache.clear(scenario)
+    assert cache.get_stats()["entries"] == 0
+    with pytest.raises(ValueError):
+        cache.resize(-1)
+
+
+def test_pinned_entries_are_not_evicted(scenario):
+    cache = ScenarioCache(max_bytes=100)
+    other = MockScenario({"plant": mock_plant}, pg=mock_pg.copy())
+    cache.get(other, "a", lambda: np.zeros(10))
+    with cache.pin(scenario):
+        cache.get(scenario, "a", lambda: np.zeros(10))
+        cache.get(scenario, "b", lambda: np.zeros(20))
+        stats = cache.get_stats()
+        assert stats["entries"] == 2
+        assert stats["bytes"] == 240
+        assert stats["evictions"] == 1
+        calls = []
+        cache.get(scenario, "b", lambda: calls.append(1))
+        assert len(calls) == 0
+    stats = cache.get_stats()
+    assert stats["entries"] == 0
+    assert stats["bytes"] == 0
+    assert stats["evictions"] == 3
+
+
+def test_entries_are_discarded_with_scenario():
+    cache = ScenarioCache()
+    scenario = MockScenario({"plant": mock_plant}, pg=mock_pg.copy())
+    cache.get(scenario, "pg", scenario.get_pg)
+    del scenario
+    gc.collect()
+    stats = cache.get_stats()
+    assert stats["entries"] == 0
+    assert stats["bytes"] == 0
+
+
+def test_module_level_accessors(scenario):
+    assert get_pg(scenario) is get_pg(scenario)
+    assert memoize(scenario, "answer", lambda: 42) == 42
+    assert memoize(scenario, "answer", lambda: 0) == 42
+
+
+def test_array_source(scenario, tmp_path):
+    path = str(tmp_path / "pg")
+    pg = pd.DataFrame(
+        {"A": [5.0, 6.0], "B": [7.0, 8.0]},
+        index=pd.date_range("2016-01-01", periods=2, freq="H"),
+    )
+    save_array_source(pg, path)
+    assert memoize(scenario, "answer", lambda: 42) == 42
+
+    set_array_source(scenario, "pg", path)
+    assert get_pg(scenario)["A"].tolist() == [5, 6]
+    assert memoize(scenario, "answer", lambda: 0) == 0
+    set_array_source(scenario, "pg", None)
+    assert get_pg(scenario)["A"].tolist() == [1, 2]
+
+    with pytest.raises(ValueError):
+        set_array_source(scenario, "demand", path)
+    with pytest.raises(TypeError):
+        set_array_source(scenario, "pg", pg)
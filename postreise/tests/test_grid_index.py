@@ -0,0 +1,100 @@
+import numpy as np
+import pytest
+from numpy.testing import assert_array_equal
+from powersimdata.input.helpers import get_plant_id_for_resources_in_area
+from powersimdata.tests.mock_grid import MockGrid
+from powersimdata.tests.mock_scenario import MockScenario
+
+from postreise.grid_index import GridIndex
+
+mock_plant = {
+    "plant_id": [11, 12, 13, 14, 15, 16],
+    "bus_id": [1, 2, 3, 4, 1, 3],
+    "type": ["solar", "wind", "ng", "solar", "coal", "wind"],
+    "zone_name": [
+        "Washington",
+        "Oregon",
+        "Washington",
+        "Bay Area",
+        "El Paso",
+        "Oregon",
+    ],
+}
+
+mock_bus = {
+    "bus_id": [4, 3, 2, 1],
+    "zone_id": [204, 202, 203, 201],
+    "lat": [37.8, 47.6, 45.5, 31.8],
+    "lon": [-122.4, -122.3, -122.7, -106.4],
+}
+
+mock_dcline = {"dcline_id": [0, 1], "from_bus_id": [1, 2], "to_bus_id": [4, 3]}
+
+mock_storage_gen = {"storage_id": [0, 1, 2], "bus_id": [3, 4, 2]}
+
+grid_attrs = {
+    "plant": mock_plant,
+    "bus": mock_bus,
+    "dcline": mock_dcline,
+    "storage_gen": mock_storage_gen,
+}
+
+
+@pytest.fixture
+def grid_index():
+    return GridIndex(MockGrid(grid_attrs))
+
+
+@pytest.mark.parametrize(
+    "area,resources,area_type",
+    [
+        ("Washington", "solar", "loadzone"),
+        ("Oregon", ["wind", "solar"], None),
+        ("Western", {"wind", "solar", "ng"}, "interconnect"),
+        ("all", ["coal", "ng", "solar"], None),
+        ("Texas", "solar", "interconnect"),
+        ("Oregon", "hydro", None),
+    ],
+)
+def test_get_plant_id(grid_index, area, resources, area_type):
+    scenario = MockScenario(grid_attrs)
+    expected = get_plant_id_for_resources_in_area(
+        scenario, area, resources, area_type=area_type
+    )
+    assert grid_index.get_plant_id(area, resources, area_type=area_type) == expected
+
+
+def test_get_plant_positions(grid_index):
+    assert_array_equal(grid_index.get_plant_positions(), np.arange(6))
+    assert_array_equal(grid_index.get_plant_positions(resources="wind"), [1, 5])
+    assert_array_equal(grid_index.get_plant_positions(area="Oregon"), [1, 5])
+
+
+def test_get_plant_groups(grid_index):
+    groups = grid_index.get_plant_groups("type")
+    assert list(groups) == ["coal", "ng", "solar", "wind"]
+    assert groups["solar"].tolist() == [11, 14]
+    assert groups["wind"].tolist() == [12, 16]
+    assert grid_index.get_plant_groups("type") is groups
+
+
+def test_get_storage_id(grid_index):
+    grid_index.grid.zone2id = {"Washington": 201, "Oregon": 202, "Bay Area": 204}
+    assert grid_index.get_storage_id("Oregon") == [0]
+    assert grid_index.get_storage_id("Western", "interconnect") == [0, 1]
+
+
+def test_get_bus_position(grid_index):
+    assert_array_equal(grid_index.get_bus_position([1, 4, 4]), [3, 0, 0])
+    with pytest.raises(KeyError):
+        grid_index.get_bus_position([1, 5])
+
+
+def test_get_line_coordinates(grid_index):
+    with pytest.raises(ValueError):
+        grid_index.get_line_bus_position("plant")
+    coordinates = grid_index.get_line_coordinates("dcline")
+    assert_array_equal(coordinates["from_lat"], [31.8, 45.5])
+    assert_array_equal(coordinates["from_lon"], [-106.4, -122.7])
+    assert_array_equal(coordinates["to_lat"], [37.8, 47.6])
+    assert_array_equal(coordinates["to_lon"], [-122.4, -122.3])
@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+import pytest
+from numpy.testing import assert_allclose
+
+from postreise.analyze.generation.costs import calculate_costs
+from postreise.precision import get_dtype, get_precision, set_precision
+
+mock_gencost = pd.DataFrame(
+    {
+        "type": [2] * 2,
+        "startup": [0] * 2,
+        "shutdown": [0] * 2,
+        "n": [3] * 2,
+        "c2": [0.0123, 0.0456],
+        "c1": [17.1, 23.7],
+        "c0": [1021.3, 733.9],
+    },
+    index=pd.Index([101, 102], name="plant_id"),
+)
+
+mock_pg = pd.DataFrame(
+    {101: [0.5, 312.7, 1529.3], 102: [10.9, 0, 2341.1]},
+    index=pd.date_range("2016-01-01", periods=3, freq="H"),
+)
+
+
+@pytest.fixture
+def precision():
+    yield
+    set_precision("float64")
+
+
+def test_set_precision_argument_value():
+    with pytest.raises(TypeError):
+        set_precision("foo")
+    with pytest.raises(ValueError):
+        set_precision("int64")
+    with pytest.raises(ValueError):
+        set_precision(np.float16)
+
+
+def test_set_precision(precision):
+    assert get_precision() == np.float64
+    set_precision(np.float32)
+    assert get_precision() == np.float32
+    assert get_dtype() == np.float32
+    assert get_dtype("float64") == np.float64
+
+
+def test_calculate_costs_dtype(precision):
+    expected = calculate_costs(pg=mock_pg, gencost=mock_gencost, decommit=True)
+    costs = calculate_costs(
+        pg=mock_pg, gencost=mock_gencost, decommit=True, dtype="float32"
+    )
+    assert (expected.dtypes == np.float64).all()
+    assert (costs.dtypes == np.float32).all()
+    assert_allclose(costs.to_numpy(), expected.to_numpy(), rtol=1e-6)
+
+    set_precision("float32")
+    costs = calculate_costs(pg=mock_pg, gencost=mock_gencost)
+    assert (costs.dtypes == np.float32).all()